@@ -0,0 +1,38 @@
+"""Per-entry helpers shared by the reader window and the batch pipeline."""
+import re
+
+from entry_store import entry_thumbnail
+from sentiment import TextBlobModel, sentiment_label
+
+IMG_PATTERN = re.compile(r'<img\b[^>]*>', re.IGNORECASE)
+
+
+def remove_images_from_content(content):
+    """Remove <img> tags from the HTML content."""
+    return IMG_PATTERN.sub('', content)
+
+
+def get_thumbnail(entry):
+    """Retrieve the thumbnail or media content from a stored or parsed feed entry."""
+    if 'thumbnail' in entry:
+        return entry['thumbnail']
+    return entry_thumbnail(entry)
+
+
+def get_publication_date(entry):
+    """Retrieve the publication date of the feed entry."""
+    return entry.get('published') or entry.get('updated') or "No Publication Date Available"
+
+
+def get_sentiment(content):
+    """Return the polarity and label of the given content's sentiment."""
+    score = TextBlobModel().score_batch([content])[0]
+    return score, sentiment_label(score)
+
+
+def get_sentiment_label(content):
+    """Analyze sentiment of the given content."""
+    try:
+        return get_sentiment(content)[1]
+    except Exception as e:
+        return f"Error analyzing sentiment: {e}"
@@ -0,0 +1 @@
+"""Offline performance benchmarks for the RSS Reader; run with ``python -m benchmarks``."""
@@ -0,0 +1,649 @@
+"""Offline benchmark suite for the RSS Reader.
+
+Feeds are generated locally and served by a stand-in HTTP server, so no
+network access is needed. Run with::
+
+    python -m benchmarks                     # every benchmark, every size
+    python -m benchmarks parse analysis --quick
+    python -m benchmarks --output benchmark_results.json
+
+The JSON output records the commit and platform next to every timing, so
+runs of different commits can be compared.
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import bisect
+import time
+import types
+
+import feedparser
+
+from analysis import get_sentiment, remove_images_from_content
+from benchmarks.fixtures import (FixtureServer, SimulatedClock, make_entries, make_messy_entries, posting_times,
+                                 rss_document, subscription_list, syndicated_entries)
+from content import normalize
+from entry_store import MINHASHER, EntryStore, EntryView, compact_entry, html_to_text
+from feed_fetcher import FeedFetcher
+from http_cache import FeedCache
+from keywords import KeywordExtractor, entry_text
+from metrics import Metrics
+from render_cache import ArticleRenderer, LatencyRecorder, RenderCache
+from river import RiverView
+from scheduler import RefreshScheduler
+from sentiment import LABELS, SentimentAnalyzer
+from settings import DEFAULTS
+from subscriptions import SubscriptionStore, group_by_category, read_feed_urls, write_feed_urls
+from translation import TranslationService
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+ITEM_SIZES = (10, 1000, 100000)
+QUICK_ITEM_SIZES = (10, 1000)
+SUBSCRIPTION_SIZES = (50, 5000)
+
+
+class Results:
+    """Collect timings, print them as they come in and write them as JSON."""
+
+    def __init__(self):
+        self.results = []
+
+    def add(self, benchmark, case, size, seconds, **extra):
+        """Record one timing; size is the number of items or subscriptions processed."""
+        result = {"benchmark": benchmark, "case": case, "size": size, "seconds": seconds}
+        if size:
+            result["per_item_ms"] = seconds / size * 1000
+        result.update(extra)
+        self.results.append(result)
+
+        details = "".join(f", {key} {value}" for key, value in extra.items())
+        print(f"{benchmark}/{case} [{size}]: {seconds * 1000:.1f} ms{details}")
+
+    def skip(self, benchmark, reason):
+        self.results.append({"benchmark": benchmark, "skipped": reason})
+        print(f"{benchmark}: skipped ({reason})")
+
+    def write(self, path, quick):
+        document = {
+            "commit": git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "quick": quick,
+            "results": self.results,
+        }
+        with open(path, 'w', encoding='utf-8') as file:
+            json.dump(document, file, indent=2)
+
+
+def git_commit():
+    """Return the checked out commit, marked '-dirty' with local changes, or None outside git."""
+    try:
+        commit = subprocess.run(["git", "rev-parse", "HEAD"], cwd=ROOT, capture_output=True,
+                                text=True, check=True).stdout.strip()
+        dirty = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], cwd=ROOT,
+                               capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return commit + "-dirty" if dirty else commit
+
+
+def measure(function, size):
+    """Return the best time of a few runs of function(); large inputs run once."""
+    runs = 3 if size <= 1000 else 1
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def bench_parse(results, sizes):
+    """Fetch and parse RSS and Atom fixtures, in full and as a conditional 304 refetch."""
+    with FixtureServer() as server, tempfile.TemporaryDirectory() as directory:
+        for kind in ("rss", "atom"):
+            for size in sizes:
+                url = server.url(kind, size)
+                server.document(kind, size)
+
+                fetcher = FeedFetcher(cache=None)
+                feed = None
+
+                def fetch():
+                    nonlocal feed
+                    feed = fetcher.fetch(url)
+
+                results.add("parse", kind, size, measure(fetch, size), entries=len(feed.entries))
+                fetcher.shutdown()
+
+                fetcher = FeedFetcher(cache=FeedCache(os.path.join(directory, kind)))
+                fetcher.fetch(url)
+                results.add("parse", f"{kind} not modified", size, measure(lambda: fetcher.fetch(url), size))
+                fetcher.shutdown()
+
+
+def bench_feed_selected(results, sizes):
+    """The store side of on_feed_selected: ingest fetched entries, then open the first page.
+
+    Single-feed selections open an EntryView; category selections a river
+    merged from ten feeds holding the same number of entries in total.
+    """
+    for size in sizes:
+        with tempfile.TemporaryDirectory() as directory:
+            store = EntryStore(os.path.join(directory, "bench.db"))
+            entries = make_entries(size)
+
+            start = time.perf_counter()
+            store.write_rows(store.changed_rows("single", entries))
+            results.add("feed_selected", "ingest", size, time.perf_counter() - start)
+            results.add("feed_selected", "ingest unchanged", size,
+                        measure(lambda: store.changed_rows("single", entries), size))
+            results.add("feed_selected", "open feed", size,
+                        measure(lambda: EntryView(store, ["single"]).head(50), size))
+
+            river_urls = [f"river-{index}" for index in range(10)]
+            for index, url in enumerate(river_urls):
+                store.write_rows(store.changed_rows(url, make_entries(max(1, size // 10), seed=index + 1)))
+            results.add("feed_selected", "open river", size,
+                        measure(lambda: RiverView(store, river_urls).head(50), size))
+            store.close()
+
+
+def bench_analysis(results, sizes):
+    """Keyword extraction, sentiment and image stripping over fixture entries."""
+    start = time.perf_counter()
+    extractor = KeywordExtractor()
+    extractor.stop_words
+    results.add("analysis", "stopword index", 0, time.perf_counter() - start)
+
+    try:
+        get_sentiment("warm up")
+    except ImportError as e:
+        sentiment = False
+        results.skip("analysis/sentiment", f"TextBlob is not installed: {e}")
+    else:
+        sentiment = True
+
+    for size in sizes:
+        entries = make_entries(size)
+        texts = [entry_text(entry) for entry in entries]
+
+        def keywords():
+            extractor.fit(texts)
+            extractor.extract_batch(texts)
+
+        results.add("analysis", "keywords", size, measure(keywords, size))
+        results.add("analysis", "remove images", size,
+                    measure(lambda: [remove_images_from_content(entry['summary']) for entry in entries], size))
+        if sentiment:
+            results.add("analysis", "sentiment", size, measure(lambda: [get_sentiment(text) for text in texts], size))
+
+
+def bench_sentiment(results, sizes, processes=2):
+    """Batched sentiment scoring per model: in-process, on a process pool, and memoized.
+
+    The old per-click path is the analysis/sentiment benchmark. TextBlob is
+    capped at 10k entries.
+    """
+    models = ["lexicon"]
+    try:
+        get_sentiment("warm up")
+    except ImportError as e:
+        results.skip("sentiment/textblob", f"TextBlob is not installed: {e}")
+    else:
+        models.append("textblob")
+
+    for size in sizes:
+        for model in models:
+            count = size if model == "lexicon" else min(size, 10000)
+            texts = [entry_text(entry) for entry in make_entries(count)]
+
+            # A fresh analyzer per run, so nothing is memoized yet
+            results.add("sentiment", f"{model} batch", count,
+                        measure(lambda: SentimentAnalyzer(model, processes=0).score_batch(texts), count))
+            analyzer = SentimentAnalyzer(model, processes=0)
+            labels = [label for _, label in analyzer.score_batch(texts)]
+            print("  labels:", ", ".join(f"{labels.count(label)} {label.lower()}" for label in LABELS))
+            results.add("sentiment", f"{model} memoized", count, measure(lambda: analyzer.score_batch(texts), count))
+
+            if analyzer.model.use_processes:
+                pooled = SentimentAnalyzer(model, processes=processes)
+                pooled.score_batch([f"warm up {index}" for index in range(processes * pooled.chunk_size)])
+                start = time.perf_counter()
+                pooled.score_batch(texts)
+                results.add("sentiment", f"{model} {processes} processes", count, time.perf_counter() - start)
+                pooled.shutdown()
+
+
+def bench_content(results, sizes):
+    """Normalizing large, messy summaries, against the regex passes it replaces.
+
+    The regex path is what ingest and the first view used to do per entry:
+    strip images for display, strip tags for search and again for keywords.
+    Fixtures are capped at 10k entries, as each summary is about 10 KB.
+    """
+    for size in sizes:
+        size = min(size, 10000)
+        entries = make_messy_entries(size)
+        summaries = [entry['summary'] for entry in entries]
+
+        def regex_path():
+            for entry in entries:
+                remove_images_from_content(entry['summary'])
+                html_to_text(entry['summary'])
+                entry_text(entry)
+
+        display = [remove_images_from_content(summary) for summary in summaries]
+        results.add("content", "regex path", size, measure(regex_path, size),
+                    display_kb=round(sum(map(len, display)) / size / 1024, 1))
+
+        normalized = []
+        results.add("content", "normalize", size, measure(lambda: normalized.extend(map(normalize, summaries)), size),
+                    display_kb=round(sum(len(html) for html, text in normalized[:size]) / size / 1024, 1),
+                    input_kb=round(sum(map(len, summaries)) / size / 1024, 1))
+
+
+def bench_dedup(results, sizes, overlap=0.3):
+    """Near-duplicate clustering of a feed that repeats part of another, and the collapsed title list.
+
+    Reports how many shared stories were clustered with their original
+    (recall) and how many unrelated entries were wrongly clustered.
+    """
+    for size in sizes:
+        originals, syndicated, shared = syndicated_entries(size, overlap)
+        texts = [f"{entry['title']} {html_to_text(entry['summary'])}" for entry in syndicated]
+        results.add("dedup", "signature", size, measure(lambda: [MINHASHER.signature(text) for text in texts], size))
+
+        with tempfile.TemporaryDirectory() as directory:
+            store = EntryStore(os.path.join(directory, "bench.db"))
+            store.write_rows(store.changed_rows("original", originals))
+            rows = store.changed_rows("syndicated", syndicated)
+            start = time.perf_counter()
+            store.write_rows(rows)
+            elapsed = time.perf_counter() - start
+
+            clusters = dict(store.conn.execute("SELECT id, cluster_id FROM entries"))
+            original_ids = [row[0] for row in store.conn.execute(
+                "SELECT id FROM entries WHERE feed_url = 'original' ORDER BY id")]
+            shared_set = set(shared)
+            found = sum(clusters[row["id"]] == clusters[original_ids[index]]
+                        for index, row in enumerate(rows) if index in shared_set)
+            false_merges = sum(clusters[row["id"]] != row["id"]
+                               for index, row in enumerate(rows) if index not in shared_set)
+            results.add("dedup", "ingest with clustering", size, elapsed,
+                        per_entry_ms=round(elapsed / size * 1000, 3),
+                        recall=round(found / len(shared), 3) if shared else None, false_merges=false_merges)
+
+            feeds = ["original", "syndicated"]
+            results.add("dedup", "open collapsed", size,
+                        measure(lambda: EntryView(store, feeds, collapse=True).head(50), size),
+                        rows=len(EntryView(store, feeds, collapse=True)), expected=2 * size - found)
+            results.add("dedup", "open uncollapsed", size,
+                        measure(lambda: EntryView(store, feeds).head(50), size))
+
+            # What the title list does on reload: count, find the selected entry, show its page
+            view = EntryView(store, feeds, collapse=True)
+            middle = view[len(view) // 2]['id']
+            results.add("dedup", "collapsed reload", size,
+                        measure(lambda: EntryView(store, feeds, collapse=True).index_of(middle), size))
+            results.add("dedup", "collapsed last page", size,
+                        measure(lambda: EntryView(store, feeds, collapse=True)[len(view) - 1], size))
+            store.close()
+
+
+# Every column an entry dict used to carry when read from the store
+LEGACY_ENTRY_COLUMNS = ("id", "feed_url", "guid", "link", "title", "summary", "published", "published_ts",
+                        "thumbnail", "keywords", "sentiment_score", "sentiment_label", "body_html", "body_text",
+                        "cluster_id")
+
+
+def deep_size(root, exclude=()):
+    """Return the bytes of an object and everything it references, counting shared objects once."""
+    seen = {id(item) for item in exclude}
+    size = 0
+    pending = [root]
+    while pending:
+        item = pending.pop()
+        if id(item) in seen or isinstance(item, (type, types.ModuleType)):
+            continue
+        seen.add(id(item))
+        size += sys.getsizeof(item)
+        if isinstance(item, dict):
+            pending.extend(item.keys())
+            pending.extend(item.values())
+        elif isinstance(item, (list, tuple, set, frozenset)):
+            pending.extend(item)
+        else:
+            for cls in type(item).__mro__:
+                pending.extend(getattr(item, name) for name in getattr(cls, "__slots__", ()) if hasattr(item, name))
+            if hasattr(item, "__dict__"):
+                pending.append(item.__dict__)
+    return size
+
+
+def bench_memory(results, sizes):
+    """Bytes per entry held in memory: parsed feeds, and stored entries loaded for the title list.
+
+    feedparser entries are what the feed cache kept before entries were
+    compacted right after parsing; entry dicts are the stored entries with
+    every column, as views held them before summaries were loaded lazily.
+    Sizes count every object reachable from the entries, shared ones once.
+    """
+    for size in sizes:
+        document = rss_document(size)
+        start = time.perf_counter()
+        entries = feedparser.parse(document).entries
+        results.add("memory", "feedparser entries", size, time.perf_counter() - start,
+                    bytes_per_entry=round(deep_size(entries) / size))
+        start = time.perf_counter()
+        parsed = [compact_entry(entry) for entry in entries]
+        results.add("memory", "parsed records", size, time.perf_counter() - start,
+                    bytes_per_entry=round(deep_size(parsed) / size))
+        del entries
+
+        with tempfile.TemporaryDirectory() as directory:
+            store = EntryStore(os.path.join(directory, "bench.db"))
+            store.write_rows(store.changed_rows("https://news.example.com/feed", parsed))
+            del parsed
+
+            def entry_dicts():
+                with store.lock:
+                    rows = store.conn.execute(f"SELECT {', '.join(LEGACY_ENTRY_COLUMNS)} FROM entries").fetchall()
+                return [{column: value for column, value in zip(LEGACY_ENTRY_COLUMNS, row) if value is not None}
+                        for row in rows]
+
+            start = time.perf_counter()
+            loaded = entry_dicts()
+            results.add("memory", "entry dicts", size, time.perf_counter() - start,
+                        bytes_per_entry=round(deep_size(loaded) / size))
+            start = time.perf_counter()
+            loaded = store.entries_for_feed("https://news.example.com/feed")
+            results.add("memory", "entry records", size, time.perf_counter() - start,
+                        bytes_per_entry=round(deep_size(loaded, exclude=[store]) / size))
+            del loaded
+            store.close()
+
+
+class StandInTranslator:
+    """Offline translation backend that answers after a fixed, network-like delay."""
+
+    def __init__(self, delay=0.05):
+        self.delay = delay
+
+    def translate_batch(self, texts, target):
+        time.sleep(self.delay)
+        return [f"[{target}] {text}" for text in texts]
+
+
+def bench_render(results, sizes, selections=40, dwell=0.15):
+    """Article HTML rendering, and selection latency without and with the render cache.
+
+    The latency part uses a translation stand-in with a 50 ms delay, and
+    spends `dwell` seconds on each article before moving to the next one.
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        store = EntryStore(os.path.join(directory, "bench.db"))
+        extractor = KeywordExtractor()
+
+        # Plain HTML building, with translation and analysis turned off
+        settings = dict(DEFAULTS, analysis_enabled=False)
+        renderer = ArticleRenderer(settings, store, None, extractor)
+        for size in sizes:
+            entries = make_entries(size)
+            results.add("render", "html", size, measure(lambda: [renderer.render(entry) for entry in entries], size))
+
+        store.upsert_entries("bench", make_entries(selections))
+        entries = store.entries_for_feed("bench")
+        settings = dict(DEFAULTS)
+        for case, cached in (("selection uncached", False), ("selection cached", True)):
+            for entry in entries:
+                # A missing label makes the renderer score the entry again
+                entry['sentiment_label'] = None
+            translator = TranslationService(StandInTranslator(), target="id")
+            renderer = ArticleRenderer(settings, store, translator, extractor)
+            cache = RenderCache(renderer.render)
+            latency = LatencyRecorder()
+
+            for index, entry in enumerate(entries):
+                start = time.perf_counter()
+                if cached:
+                    cache.get(entry, "bench")
+                    cache.prefetch(entries[index + 1:index + 4] + entries[max(0, index - 3):index], "bench")
+                else:
+                    renderer.render(entry)
+                latency.add(time.perf_counter() - start)
+                time.sleep(dwell)
+
+            cache.shutdown()
+            translator.close()
+            results.add("render", case, len(entries), sum(latency.samples),
+                        p50_ms=round(latency.percentile(50) * 1000, 2),
+                        p99_ms=round(latency.percentile(99) * 1000, 2))
+        store.close()
+
+
+def display_available():
+    """Whether wx is installed and a window can be created."""
+    if sys.platform.startswith("linux") and not (os.environ.get("DISPLAY") or os.environ.get("WAYLAND_DISPLAY")):
+        return False
+    try:
+        import wx  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def subscription_store(directory, size):
+    """Return a SubscriptionStore holding size fixture subscriptions."""
+    legacy_path = os.path.join(directory, f"feed_urls_{size}.txt")
+    write_feed_urls(subscription_list(size), legacy_path)
+    return SubscriptionStore(os.path.join(directory, f"subscriptions_{size}.db"), legacy_path)
+
+
+def bench_tree(results, sizes):
+    """Build the feed tree, and apply single changes to it, when a display is available."""
+    for size in SUBSCRIPTION_SIZES:
+        feed_urls = subscription_list(size)
+        results.add("tree", "group by category", size, measure(lambda: group_by_category(feed_urls), size))
+
+    if not display_available():
+        results.skip("tree/widget", "no display server or wxPython")
+        return
+
+    import wx
+    from feed_tree import FeedTree
+
+    app = wx.App(False)
+    frame = wx.Frame(None)
+    with tempfile.TemporaryDirectory() as directory:
+        for size in SUBSCRIPTION_SIZES:
+            store = subscription_store(directory, size)
+            feed_tree = FeedTree(wx.TreeCtrl(frame), store)
+            results.add("tree", "rebuild", size, measure(feed_tree.rebuild, size))
+
+            url = "https://feeds.example.com/new.rss"
+            start = time.perf_counter()
+            feed_tree.add_feed(url, "New feed", "Category 0")
+            feed_tree.update_feed(url, url, "Renamed feed")
+            feed_tree.remove_feed(url)
+            results.add("tree", "add, rename and remove one feed", size, time.perf_counter() - start)
+            store.close()
+    frame.Destroy()
+    app.Destroy()
+
+
+def bench_subscriptions(results, sizes):
+    """Save and load subscription lists, as feed_urls.txt and in the subscription store."""
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "feed_urls.txt")
+        for size in SUBSCRIPTION_SIZES:
+            feed_urls = subscription_list(size)
+            results.add("subscriptions", "save text", size, measure(lambda: write_feed_urls(feed_urls, path), size))
+            results.add("subscriptions", "load text", size, measure(lambda: read_feed_urls(path), size))
+
+            start = time.perf_counter()
+            store = subscription_store(directory, size)
+            results.add("subscriptions", "migrate text to store", size, time.perf_counter() - start)
+            results.add("subscriptions", "load store", size, measure(store.feeds, size))
+
+            url = "https://feeds.example.com/new.rss"
+            start = time.perf_counter()
+            store.add_feed(url, "New feed", "Category 0")
+            store.remove_feed(url)
+            results.add("subscriptions", "add and remove one feed", size, time.perf_counter() - start)
+            store.close()
+
+
+def simulate_refreshes(posts, duration, next_fetch, tick=15):
+    """Replay a polling policy over posting times; returns (fetches, delays until each post was fetched).
+
+    next_fetch(index, now, seen) is called after each fetch of feed index with
+    the publication times seen so far, and returns the time of the next fetch.
+    """
+    clock = SimulatedClock()
+    fetched = [0] * len(posts)
+    due = [next_fetch(index, 0.0, []) for index in range(len(posts))]
+    fetches, delays = 0, []
+    while clock.now < duration:
+        clock.advance(tick)
+        for index, when in enumerate(due):
+            if when > clock.now:
+                continue
+            fetches += 1
+            times = posts[index]
+            visible = bisect.bisect_right(times, clock.now)
+            delays.extend(clock.now - posted for posted in times[fetched[index]:visible] if posted > 0)
+            fetched[index] = visible
+            due[index] = next_fetch(index, clock.now, times[max(0, visible - 20):visible])
+    return fetches, delays
+
+
+def bench_scheduler(results, sizes, feeds=500, days=3, fixed_interval=30 * 60):
+    """Fetches and freshness of the adaptive scheduler against fixed-interval polling, on a simulated clock."""
+    duration = days * 86400
+    posts = posting_times(feeds, duration)
+
+    def delay_stats(delays):
+        delays = sorted(delays)
+        return {
+            "mean_delay_min": round(sum(delays) / len(delays) / 60, 1),
+            "p95_delay_min": round(delays[int(len(delays) * 0.95)] / 60, 1),
+        }
+
+    clock = SimulatedClock()
+    scheduler = RefreshScheduler(clock=clock, rng=random.Random(0), per_host_limit=feeds)
+    urls = [f"https://feeds.example.com/{index}.rss" for index in range(feeds)]
+
+    def adaptive(index, now, seen):
+        clock.now = now
+        if urls[index] not in scheduler.feeds:
+            scheduler.add(urls[index])
+        else:
+            scheduler.record_success(urls[index], seen)
+        return scheduler.next_due(urls[index])
+
+    start = time.perf_counter()
+    adaptive_fetches, delays = simulate_refreshes(posts, duration, adaptive)
+    results.add("scheduler", "adaptive", feeds, time.perf_counter() - start,
+                fetches=adaptive_fetches, **delay_stats(delays))
+
+    # Fixed polling at the same interval, and at the interval that spends the same number of fetches
+    same_budget = feeds * duration / adaptive_fetches
+    for label, interval in ((f"fixed {fixed_interval // 60} min", fixed_interval),
+                            (f"fixed {same_budget / 60:.0f} min (same fetches)", same_budget)):
+        start = time.perf_counter()
+        fetches, delays = simulate_refreshes(posts, duration, lambda index, now, seen: now + interval)
+        results.add("scheduler", label, feeds, time.perf_counter() - start,
+                    fetches=fetches, **delay_stats(delays))
+
+
+def bench_metrics(results, sizes, count=1000000):
+    """Cost of timing a stage with instrumentation turned on and off."""
+    for case, metrics in (("enabled", Metrics()), ("disabled", Metrics(enabled=False))):
+        def timed():
+            for _ in range(count):
+                with metrics.time("bench"):
+                    pass
+
+        results.add("metrics", case, count, measure(timed, count))
+
+
+def bench_startup(results, sizes, runs=3):
+    """Time process start to a visible window with the feed tree filled in.
+
+    Without a display server the app is run under xvfb-run, so the benchmark
+    also works on headless machines.
+    """
+    prefix = []
+    if sys.platform.startswith("linux") and not os.environ.get("DISPLAY"):
+        if not shutil.which("xvfb-run"):
+            results.skip("startup", "no display server and xvfb-run is not installed")
+            return
+        prefix = ["xvfb-run", "-a"]
+
+    for case, options in (("full", []), ("no analysis", ["--no-analysis"])):
+        command = prefix + [sys.executable, "main.py", "--startup-benchmark"] + options
+        timings = []
+        for _ in range(runs):
+            start = time.perf_counter()
+            process = subprocess.Popen(command, cwd=ROOT, stdout=subprocess.PIPE, text=True)
+            for line in process.stdout:
+                if line.startswith("startup:"):
+                    timings.append(time.perf_counter() - start)
+                    break
+            process.wait()
+
+        if timings:
+            results.add("startup", case, 0, min(timings), worst_s=round(max(timings), 3), runs=len(timings))
+        else:
+            results.skip(f"startup/{case}", "the window never reported startup")
+
+
+BENCHMARKS = {
+    "parse": bench_parse,
+    "feed_selected": bench_feed_selected,
+    "analysis": bench_analysis,
+    "content": bench_content,
+    "sentiment": bench_sentiment,
+    "dedup": bench_dedup,
+    "memory": bench_memory,
+    "render": bench_render,
+    "tree": bench_tree,
+    "subscriptions": bench_subscriptions,
+    "metrics": bench_metrics,
+    "scheduler": bench_scheduler,
+    "startup": bench_startup,
+}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="Run RSS Reader benchmarks offline")
+    parser.add_argument("names", nargs="*", help=f"benchmarks to run: {', '.join(BENCHMARKS)} (default: all)")
+    parser.add_argument("--quick", action="store_true", help="skip the 100k item fixtures")
+    parser.add_argument("--output", help="write the results to this JSON file")
+    args = parser.parse_args(argv)
+
+    unknown = set(args.names) - set(BENCHMARKS)
+    if unknown:
+        parser.error(f"unknown benchmark: {', '.join(sorted(unknown))}")
+
+    sizes = QUICK_ITEM_SIZES if args.quick else ITEM_SIZES
+    results = Results()
+    for name in args.names or BENCHMARKS:
+        BENCHMARKS[name](results, sizes)
+
+    if args.output:
+        results.write(args.output, args.quick)
+        print(f"Results written to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
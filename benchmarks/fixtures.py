@@ -0,0 +1,256 @@
+"""Generated RSS/Atom fixtures and a local HTTP stand-in that serves them."""
+import hashlib
+import math
+import random
+import threading
+import time
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from xml.sax.saxutils import escape
+
+WORDS = (
+    "regjeringen statsminister stortinget nyheter fotball kommune rogaland stavanger "
+    "olje energi klima valg skole helse sykehus politi trafikk været kultur musikk "
+    "pemerintah presiden berita ekonomi jakarta pemilu harga minyak sekolah rumah "
+    "government minister election economy market energy climate police traffic health "
+    "og i på er det som en til av for med har ikke dan yang di ke dari the of and to in "
+    "seier krise bagus tewas good killed"
+).split()
+
+# Fixed reference time so fixtures are identical across runs
+EPOCH = 1700000000
+
+
+def make_entries(count, seed=0):
+    """Generate entries with a realistic mix of Norwegian, Indonesian and English words."""
+    rng = random.Random(seed)
+    entries = []
+    for index in range(count):
+        published = EPOCH - index * 600
+        entries.append({
+            "title": " ".join(rng.choices(WORDS, k=8)),
+            "summary": (
+                f'<p><img src="https://img.example.com/{index}.jpg" width="600">'
+                + " ".join(rng.choices(WORDS, k=60))
+                + '<img src="https://track.example.com/p.gif" width="1" height="1"></p>'
+            ),
+            "link": f"https://news.example.com/article/{seed}/{index}",
+            "id": f"urn:fixture:{seed}:{index}",
+            "published": formatdate(published),
+            "published_ts": published,
+            "thumbnail": f"https://img.example.com/{index}_thumb.jpg",
+        })
+    return entries
+
+
+def syndicated_entries(count, overlap=0.3, seed=0):
+    """Return entries of two overlapping feeds and the positions of the shared stories.
+
+    The second feed repeats ``overlap`` of the first feed's stories a few
+    minutes later, with an edited title and a few words of the summary changed.
+    """
+    rng = random.Random(seed)
+    originals = make_entries(count, seed)
+    syndicated = make_entries(count, seed + 1)
+    shared = sorted(rng.sample(range(count), int(count * overlap)))
+    for index in shared:
+        copy = dict(originals[index])
+        words = copy["summary"].split(" ")
+        for position in rng.sample(range(1, len(words) - 1), 3):
+            words[position] = rng.choice(WORDS)
+        copy.update(
+            title=copy["title"] + " - oppdatert",
+            summary=" ".join(words),
+            link=syndicated[index]["link"],
+            id=syndicated[index]["id"],
+            published=formatdate(copy["published_ts"] + 300),
+            published_ts=copy["published_ts"] + 300,
+        )
+        syndicated[index] = copy
+    return originals, syndicated, shared
+
+
+def messy_summary(rng, index, paragraphs=20):
+    """Return summary markup the way scraped full-text feeds deliver it: wrapped, styled and full of embeds."""
+    parts = [
+        f'<div class="article" style="font-family:Georgia;color:#333" data-index="{index}">',
+        '<style>.article p { margin: 0 0 1em; } .ad { display: block; }</style>',
+        '<script type="text/javascript">window.dataLayer = window.dataLayer || [];'
+        f'dataLayer.push({{"event": "view", "article": {index}, "tags": ["a<b", "c>d"]}});</script>',
+        f'<img src="data:image/png;base64,{"iVBORw0KGgo" * 400}" alt="">',
+    ]
+    for paragraph in range(paragraphs):
+        words = " ".join(rng.choices(WORDS, k=40))
+        parts.append(
+            f'<p style="line-height:1.5" onclick="track({paragraph})"><span class="lead">{words}</span> '
+            f'&amp; <a href="https://news.example.com/{index}/{paragraph}" target="_blank" '
+            f'onmouseover="track()">les mer</a> &#8211; <em>{rng.choice(WORDS)}</em></p>'
+        )
+        if paragraph % 5 == 0:
+            parts.append(
+                f'<iframe src="https://video.example.com/embed/{index}" width="640" height="360">'
+                '<p>Your browser does not support iframes.</p></iframe>'
+                '<!-- ad slot --><div class="ad"><noscript><img src="https://ads.example.com/n.gif"></noscript>'
+                '<svg width="10" height="10"><circle cx="5" cy="5" r="4"/></svg></div>'
+            )
+    parts.append('<img src="https://track.example.com/p.gif" width="1" height="1" style="display:none"></div>')
+    return "".join(parts)
+
+
+def make_messy_entries(count, seed=0):
+    """Generate entries like make_entries, with large messy summaries."""
+    rng = random.Random(seed)
+    entries = make_entries(count, seed)
+    for index, entry in enumerate(entries):
+        entry["summary"] = messy_summary(rng, index)
+    return entries
+
+
+def rss_document(count, seed=0):
+    """Return an RSS 2.0 document with count items."""
+    items = "".join(
+        f"<item><title>{escape(entry['title'])}</title>"
+        f"<link>{entry['link']}</link>"
+        f"<guid isPermaLink=\"false\">{entry['id']}</guid>"
+        f"<pubDate>{entry['published']}</pubDate>"
+        f"<description>{escape(entry['summary'])}</description>"
+        f"<media:thumbnail url=\"{entry['thumbnail']}\"/></item>"
+        for entry in make_entries(count, seed)
+    )
+    return (
+        '<?xml version="1.0" encoding="utf-8"?>'
+        '<rss version="2.0" xmlns:media="http://search.yahoo.com/mrss/"><channel>'
+        f"<title>Fixture RSS {count}</title><link>https://news.example.com/</link>"
+        f"<description>Generated fixture</description><ttl>15</ttl>{items}</channel></rss>"
+    ).encode("utf-8")
+
+
+def atom_document(count, seed=0):
+    """Return an Atom 1.0 document with count entries."""
+    entries = "".join(
+        f"<entry><title>{escape(entry['title'])}</title>"
+        f"<link href=\"{entry['link']}\"/><id>{entry['id']}</id>"
+        f"<updated>{time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime(entry['published_ts']))}</updated>"
+        f"<summary type=\"html\">{escape(entry['summary'])}</summary></entry>"
+        for entry in make_entries(count, seed)
+    )
+    return (
+        '<?xml version="1.0" encoding="utf-8"?>'
+        '<feed xmlns="http://www.w3.org/2005/Atom">'
+        f"<title>Fixture Atom {count}</title><id>urn:fixture:atom:{count}</id>"
+        f"<updated>{time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime(EPOCH))}</updated>{entries}</feed>"
+    ).encode("utf-8")
+
+
+def subscription_list(count, categories=20):
+    """Return count (url, description, category) subscriptions."""
+    return [
+        (f"https://feeds.example.com/{index}.rss", f"Fixture feed {index}", f"Category {index % categories}")
+        for index in range(count)
+    ]
+
+
+def posting_times(count, duration, seed=0):
+    """Return per-feed Poisson posting times over duration seconds.
+
+    Feeds post between every ten minutes and every three days, log-uniformly,
+    like a mix of live news desks and slow blogs.
+    """
+    rng = random.Random(seed)
+    feeds = []
+    for _ in range(count):
+        mean_gap = math.exp(rng.uniform(math.log(600), math.log(3 * 86400)))
+        times, now = [], -rng.uniform(0, 20 * mean_gap)
+        while now < duration:
+            now += rng.expovariate(1 / mean_gap)
+            times.append(now)
+        feeds.append(times)
+    return feeds
+
+
+class SimulatedClock:
+    """Clock for RefreshScheduler that only moves when told to."""
+
+    def __init__(self, now=0.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += seconds
+
+
+class FixtureServer:
+    """Local HTTP stand-in serving /rss/<count> and /atom/<count>, with ETag support.
+
+    Use as a context manager; documents are generated once and kept in memory.
+    Every request is logged in ``requests`` as (path, request headers, status).
+    """
+
+    def __init__(self):
+        self.documents = {}
+        self.requests = []
+        self.lock = threading.Lock()
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    def document(self, kind, count):
+        """Return (body, etag) of a fixture, generating it on first use."""
+        with self.lock:
+            if (kind, count) not in self.documents:
+                body = rss_document(count) if kind == "rss" else atom_document(count)
+                self.documents[kind, count] = body, f'"{hashlib.sha1(body).hexdigest()}"'
+            return self.documents[kind, count]
+
+    def url(self, kind, count):
+        """Return the URL of a fixture."""
+        return f"http://127.0.0.1:{self.server.server_port}/{kind}/{count}"
+
+    def _handler(self):
+        fixtures = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def send_response(self, code, message=None):
+                with fixtures.lock:
+                    fixtures.requests.append((self.path, dict(self.headers), code))
+                super().send_response(code, message)
+
+            def do_GET(self):
+                try:
+                    _, kind, count = self.path.split("/")
+                    body, etag = fixtures.document(kind, int(count))
+                except ValueError:
+                    self.send_response(404)
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+
+                if self.headers.get("If-None-Match") == etag:
+                    self.send_response(304)
+                    self.send_header("ETag", etag)
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+
+                self.send_response(200)
+                self.send_header("Content-Type", "application/xml; charset=utf-8")
+                self.send_header("ETag", etag)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.server.shutdown()
+        self.server.server_close()
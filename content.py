@@ -0,0 +1,159 @@
+"""Single-pass normalization of feed summaries into safe display HTML and plain text.
+
+Runs once per entry at ingest; the results are stored with the entry so
+rendering, keyword extraction, sentiment and search never parse the markup
+again.
+"""
+import re
+from html import escape, unescape
+
+# Tags kept in the display HTML; every other tag is dropped but its text kept
+ALLOWED_TAGS = frozenset({
+    "a", "abbr", "b", "blockquote", "br", "cite", "code", "dd", "dl", "dt", "em", "figcaption", "figure",
+    "h1", "h2", "h3", "h4", "h5", "h6", "hr", "i", "li", "ol", "p", "pre", "q", "s", "small", "strong",
+    "sub", "sup", "table", "tbody", "td", "tfoot", "th", "thead", "tr", "u", "ul",
+})
+
+# Tags that have no end tag
+VOID_TAGS = frozenset({
+    "area", "base", "br", "col", "embed", "hr", "img", "input", "link", "meta", "param", "source", "track", "wbr",
+})
+
+# Tags dropped together with everything inside them
+DROPPED_TAGS = frozenset({
+    "applet", "audio", "button", "canvas", "form", "frameset", "head", "iframe", "math", "noscript",
+    "object", "select", "script", "style", "svg", "template", "textarea", "title", "video",
+})
+
+# Dropped tags whose contents are raw text, skipped up to the matching end tag
+RAW_TEXT_END = {
+    tag: re.compile(rf"</{tag}\s*>", re.IGNORECASE) for tag in ("script", "style", "textarea", "title")
+}
+
+# Tags that separate lines in the plain text
+BLOCK_TAGS = frozenset({
+    "address", "article", "aside", "blockquote", "br", "dd", "div", "dl", "dt", "figcaption", "figure",
+    "footer", "h1", "h2", "h3", "h4", "h5", "h6", "header", "hr", "li", "main", "ol", "p", "pre",
+    "section", "table", "td", "th", "tr", "ul",
+})
+
+# Attributes kept on allowed tags; href only with one of SAFE_SCHEMES
+ALLOWED_ATTRIBUTES = {
+    "a": ("href", "title"),
+    "abbr": ("title",),
+    "td": ("colspan", "rowspan"),
+    "th": ("colspan", "rowspan"),
+}
+SAFE_SCHEMES = ("http://", "https://", "mailto:")
+
+# Characters of display HTML kept per entry; longer summaries are cut off
+MAX_CONTENT_CHARS = 100000
+
+# Comments, tags (with quoted attribute values that may contain '>') and declarations
+TOKEN_PATTERN = re.compile(
+    r"<!--.*?(?:-->|\Z)"
+    r"|<(/?)([a-zA-Z][^\s/>]*)((?:\"[^\"]*\"|'[^']*'|[^'\">])*)>"
+    r"|<[!?][^>]*>",
+    re.DOTALL,
+)
+ATTRIBUTE_PATTERN = re.compile(r"""([^\s=/>]+)(?:\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s>]+)))?""")
+SPACES_PATTERN = re.compile(r"[^\S\n]+")
+NEWLINES_PATTERN = re.compile(r"\s*\n\s*")
+
+
+def _attributes(tag, source):
+    """Return the allowed attributes of a tag as markup."""
+    allowed = ALLOWED_ATTRIBUTES.get(tag)
+    if not allowed or not source:
+        return ""
+    attributes = ""
+    for name, double, single, bare in ATTRIBUTE_PATTERN.findall(source):
+        name = name.lower()
+        if name not in allowed:
+            continue
+        value = unescape(double or single or bare)
+        if name == "href" and not value.strip().lower().startswith(SAFE_SCHEMES):
+            continue
+        if name in ("colspan", "rowspan") and not value.isdigit():
+            continue
+        attributes += f' {name}="{escape(value)}"'
+    return attributes
+
+
+def normalize(markup, max_chars=MAX_CONTENT_CHARS):
+    """Return (sanitized display HTML, plain text) of a feed summary.
+
+    The markup is scanned once, tag by tag. Scripts, styles, frames, embedded
+    media and images (tracking pixels included) are removed, as are all
+    attributes except safe links; tags left open are closed.
+    """
+    if not markup:
+        return "", ""
+    if "<" not in markup and "&" not in markup:
+        text = SPACES_PATTERN.sub(" ", markup).strip()
+        return escape(text, quote=False), text
+
+    html, text, open_tags = [], [], []
+    length = 0
+    dropped_depth = 0
+    position = 0
+    while length <= max_chars:
+        match = TOKEN_PATTERN.search(markup, position)
+        end = match.start() if match else len(markup)
+        if end > position and not dropped_depth:
+            data = markup[position:end]
+            if "&" in data:
+                data = unescape(data)
+            data = data[:max_chars - length + 1]
+            text.append(data)
+            data = escape(data, quote=False)
+            html.append(data)
+            length += len(data)
+        if match is None:
+            break
+        position = match.end()
+
+        closing, tag, attributes = match.groups()
+        if tag is None:
+            continue
+        tag = tag.lower()
+
+        if tag in DROPPED_TAGS:
+            if closing:
+                dropped_depth = max(0, dropped_depth - 1)
+            elif tag in RAW_TEXT_END:
+                end_match = RAW_TEXT_END[tag].search(markup, position)
+                position = end_match.end() if end_match else len(markup)
+            elif not attributes.endswith("/"):
+                dropped_depth += 1
+            continue
+        if dropped_depth:
+            continue
+
+        if tag in BLOCK_TAGS:
+            text.append("\n")
+        if tag not in ALLOWED_TAGS:
+            continue
+
+        if closing:
+            if tag in open_tags:
+                # Close anything left open inside it, so the output stays well-formed
+                while True:
+                    open_tag = open_tags.pop()
+                    html.append(f"</{open_tag}>")
+                    if open_tag == tag:
+                        break
+        else:
+            element = f"<{tag}{_attributes(tag, attributes)}>"
+            html.append(element)
+            length += len(element)
+            if tag in VOID_TAGS:
+                continue
+            if attributes.endswith("/"):
+                html.append(f"</{tag}>")
+            else:
+                open_tags.append(tag)
+
+    html.extend(f"</{tag}>" for tag in reversed(open_tags))
+    text = SPACES_PATTERN.sub(" ", "".join(text))
+    return "".join(html), NEWLINES_PATTERN.sub("\n", text).strip()
@@ -0,0 +1,94 @@
+"""Near-duplicate detection with MinHash signatures and locality-sensitive hashing.
+
+Each entry's title and text are cut into word shingles and summarized by a
+MinHash signature; the share of equal signature values estimates the
+Jaccard similarity of two entries' shingle sets. The signature is split
+into bands, and each band hashed into a bucket: entries sharing any bucket
+are candidates, so finding them is an index lookup rather than a
+comparison against every stored entry.
+"""
+import array
+import hashlib
+import re
+
+TOKEN_PATTERN = re.compile(r"[^\W_]+")
+
+# Marks a bin no shingle fell into, before densification
+EMPTY = 1 << 64
+
+
+class MinHasher:
+    """Compute MinHash signatures and LSH bucket keys.
+
+    Signatures use one-permutation hashing: every shingle is hashed once and
+    falls into one of bands * rows bins, each keeping its smallest hash;
+    empty bins borrow from the next filled one. That costs one hash per
+    shingle instead of one per shingle and signature value.
+
+    With 16 bands of 4 rows, pairs with a Jaccard similarity of 0.5 become
+    candidates about two times in three, and pairs above 0.7 almost always.
+    Hashing is unseeded, so signatures and buckets stay comparable across runs.
+    """
+
+    def __init__(self, bands=16, rows=4, shingle_size=2):
+        self.bands = bands
+        self.rows = rows
+        self.size = bands * rows
+        self.shingle_size = shingle_size
+        # Bin values are below this; borrowed values are shifted by multiples of it
+        self.offset = EMPTY // self.size
+
+    def shingles(self, text):
+        """Return the word shingles of a text, lowercased and stripped of punctuation."""
+        tokens = TOKEN_PATTERN.findall(text.lower())
+        size = self.shingle_size
+        if len(tokens) <= size:
+            return {" ".join(tokens)} if tokens else set()
+        return {" ".join(tokens[start:start + size]) for start in range(len(tokens) - size + 1)}
+
+    def signature(self, text):
+        """Return the MinHash signature of a text as a list of integers, or None for a text without words."""
+        shingles = self.shingles(text)
+        if not shingles:
+            return None
+
+        size = self.size
+        values = [EMPTY] * size
+        for shingle in shingles:
+            value = int.from_bytes(hashlib.blake2b(shingle.encode("utf-8"), digest_size=8).digest(), "big")
+            value, position = divmod(value, size)
+            if value < values[position]:
+                values[position] = value
+
+        # Rotation densification: an empty bin takes the value of the next filled bin, offset by the distance
+        signature = list(values)
+        for position, value in enumerate(values):
+            if value == EMPTY:
+                distance = 1
+                while values[(position + distance) % size] == EMPTY:
+                    distance += 1
+                signature[position] = (values[(position + distance) % size] + distance * self.offset) % EMPTY
+        return signature
+
+    @staticmethod
+    def pack(signature):
+        """Return a signature as bytes for storage; b"" stands for no signature."""
+        return array.array("Q", signature).tobytes() if signature else b""
+
+    @staticmethod
+    def unpack(data):
+        return array.array("Q", data).tolist() if data else None
+
+    def bucket_keys(self, signature):
+        """Return one bucket key per band, as signed 64-bit integers that fit an SQLite INTEGER."""
+        keys = []
+        for band in range(self.bands):
+            values = array.array("Q", [band] + signature[band * self.rows:(band + 1) * self.rows])
+            digest = hashlib.blake2b(values.tobytes(), digest_size=8).digest()
+            keys.append(int.from_bytes(digest, "big", signed=True))
+        return keys
+
+    @staticmethod
+    def similarity(first, second):
+        """Estimate the Jaccard similarity of two signatures."""
+        return sum(a == b for a, b in zip(first, second)) / len(first)
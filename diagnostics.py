@@ -0,0 +1,113 @@
+"""Diagnostics window showing live stage timings and per-feed counters."""
+import wx
+
+# (heading, width) of the stage and feed tables
+STAGE_COLUMNS = [("Stage", 110), ("Count", 70), ("Mean ms", 80), ("p50 ms", 80), ("p95 ms", 80), ("Max ms", 80)]
+FEED_COLUMNS = [("Feed", 260), ("Fetches", 70), ("Unchanged", 80), ("Errors", 60), ("Entries", 70),
+                ("KB", 70), ("Mean fetch ms", 100)]
+
+# Feeds listed, slowest total fetch time first
+MAX_FEED_ROWS = 200
+
+REFRESH_MS = 1000
+
+
+def milliseconds(seconds):
+    return "" if seconds is None else f"{seconds * 1000:.1f}"
+
+
+class DiagnosticsFrame(wx.Frame):
+    """Live view of a Metrics registry, refreshed once a second while open."""
+
+    def __init__(self, parent, metrics, feed_title=None):
+        super().__init__(parent, title="Diagnostics", size=(760, 560))
+        self.metrics = metrics
+        self.feed_title = feed_title or (lambda url: url)
+
+        panel = wx.Panel(self)
+        self.stage_list = self.create_list(panel, STAGE_COLUMNS)
+        self.feed_list = self.create_list(panel, FEED_COLUMNS)
+
+        json_btn = wx.Button(panel, label="Export JSON...")
+        prometheus_btn = wx.Button(panel, label="Export Prometheus...")
+        reset_btn = wx.Button(panel, label="Reset")
+        json_btn.Bind(wx.EVT_BUTTON, lambda event: self.export("JSON files (*.json)|*.json", metrics.to_json))
+        prometheus_btn.Bind(wx.EVT_BUTTON,
+                            lambda event: self.export("Prometheus text (*.prom)|*.prom", metrics.to_prometheus))
+        reset_btn.Bind(wx.EVT_BUTTON, self.on_reset)
+
+        # Layout
+        buttons = wx.BoxSizer(wx.HORIZONTAL)
+        for button in (json_btn, prometheus_btn, reset_btn):
+            buttons.Add(button, 0, wx.RIGHT, 5)
+        sizer = wx.BoxSizer(wx.VERTICAL)
+        sizer.Add(wx.StaticText(panel, label="Stages"), 0, wx.LEFT | wx.TOP, 5)
+        sizer.Add(self.stage_list, 1, wx.EXPAND | wx.ALL, 5)
+        sizer.Add(wx.StaticText(panel, label=f"Feeds (slowest {MAX_FEED_ROWS})"), 0, wx.LEFT, 5)
+        sizer.Add(self.feed_list, 2, wx.EXPAND | wx.ALL, 5)
+        sizer.Add(buttons, 0, wx.ALL, 5)
+        panel.SetSizer(sizer)
+
+        self.timer = wx.Timer(self)
+        self.Bind(wx.EVT_TIMER, lambda event: self.refresh(), self.timer)
+        self.Bind(wx.EVT_CLOSE, self.on_close)
+        self.refresh()
+        self.timer.Start(REFRESH_MS)
+
+    @staticmethod
+    def create_list(parent, columns):
+        list_ctrl = wx.ListCtrl(parent, style=wx.LC_REPORT | wx.LC_SINGLE_SEL)
+        for index, (heading, width) in enumerate(columns):
+            list_ctrl.InsertColumn(index, heading, width=width)
+        return list_ctrl
+
+    @staticmethod
+    def fill(list_ctrl, rows):
+        """Update the rows of a list control in place, so its scroll position is kept."""
+        list_ctrl.Freeze()
+        while list_ctrl.GetItemCount() > len(rows):
+            list_ctrl.DeleteItem(list_ctrl.GetItemCount() - 1)
+        while list_ctrl.GetItemCount() < len(rows):
+            list_ctrl.InsertItem(list_ctrl.GetItemCount(), "")
+        for index, row in enumerate(rows):
+            for column, value in enumerate(row):
+                list_ctrl.SetItem(index, column, value)
+        list_ctrl.Thaw()
+
+    def refresh(self):
+        """Show the current contents of the registry."""
+        snapshot = self.metrics.snapshot()
+        self.fill(self.stage_list, [
+            (stage, str(stats["count"]), milliseconds(stats["mean"]), milliseconds(stats["p50"]),
+             milliseconds(stats["p95"]), milliseconds(stats["max"]))
+            for stage, stats in snapshot["stages"].items()
+        ])
+
+        feeds = sorted(snapshot["feeds"].items(), key=lambda item: item[1]["fetch_seconds"], reverse=True)
+        self.fill(self.feed_list, [
+            (self.feed_title(url), str(counters["fetches"]), str(counters["not_modified"]),
+             str(counters["errors"]), str(counters["entries"]), f"{counters['bytes'] / 1024:.0f}",
+             milliseconds(counters["fetch_seconds"] / counters["fetches"] if counters["fetches"] else None))
+            for url, counters in feeds[:MAX_FEED_ROWS]
+        ])
+
+    def export(self, wildcard, render):
+        """Save the registry in the format produced by render()."""
+        with wx.FileDialog(self, "Export metrics", wildcard=wildcard,
+                           style=wx.FD_SAVE | wx.FD_OVERWRITE_PROMPT) as dialog:
+            if dialog.ShowModal() != wx.ID_OK:
+                return
+            path = dialog.GetPath()
+        try:
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(render())
+        except OSError as e:
+            wx.MessageBox(f"Could not export metrics: {e}", "Error", wx.OK | wx.ICON_ERROR)
+
+    def on_reset(self, event):
+        self.metrics.reset()
+        self.refresh()
+
+    def on_close(self, event):
+        self.timer.Stop()
+        event.Skip()
@@ -0,0 +1,898 @@
+"""SQLite-backed store of fetched feed entries."""
+import calendar
+import hashlib
+import heapq
+import html
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+from content import normalize
+from dedup import MinHasher
+from records import EntryRecord, ParsedEntry
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    id INTEGER PRIMARY KEY,
+    feed_url TEXT NOT NULL,
+    guid TEXT NOT NULL,
+    link TEXT,
+    title TEXT,
+    summary TEXT,
+    published TEXT,
+    published_ts REAL NOT NULL,
+    thumbnail TEXT,
+    content_hash TEXT NOT NULL,
+    fetched_at REAL NOT NULL,
+    keywords TEXT,
+    sentiment_score REAL,
+    sentiment_label TEXT,
+    body_html TEXT,
+    body_text TEXT,
+    minhash BLOB,
+    cluster_id INTEGER,
+    cluster_head INTEGER NOT NULL DEFAULT 1
+);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_entries_feed_guid ON entries (feed_url, guid);
+CREATE INDEX IF NOT EXISTS idx_entries_link ON entries (link);
+"""
+
+# Columns added after the first release, applied to existing databases on open
+MIGRATIONS = [
+    ("keywords", "TEXT"),
+    ("sentiment_score", "REAL"),
+    ("sentiment_label", "TEXT"),
+    ("body_html", "TEXT"),
+    ("body_text", "TEXT"),
+    ("minhash", "BLOB"),
+    ("cluster_id", "INTEGER"),
+    ("cluster_head", "INTEGER NOT NULL DEFAULT 1"),
+]
+
+# The view indexes are in the orders EntryView sorts and looks up newer story
+# entries by, and also hold every column it filters on, so counting and paging
+# a view never read the entries themselves
+INDEXES = """
+CREATE INDEX IF NOT EXISTS idx_entries_unclustered ON entries (published_ts) WHERE minhash IS NULL;
+DROP INDEX IF EXISTS idx_entries_feed_published;
+DROP INDEX IF EXISTS idx_entries_published;
+DROP INDEX IF EXISTS idx_entries_sentiment;
+DROP INDEX IF EXISTS idx_entries_cluster;
+CREATE INDEX IF NOT EXISTS idx_entries_view_feed
+    ON entries (feed_url, published_ts, id, sentiment_label, cluster_head, cluster_id);
+CREATE INDEX IF NOT EXISTS idx_entries_view_published
+    ON entries (published_ts, id, feed_url, sentiment_label, cluster_head, cluster_id);
+CREATE INDEX IF NOT EXISTS idx_entries_view_title
+    ON entries (title COLLATE NOCASE, id, feed_url, sentiment_label, cluster_head, cluster_id, published_ts);
+CREATE INDEX IF NOT EXISTS idx_entries_view_sentiment
+    ON entries (sentiment_score, id, feed_url, sentiment_label, cluster_head, cluster_id, published_ts);
+CREATE INDEX IF NOT EXISTS idx_entries_view_cluster
+    ON entries (cluster_id, published_ts, id, feed_url, sentiment_label);
+"""
+
+# LSH buckets of every entry's MinHash signature, one row per band; pruned entries
+# are removed by the trigger, which also hands a pruned story head's flag to the
+# newest entry left in its cluster
+DEDUP_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entry_buckets (
+    bucket INTEGER NOT NULL,
+    entry_id INTEGER NOT NULL,
+    PRIMARY KEY (bucket, entry_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_entry_buckets_entry ON entry_buckets (entry_id);
+CREATE TRIGGER IF NOT EXISTS entry_buckets_delete AFTER DELETE ON entries BEGIN
+    DELETE FROM entry_buckets WHERE entry_id = old.id;
+END;
+CREATE TRIGGER IF NOT EXISTS entries_cluster_head_delete AFTER DELETE ON entries
+WHEN old.cluster_head AND old.cluster_id IS NOT NULL BEGIN
+    UPDATE entries SET cluster_head = 1 WHERE id = (
+        SELECT id FROM entries WHERE cluster_id = old.cluster_id ORDER BY published_ts DESC, id DESC LIMIT 1
+    );
+END;
+"""
+
+MINHASHER = MinHasher()
+
+# Estimated Jaccard similarity from which two entries are the same story
+DUPLICATE_SIMILARITY = 0.6
+
+# Only entries published this close together are compared, in seconds
+DUPLICATE_WINDOW = 3 * 86400
+
+# Most recent bucket mates checked per entry, bounding the work for boilerplate texts
+MAX_DUPLICATE_CANDIDATES = 200
+
+# Full-text index over titles, summary text and keywords, kept in step with
+# the entries table at ingest time; pruned entries are removed by the trigger
+SEARCH_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS entries_fts USING fts5 (
+    title, body, keywords, folded,
+    tokenize = 'unicode61 remove_diacritics 2',
+    prefix = '2 3'
+);
+CREATE TRIGGER IF NOT EXISTS entries_fts_delete AFTER DELETE ON entries BEGIN
+    DELETE FROM entries_fts WHERE rowid = old.id;
+END;
+"""
+
+TAG_PATTERN = re.compile(r"<[^>]+>")
+SEARCH_TERM_PATTERN = re.compile(r"[^\W_]+")
+
+# Letters the unicode61 tokenizer keeps as they are, spelled the way they are typed on other keyboards
+FOLDED_LETTERS = str.maketrans({"ø": "o", "æ": "ae"})
+FOLDED_WORD_PATTERN = re.compile(r"[^\W_]*[øæ][^\W_]*")
+
+UPSERT = """
+INSERT INTO entries (feed_url, guid, link, title, summary, published, published_ts,
+                     thumbnail, content_hash, fetched_at, keywords, sentiment_score, sentiment_label,
+                     body_html, body_text, minhash)
+VALUES (:feed_url, :guid, :link, :title, :summary, :published, :published_ts,
+        :thumbnail, :content_hash, :fetched_at, :keywords, :sentiment_score, :sentiment_label,
+        :body_html, :body_text, :minhash)
+ON CONFLICT (feed_url, guid) DO UPDATE SET
+    link = excluded.link,
+    title = excluded.title,
+    summary = excluded.summary,
+    published = excluded.published,
+    published_ts = CASE WHEN excluded.published IS NULL
+                        THEN entries.published_ts ELSE excluded.published_ts END,
+    thumbnail = excluded.thumbnail,
+    content_hash = excluded.content_hash,
+    fetched_at = excluded.fetched_at,
+    keywords = excluded.keywords,
+    sentiment_score = excluded.sentiment_score,
+    sentiment_label = excluded.sentiment_label,
+    body_html = excluded.body_html,
+    body_text = excluded.body_text,
+    minhash = excluded.minhash
+WHERE entries.content_hash != excluded.content_hash
+"""
+
+# Columns read into an EntryRecord up front, and those it reads when first used
+ENTRY_COLUMNS = ", ".join(EntryRecord.COLUMNS)
+DETAIL_COLUMNS = ", ".join(EntryRecord.DETAIL_COLUMNS)
+
+# Sort keys accepted by EntryView, mapped to their ORDER BY expressions; the
+# "feed" sort orders feeds by their titles, and each feed's entries newest first
+SORT_COLUMNS = {
+    "published": "published_ts",
+    "title": "title COLLATE NOCASE",
+    "feed": "published_ts",
+    "sentiment": "sentiment_score",
+}
+
+
+def entry_thumbnail(entry):
+    """Retrieve the thumbnail or media content URL from a parsed feed entry."""
+    if 'thumbnail' in entry:
+        return entry['thumbnail']
+    if 'media_thumbnail' in entry:
+        return entry['media_thumbnail'][0].get('url', "")
+    if 'media_content' in entry:
+        return entry['media_content'][0].get('url', "")
+    if 'enclosures' in entry and entry['enclosures']:
+        return entry['enclosures'][0].get('href', "")
+    return ""
+
+
+def html_to_text(content):
+    """Return the text of an HTML fragment with tags removed and entities decoded."""
+    return html.unescape(TAG_PATTERN.sub(" ", content or ""))
+
+
+def folded_words(*texts):
+    """Return the words of the texts that contain ø or æ, with those letters folded, for the search index."""
+    words = set()
+    for text in texts:
+        if text:
+            words.update(FOLDED_WORD_PATTERN.findall(text.lower()))
+    return " ".join(sorted(word.translate(FOLDED_LETTERS) for word in words))
+
+
+def search_expression(query):
+    """Turn free text into an FTS5 query matching every word as a prefix.
+
+    ø and æ are folded, so "tromso" and "tromsø" both find Tromsø through the index's folded column.
+    """
+    terms = SEARCH_TERM_PATTERN.findall(query.lower().translate(FOLDED_LETTERS))
+    return " ".join(f'"{term}"*' for term in terms)
+
+
+def entry_timestamp(entry):
+    """Return the entry's publication time as epoch seconds, or None."""
+    if 'published_ts' in entry:
+        return entry['published_ts']
+    parsed = entry.get('published_parsed') or entry.get('updated_parsed')
+    return calendar.timegm(parsed) if parsed else None
+
+
+def compact_entry(entry):
+    """Return the fields of a feedparser entry the reader uses as a ParsedEntry."""
+    return ParsedEntry(
+        id=entry.get('id'),
+        title=entry.get('title'),
+        summary=entry.get('summary'),
+        link=entry.get('link'),
+        published=entry.get('published') or entry.get('updated'),
+        published_ts=entry_timestamp(entry),
+        thumbnail=entry_thumbnail(entry),
+    )
+
+
+class EntryStore:
+    """Persist entries per feed, deduplicated by GUID (falling back to the link).
+
+    The retention policy (``retention_days``, ``max_entries_per_feed``) is
+    applied by prune() and also to incoming entries, so entries pruned from
+    the store are not stored again while the feed still lists them.
+
+    ``feed_title(url)`` returns the title a feed is shown with; views sorted
+    by feed order the feeds by it.
+    """
+
+    def __init__(self, path, retention_days=None, max_entries_per_feed=None, feed_title=None):
+        self.path = path
+        self.retention_days = retention_days
+        self.max_entries_per_feed = max_entries_per_feed
+        self.feed_title = feed_title or (lambda url: url)
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.lock = threading.Lock()
+        with self.lock, self.conn:
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.executescript(SCHEMA)
+            existing = {row[1] for row in self.conn.execute("PRAGMA table_info(entries)")}
+            for column, definition in MIGRATIONS:
+                if column not in existing:
+                    self.conn.execute(f"ALTER TABLE entries ADD COLUMN {column} {definition}")
+            if "cluster_head" not in existing:
+                # Clustered before story heads were flagged
+                self.conn.execute(
+                    "UPDATE entries SET cluster_head = 0 WHERE cluster_id IS NOT NULL AND EXISTS ("
+                    "SELECT 1 FROM entries AS newer WHERE newer.cluster_id = entries.cluster_id "
+                    "AND (newer.published_ts, newer.id) > (entries.published_ts, entries.id))"
+                )
+            self.conn.executescript(INDEXES)
+            self.conn.executescript(DEDUP_SCHEMA)
+
+            search_index = self.conn.execute(
+                "SELECT sql FROM sqlite_master WHERE name = 'entries_fts'"
+            ).fetchone()
+            if search_index is not None and "folded" not in search_index[0]:
+                # Built before ø and æ were folded; rebuilt below
+                self.conn.execute("DROP TABLE entries_fts")
+                search_index = None
+            self.conn.executescript(SEARCH_SCHEMA)
+            if search_index is None:
+                self._index_all()
+
+    @staticmethod
+    def _row_from_entry(feed_url, entry, now):
+        """Convert a parsed feed entry (a ParsedEntry or feedparser dict) into a row for the entries table."""
+        title = entry.get('title')
+        summary = entry.get('summary')
+        link = entry.get('link')
+        published = entry.get('published') or entry.get('updated')
+        thumbnail = entry_thumbnail(entry) or None
+        guid = entry.get('id') or link or hashlib.sha1((title or "").encode("utf-8")).hexdigest()
+
+        content = "\x1f".join(value or "" for value in (title, summary, link, published, thumbnail))
+        return {
+            "feed_url": feed_url,
+            "guid": guid,
+            "link": link,
+            "title": title,
+            "summary": summary,
+            "published": published,
+            "published_ts": entry_timestamp(entry) or now,
+            "thumbnail": thumbnail,
+            "content_hash": hashlib.sha1(content.encode("utf-8")).hexdigest(),
+            "fetched_at": now,
+            "keywords": None,
+            "sentiment_score": None,
+            "sentiment_label": None,
+        }
+
+    def _entry_from_row(self, row):
+        """Convert a database row of ENTRY_COLUMNS into an entry record."""
+        return EntryRecord(self, row)
+
+    def changed_rows(self, feed_url, entries):
+        """Return rows for the fetched entries that are new or differ from the stored copy.
+
+        Each row carries an ``is_new`` flag so ingest stages can tell first
+        sightings from updates before the rows are written. Only these rows
+        have their summary normalized into ``body_html`` and ``body_text``,
+        and a MinHash signature computed for duplicate detection.
+
+        Entries the retention policy would prune are left out.
+        """
+        now = time.time()
+        with self.lock:
+            stored = {guid: (content_hash, published_ts) for guid, content_hash, published_ts in self.conn.execute(
+                "SELECT guid, content_hash, published_ts FROM entries WHERE feed_url = ?", (feed_url,)
+            )}
+
+        incoming = {}
+        cutoff = None if self.retention_days is None else now - self.retention_days * 86400
+        for entry in entries:
+            row = self._row_from_entry(feed_url, entry, now)
+            if cutoff is None or row["published_ts"] >= cutoff:
+                incoming[row["guid"]] = row
+
+        if self.max_entries_per_feed is not None:
+            # Keep only entries that would be among the feed's newest once merged with the stored ones
+            timestamps = {guid: published_ts for guid, (_, published_ts) in stored.items()}
+            timestamps.update((guid, row["published_ts"]) for guid, row in incoming.items())
+            kept = set(heapq.nlargest(self.max_entries_per_feed, timestamps, key=timestamps.get))
+            incoming = {guid: row for guid, row in incoming.items() if guid in kept}
+
+        rows = {}
+        for guid, row in incoming.items():
+            stored_hash = stored[guid][0] if guid in stored else None
+            if stored_hash != row["content_hash"]:
+                row["is_new"] = stored_hash is None
+                rows[guid] = row
+        for row in rows.values():
+            row["body_html"], row["body_text"] = normalize(row["summary"])
+            row["minhash"] = self._minhash(row["title"], row["body_text"])
+        return list(rows.values())
+
+    @staticmethod
+    def _minhash(title, text):
+        """Return the packed MinHash signature of an entry's title and text."""
+        return MINHASHER.pack(MINHASHER.signature(f"{title or ''} {text or ''}"))
+
+    def write_rows(self, rows):
+        """Upsert rows produced by changed_rows, index them for search and cluster them into stories.
+
+        The stored entry id is set on each row as ``id``, its story cluster as ``cluster_id``.
+        """
+        if rows:
+            with self.lock, self.conn:
+                self.conn.executemany(UPSERT, rows)
+                for row in rows:
+                    row["id"] = self.conn.execute(
+                        "SELECT id FROM entries WHERE feed_url = ? AND guid = ?",
+                        (row["feed_url"], row["guid"]),
+                    ).fetchone()[0]
+                self._index_rows(rows)
+                self._cluster_rows(rows)
+
+    def _index_rows(self, rows):
+        """Replace the search index entries of the given rows; the caller holds the lock."""
+        self.conn.executemany("DELETE FROM entries_fts WHERE rowid = ?", [(row["id"],) for row in rows])
+        rows = [(row["id"], row["title"], self._body_text(row), row["keywords"]) for row in rows]
+        self.conn.executemany(
+            "INSERT INTO entries_fts (rowid, title, body, keywords, folded) VALUES (?, ?, ?, ?, ?)",
+            [(*row, folded_words(*row[1:])) for row in rows],
+        )
+
+    @staticmethod
+    def _body_text(row):
+        """Return a row's normalized text, or its tag-free summary if it was stored before normalization."""
+        if row.get("body_text") is not None:
+            return row["body_text"]
+        return html_to_text(row["summary"])
+
+    def _cluster_rows(self, rows):
+        """Put each row into the story cluster of its most similar stored entry; the caller holds the lock.
+
+        Candidates come from the LSH buckets the row shares, so the cost does
+        not grow with the number of stored entries. A row without a close
+        enough match starts a cluster of its own, named by its id. The
+        newest entry of every cluster a row joined or left is flagged as its head.
+        """
+        clusters = set()
+        for row in rows:
+            if not row.get("is_new"):
+                self.conn.execute("DELETE FROM entry_buckets WHERE entry_id = ?", (row["id"],))
+                clusters.add(self.conn.execute("SELECT cluster_id FROM entries WHERE id = ?",
+                                               (row["id"],)).fetchone()[0])
+            cluster_id = row["id"]
+            signature = MINHASHER.unpack(row["minhash"])
+            if signature is not None:
+                buckets = MINHASHER.bucket_keys(signature)
+                candidates = self.conn.execute(
+                    f"SELECT id, cluster_id, minhash FROM entries WHERE id IN ("
+                    f"SELECT DISTINCT entry_id FROM entry_buckets WHERE bucket IN ({', '.join('?' * len(buckets))}) "
+                    f"ORDER BY entry_id DESC LIMIT ?"
+                    f") AND +published_ts BETWEEN ? AND ?",
+                    (*buckets, MAX_DUPLICATE_CANDIDATES,
+                     row["published_ts"] - DUPLICATE_WINDOW, row["published_ts"] + DUPLICATE_WINDOW),
+                ).fetchall()
+
+                best = DUPLICATE_SIMILARITY
+                for candidate_id, candidate_cluster, minhash in candidates:
+                    similarity = MINHASHER.similarity(signature, MINHASHER.unpack(minhash))
+                    if similarity >= best:
+                        cluster_id, best = candidate_cluster or candidate_id, similarity
+
+                self.conn.executemany(
+                    "INSERT OR IGNORE INTO entry_buckets (bucket, entry_id) VALUES (?, ?)",
+                    [(bucket, row["id"]) for bucket in buckets],
+                )
+            self.conn.execute("UPDATE entries SET cluster_id = ? WHERE id = ?", (cluster_id, row["id"]))
+            row["cluster_id"] = cluster_id
+            if cluster_id != row["id"] or not row.get("is_new"):
+                # New entries alone in their cluster are flagged as heads by the column default
+                clusters.add(cluster_id)
+
+        clusters.discard(None)
+        for cluster_id in clusters:
+            head = self.conn.execute(
+                "SELECT id FROM entries WHERE cluster_id = ? ORDER BY published_ts DESC, id DESC LIMIT 1",
+                (cluster_id,),
+            ).fetchone()
+            if head is not None:
+                self.conn.execute(
+                    "UPDATE entries SET cluster_head = (id = ?1) WHERE cluster_id = ?2 AND cluster_head != (id = ?1)",
+                    (head[0], cluster_id),
+                )
+
+    def cluster_backlog(self, batch_size=500):
+        """Cluster the entries stored before duplicate detection, oldest first; returns how many there were.
+
+        Runs a transaction per batch, so it can go on in the background while feeds are read.
+        """
+        done = 0
+        while True:
+            with self.lock:
+                batch = self.conn.execute(
+                    "SELECT id, title, summary, body_text, published_ts FROM entries "
+                    "WHERE minhash IS NULL ORDER BY published_ts LIMIT ?",
+                    (batch_size,),
+                ).fetchall()
+            if not batch:
+                return done
+
+            rows = [
+                {"id": row_id, "published_ts": published_ts, "is_new": True,
+                 "minhash": self._minhash(title, html_to_text(summary) if body_text is None else body_text)}
+                for row_id, title, summary, body_text, published_ts in batch
+            ]
+            with self.lock, self.conn:
+                self.conn.executemany("UPDATE entries SET minhash = ? WHERE id = ?",
+                                      [(row["minhash"], row["id"]) for row in rows])
+                self._cluster_rows(rows)
+            done += len(rows)
+
+    def _index_all(self):
+        """Build the search index for every stored entry; the caller holds the lock."""
+        self.conn.execute("DELETE FROM entries_fts")
+        cursor = self.conn.execute("SELECT id, title, summary, keywords, body_text FROM entries")
+        while True:
+            rows = cursor.fetchmany(1000)
+            if not rows:
+                return
+            self._index_rows([
+                {"id": row[0], "title": row[1], "summary": row[2], "keywords": row[3], "body_text": row[4]}
+                for row in rows
+            ])
+
+    def search(self, query, limit=50):
+        """Return the entries best matching a free-text query, each with a ``snippet`` of its best matching column."""
+        expression = search_expression(query)
+        if not expression:
+            return []
+
+        columns = ", ".join(f"entries.{column}" for column in ENTRY_COLUMNS.split(", "))
+        with self.lock:
+            rows = self.conn.execute(
+                f"SELECT {columns}, "
+                f"snippet(entries_fts, -1, '<b>', '</b>', '…', 12), bm25(entries_fts, 10.0, 1.0, 5.0, 1.0) AS rank "
+                f"FROM entries_fts JOIN entries ON entries.id = entries_fts.rowid "
+                f"WHERE entries_fts MATCH ? ORDER BY rank LIMIT ?",
+                (expression, limit),
+            ).fetchall()
+
+        hits = []
+        for row in rows:
+            entry = self._entry_from_row(row[:-2])
+            entry['snippet'], entry['rank'] = row[-2], row[-1]
+            hits.append(entry)
+        return hits
+
+    def upsert_entries(self, feed_url, entries):
+        """Merge fetched entries into the store and return the new or changed rows."""
+        rows = self.changed_rows(feed_url, entries)
+        self.write_rows(rows)
+        return rows
+
+    def entries_for_feed(self, feed_url, limit=None):
+        """Return the stored entries of a feed, newest first."""
+        query = f"SELECT {ENTRY_COLUMNS} FROM entries WHERE feed_url = ? ORDER BY published_ts DESC"
+        params = [feed_url]
+        if limit is not None:
+            query += " LIMIT ?"
+            params.append(limit)
+        with self.lock:
+            rows = self.conn.execute(query, params).fetchall()
+        return [self._entry_from_row(row) for row in rows]
+
+    def entry_details(self, entry_id):
+        """Return the DETAIL_COLUMNS of a stored entry, all None if it is gone."""
+        with self.lock:
+            row = self.conn.execute(f"SELECT {DETAIL_COLUMNS} FROM entries WHERE id = ?", (entry_id,)).fetchone()
+        return row or (None,) * len(EntryRecord.DETAIL_COLUMNS)
+
+    def set_sentiment(self, entry_id, score, label):
+        """Store the sentiment computed for an entry."""
+        with self.lock, self.conn:
+            self.conn.execute(
+                "UPDATE entries SET sentiment_score = ?, sentiment_label = ? WHERE id = ?",
+                (score, label, entry_id),
+            )
+
+    def set_body(self, entry_id, body_html, body_text):
+        """Store the normalized content of an entry stored before normalization was added."""
+        with self.lock, self.conn:
+            self.conn.execute(
+                "UPDATE entries SET body_html = ?, body_text = ? WHERE id = ?",
+                (body_html, body_text, entry_id),
+            )
+
+    def sentiment_summary(self, feed_urls=None):
+        """Return the entry count per sentiment label and the mean score of the given feeds (all by default).
+
+        Entries whose sentiment has not been computed yet are counted as ``unscored``.
+        """
+        where, params = "1", []
+        if feed_urls is not None:
+            feed_urls = list(feed_urls)
+            where, params = f"feed_url IN ({', '.join('?' * len(feed_urls))})", feed_urls
+        with self.lock:
+            rows = self.conn.execute(
+                f"SELECT sentiment_label, COUNT(*), SUM(sentiment_score) FROM entries "
+                f"WHERE {where} GROUP BY sentiment_label",
+                params,
+            ).fetchall()
+
+        summary = {"Positive": 0, "Neutral": 0, "Negative": 0, "unscored": 0, "mean": None}
+        total = scored = 0
+        for label, count, score_sum in rows:
+            if label is None:
+                summary["unscored"] = count
+                continue
+            summary[label] = count
+            total += score_sum or 0.0
+            scored += count
+        if scored:
+            summary["mean"] = total / scored
+        return summary
+
+    def iter_feed(self, feed_url, batch_size=50):
+        """Yield a feed's stored entries newest first, reading them a batch at a time."""
+        query = (f"SELECT {ENTRY_COLUMNS} FROM entries WHERE feed_url = ? "
+                 f"AND (published_ts, id) < (?, ?) "
+                 f"ORDER BY published_ts DESC, id DESC LIMIT ?")
+        position = (float("inf"), 0)
+        while True:
+            with self.lock:
+                rows = self.conn.execute(query, (feed_url, *position, batch_size)).fetchall()
+            for row in rows:
+                yield self._entry_from_row(row)
+            if len(rows) < batch_size:
+                return
+            last = self._entry_from_row(rows[-1])
+            position = (last['published_ts'], last['id'])
+
+    def iter_documents(self, batch_size=1000):
+        """Yield the title, summary and normalized text of every stored entry, for corpus statistics."""
+        last_id = 0
+        while True:
+            with self.lock:
+                rows = self.conn.execute(
+                    "SELECT id, title, summary, body_text FROM entries WHERE id > ? ORDER BY id LIMIT ?",
+                    (last_id, batch_size),
+                ).fetchall()
+            if not rows:
+                return
+            for row_id, title, summary, body_text in rows:
+                document = {"title": title, "summary": summary}
+                if body_text is not None:
+                    document["body_text"] = body_text
+                yield document
+            last_id = rows[-1][0]
+
+    def prune(self, retention_days=None, max_entries_per_feed=None):
+        """Delete entries older than the retention period or beyond the per-feed cap; returns how many.
+
+        Both default to the store's retention policy.
+        """
+        if retention_days is None:
+            retention_days = self.retention_days
+        if max_entries_per_feed is None:
+            max_entries_per_feed = self.max_entries_per_feed
+        deleted = 0
+        with self.lock, self.conn:
+            if retention_days is not None:
+                cutoff = time.time() - retention_days * 86400
+                deleted += self.conn.execute("DELETE FROM entries WHERE published_ts < ?", (cutoff,)).rowcount
+            if max_entries_per_feed is not None:
+                deleted += self.conn.execute(
+                    """
+                    DELETE FROM entries WHERE id IN (
+                        SELECT id FROM (
+                            SELECT id, ROW_NUMBER() OVER (
+                                PARTITION BY feed_url ORDER BY published_ts DESC
+                            ) AS position
+                            FROM entries
+                        ) WHERE position > ?
+                    )
+                    """,
+                    (max_entries_per_feed,),
+                ).rowcount
+        return deleted
+
+    def close(self):
+        """Close the database connection."""
+        with self.lock:
+            self.conn.close()
+
+
+class EntryView:
+    """Sorted, read-only sequence over stored entries, loaded one page at a time.
+
+    Only the pages that are actually looked at are read, and at most
+    ``max_pages`` of them are kept, so a view over 100k entries costs one
+    COUNT query to create and a bounded amount of memory to scroll.
+
+    With collapse, each story cluster shows up once, as its newest entry,
+    with the number of other entries in the view as ``duplicates``.
+
+    Views over several feeds read the view indexes in sort order rather
+    than the entries of each feed, which would have to be sorted first.
+    Sorted by feed, the view is read feed by feed, in the order of the
+    feeds' titles, from the entry counts of each feed taken up front.
+    """
+
+    def __init__(self, store, feed_urls=None, sort_key="published", descending=True,
+                 page_size=200, max_pages=16, sentiment=None, collapse=False):
+        self.store = store
+        self.feed_urls = None if feed_urls is None else list(feed_urls)
+        self.sort_key = sort_key
+        self.descending = descending
+        self.sentiment = sentiment
+        self.collapse = collapse
+        self.page_size = page_size
+        self.max_pages = max_pages
+        self.pages = OrderedDict()
+
+        # Within each feed, a view sorted by feed shows the newest entries first
+        direction = "DESC" if descending or sort_key == "feed" else "ASC"
+        self.order = f"{SORT_COLUMNS[sort_key]} {direction}, id {direction}"
+        if self.feed_urls is None:
+            self.where, self.params = "1", []
+        else:
+            # A unary plus keeps SQLite from using the feed index
+            feed_column = "feed_url" if len(self.feed_urls) == 1 else "+feed_url"
+            self.where = f"{feed_column} IN ({', '.join('?' * len(self.feed_urls))})"
+            self.params = list(self.feed_urls)
+        if sentiment is not None:
+            self.where += " AND sentiment_label = ?"
+            self.params.append(sentiment)
+        self.filter_where, self.filter_params = self.where, list(self.params)
+        if collapse and self.where == "1":
+            self.where = "cluster_head"
+        elif collapse:
+            # Story heads are the newest entries of their clusters; any other entry shows only if
+            # none newer of its cluster is in the view. Unqualified columns in the subquery refer
+            # to that newer entry.
+            self.where = (f"{self.where} AND (cluster_head OR NOT EXISTS (SELECT 1 FROM entries AS newer "
+                          f"WHERE newer.cluster_id = entries.cluster_id "
+                          f"AND (newer.published_ts, newer.id) > (entries.published_ts, entries.id) "
+                          f"AND {self.where}))")
+            self.params = self.params * 2
+
+        with store.lock:
+            if sort_key == "feed":
+                counts = store.conn.execute(
+                    f"SELECT feed_url, COUNT(*) FROM entries WHERE {self.where} GROUP BY feed_url", self.params
+                ).fetchall()
+            else:
+                self.count = store.conn.execute(
+                    f"SELECT COUNT(*) FROM entries WHERE {self.where}", self.params
+                ).fetchone()[0]
+        if sort_key == "feed":
+            # (feed URL, entries in the view, entries of the feeds before it)
+            counts.sort(key=lambda item: (store.feed_title(item[0]).casefold(), item[0]), reverse=descending)
+            self.segments, self.count = [], 0
+            for feed_url, count in counts:
+                self.segments.append((feed_url, count, self.count))
+                self.count += count
+        else:
+            self.segments = None
+
+    def __len__(self):
+        return self.count
+
+    def _page(self, number):
+        """Return one page of entries, reading it from the database if it is not cached."""
+        if number in self.pages:
+            self.pages.move_to_end(number)
+            return self.pages[number]
+
+        with self.store.lock:
+            if self.segments is None:
+                rows = self.store.conn.execute(
+                    f"SELECT {ENTRY_COLUMNS} FROM entries WHERE {self.where} "
+                    f"ORDER BY {self.order} LIMIT ? OFFSET ?",
+                    self.params + [self.page_size, number * self.page_size],
+                ).fetchall()
+            else:
+                rows = self._segment_rows(number * self.page_size)
+        page = [self.store._entry_from_row(row) for row in rows]
+        if self.collapse:
+            self._count_duplicates(page)
+
+        self.pages[number] = page
+        if len(self.pages) > self.max_pages:
+            self.pages.popitem(last=False)
+        return page
+
+    def _segment_rows(self, offset):
+        """Return a page of rows from offset on, read feed by feed; the caller holds the lock."""
+        rows = []
+        for feed_url, count, start in self.segments:
+            if start + count <= offset:
+                continue
+            rows += self.store.conn.execute(
+                f"SELECT {ENTRY_COLUMNS} FROM entries WHERE {self.where} AND feed_url = ? "
+                f"ORDER BY {self.order} LIMIT ? OFFSET ?",
+                self.params + [feed_url, self.page_size - len(rows), max(0, offset - start)],
+            ).fetchall()
+            if len(rows) >= self.page_size:
+                break
+        return rows
+
+    def _count_duplicates(self, page):
+        """Set ``duplicates`` on the entries of a collapsed page whose clusters have more entries in the view."""
+        clusters = {entry['cluster_id'] for entry in page if 'cluster_id' in entry}
+        if not clusters:
+            return
+        with self.store.lock:
+            sizes = dict(self.store.conn.execute(
+                f"SELECT cluster_id, COUNT(*) FROM entries WHERE {self.filter_where} "
+                f"AND cluster_id IN ({', '.join('?' * len(clusters))}) GROUP BY cluster_id",
+                self.filter_params + list(clusters),
+            ).fetchall())
+        for entry in page:
+            if sizes.get(entry.get('cluster_id'), 1) > 1:
+                entry['duplicates'] = sizes[entry['cluster_id']] - 1
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += self.count
+        if not 0 <= index < self.count:
+            raise IndexError("entry index out of range")
+        page = self._page(index // self.page_size)
+        offset = index % self.page_size
+        if offset >= len(page):
+            # Entries were pruned since the view was created
+            raise IndexError("entry index out of range")
+        return page[offset]
+
+    def head(self, count):
+        """Return up to the first count entries."""
+        return [self[index] for index in range(min(count, self.count))]
+
+    def index_of(self, entry_id):
+        """Return the position of an entry in this view, or None."""
+        for number, page in self.pages.items():
+            for offset, entry in enumerate(page):
+                if entry['id'] == entry_id:
+                    return number * self.page_size + offset
+
+        column = SORT_COLUMNS[self.sort_key]
+        with self.store.lock:
+            row = self.store.conn.execute(
+                f"SELECT {column}, feed_url FROM entries WHERE id = ? AND {self.where}", [entry_id] + self.params
+            ).fetchone()
+            if row is None:
+                return None
+            if self.segments is None:
+                before, params = self._before(column, row[0], entry_id)
+                return self.store.conn.execute(
+                    f"SELECT COUNT(*) FROM entries WHERE {self.where} AND {before}", self.params + params
+                ).fetchone()[0]
+
+            # Sorted by feed: the entries of the feeds before, then the newer ones of its own feed
+            start = next((start for feed_url, _, start in self.segments if feed_url == row[1]), None)
+            if start is None:
+                # Its feed had no entries in the view when the view was created
+                return None
+            return start + self.store.conn.execute(
+                f"SELECT COUNT(*) FROM entries WHERE {self.where} AND feed_url = ? AND ({column}, id) > (?, ?)",
+                self.params + [row[1], row[0], entry_id],
+            ).fetchone()[0]
+
+    def _before(self, column, value, entry_id):
+        """Return the condition and parameters selecting the entries ordered before a sort value and id.
+
+        NULLs sort first ascending and last descending, as in ORDER BY.
+        """
+        if value is None:
+            if self.descending:
+                return f"({column} IS NOT NULL OR id > ?)", [entry_id]
+            return f"({column} IS NULL AND id < ?)", [entry_id]
+        if self.descending:
+            return f"({column}, id) > (?, ?)", [value, entry_id]
+        return f"(({column}, id) < (?, ?) OR {column} IS NULL)", [value, entry_id]
+
+    def sorted(self, sort_key, descending):
+        """Return a view over the same entries in a different order."""
+        return EntryView(self.store, self.feed_urls, sort_key, descending, self.page_size, self.max_pages,
+                         self.sentiment, self.collapse)
+
+    def reload(self):
+        """Return a fresh view with the same entries and order, picking up new rows."""
+        return self.sorted(self.sort_key, self.descending)
+
+
+class SearchView:
+    """Ranked search results, shaped like an EntryView for the title list."""
+
+    # Python sort keys for the title list's columns
+    SORT_KEYS = {
+        "published": lambda entry: entry['published_ts'],
+        "title": lambda entry: entry.get('title', "").lower(),
+        "sentiment": lambda entry: entry.get('sentiment_score', float("-inf")),
+    }
+
+    def __init__(self, store, query, limit=500, sort_key=None, descending=False, sentiment=None, collapse=False):
+        self.store = store
+        self.query = query
+        self.limit = limit
+        self.sort_key = sort_key
+        self.descending = descending
+        self.sentiment = sentiment
+        self.collapse = collapse
+        self.entries = store.search(query, limit)
+        if sentiment is not None:
+            self.entries = [entry for entry in self.entries if entry.get('sentiment_label') == sentiment]
+        if collapse:
+            self.entries = self._collapsed(self.entries)
+        if sort_key == "feed":
+            self.entries.sort(key=lambda entry: (store.feed_title(entry['feed_url']).casefold(), entry['feed_url']),
+                              reverse=descending)
+        elif sort_key is not None:
+            self.entries.sort(key=self.SORT_KEYS[sort_key], reverse=descending)
+
+    @staticmethod
+    def _collapsed(entries):
+        """Keep the best-ranked result of each story cluster, counting the others as ``duplicates``."""
+        shown = {}
+        for entry in entries:
+            cluster_id = entry.get('cluster_id', entry['id'])
+            if cluster_id in shown:
+                shown[cluster_id]['duplicates'] = shown[cluster_id].get('duplicates', 0) + 1
+            else:
+                shown[cluster_id] = entry
+        return list(shown.values())
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __getitem__(self, index):
+        return self.entries[index]
+
+    def head(self, count):
+        """Return up to the first count results."""
+        return self.entries[:count]
+
+    def index_of(self, entry_id):
+        """Return the position of an entry in the results, or None."""
+        for index, entry in enumerate(self.entries):
+            if entry['id'] == entry_id:
+                return index
+        return None
+
+    def sorted(self, sort_key, descending):
+        """Return the same results in another order."""
+        return SearchView(self.store, self.query, self.limit, sort_key, descending, self.sentiment, self.collapse)
+
+    def reload(self):
+        """Run the search again, picking up newly stored entries."""
+        return self.sorted(self.sort_key, self.descending)
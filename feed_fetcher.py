@@ -0,0 +1,145 @@
+"""Concurrent background fetching of RSS feeds."""
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+import feedparser
+import requests
+from requests.adapters import HTTPAdapter
+
+from entry_store import compact_entry
+from metrics import DISABLED
+
+SKIP_HOURS_PATTERN = re.compile(rb"<skipHours>(.*?)</skipHours>", re.IGNORECASE | re.DOTALL)
+HOUR_PATTERN = re.compile(rb"<hour>\s*(\d+)\s*</hour>", re.IGNORECASE)
+
+
+def skip_hours(content):
+    """Return the RSS skipHours of a feed document; feedparser keeps only the last one."""
+    match = SKIP_HOURS_PATTERN.search(content)
+    return [int(hour) for hour in HOUR_PATTERN.findall(match.group(1))] if match else []
+
+
+class FeedFetcher:
+    """Fetch and parse feeds on a thread pool sharing one keep-alive connection pool."""
+
+    def __init__(self, max_workers=16, per_host_limit=4, timeout=15, cache=None, metrics=None):
+        self.timeout = timeout
+        self.cache = cache
+        self.metrics = metrics or DISABLED
+        self.per_host_limit = per_host_limit
+
+        # One session for every worker so connections to the same host are reused
+        self.session = requests.Session()
+        self.session.headers["User-Agent"] = "rss-reader (+https://github.com/dms-codes/rss-reader)"
+        adapter = HTTPAdapter(pool_connections=max_workers, pool_maxsize=max_workers)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="feed-fetch")
+        self._host_slots = {}
+        self._host_lock = threading.Lock()
+        self._in_flight = {}
+        self._in_flight_lock = threading.Lock()
+
+    def _host_slot(self, url):
+        """Return the semaphore limiting concurrent requests to the URL's host."""
+        host = urlsplit(url).netloc.lower()
+        with self._host_lock:
+            if host not in self._host_slots:
+                self._host_slots[host] = threading.BoundedSemaphore(self.per_host_limit)
+            return self._host_slots[host]
+
+    def fetch(self, url):
+        """Download and parse a single feed, blocking the calling thread."""
+        request_headers = self.cache.request_headers(url) if self.cache else {}
+        with self._host_slot(url):
+            started = time.perf_counter()
+            response = self.session.get(url, headers=request_headers, timeout=self.timeout)
+
+            # Unchanged since the last fetch: serve the cached result without re-parsing
+            if response.status_code == 304 and self.cache:
+                feed = self.cache.not_modified(url)
+                if feed is not None:
+                    elapsed = time.perf_counter() - started
+                    self.metrics.observe("fetch", elapsed)
+                    self.metrics.count_feed(url, fetches=1, not_modified=1, fetch_seconds=elapsed)
+                    return feed
+                response = self.session.get(url, timeout=self.timeout)
+            elapsed = time.perf_counter() - started
+        self.metrics.observe("fetch", elapsed)
+        self.metrics.count_feed(url, fetches=1, bytes=len(response.content), fetch_seconds=elapsed)
+        response.raise_for_status()
+
+        headers = {key.lower(): value for key, value in response.headers.items()}
+        headers.setdefault("content-location", response.url)
+        with self.metrics.time("parse"):
+            feed = feedparser.parse(response.content, response_headers=headers)
+            # Keep only the entry fields the reader uses, before the feed is cached or queued for ingest
+            feed["entries"] = [compact_entry(entry) for entry in feed.entries]
+        self.metrics.count_feed(url, entries=len(feed.entries))
+        feed["skip_hours"] = skip_hours(response.content)
+        if self.cache:
+            self.cache.store(url, feed, headers.get("etag"), headers.get("last-modified"))
+        return feed
+
+    def submit(self, url, callback):
+        """Fetch a feed in the background and call callback(url, feed, error) when done.
+
+        The callback runs on a worker thread; GUI callers must marshal it back
+        to the main thread themselves (e.g. with wx.CallAfter).
+
+        A URL that is already being fetched is not requested again; the
+        callback is called with the result of the fetch in flight.
+        """
+        with self._in_flight_lock:
+            future = self._in_flight.get(url)
+            started = future is None
+            if started:
+                future = self._in_flight[url] = self.executor.submit(self.fetch, url)
+        if started:
+            # Outside the lock: a fetch that already finished runs the callback right here
+            future.add_done_callback(lambda future: self._finished(url, future))
+
+        def done(future):
+            error = future.exception()
+            callback(url, None if error else future.result(), error)
+
+        future.add_done_callback(done)
+        return future
+
+    def _finished(self, url, future):
+        """Forget a finished fetch so the next submit requests the feed again."""
+        with self._in_flight_lock:
+            if self._in_flight.get(url) is future:
+                del self._in_flight[url]
+        if not future.cancelled() and future.exception() is not None:
+            self.metrics.count_feed(url, errors=1)
+
+    def fetch_all(self, urls, callback, on_complete=None):
+        """Fetch every URL concurrently, reporting each feed as soon as it finishes."""
+        urls = list(dict.fromkeys(url for url in urls if url))
+        if not urls:
+            if on_complete:
+                on_complete()
+            return []
+
+        remaining = [len(urls)]
+        lock = threading.Lock()
+
+        def done(url, feed, error):
+            callback(url, feed, error)
+            with lock:
+                remaining[0] -= 1
+                finished = remaining[0] == 0
+            if finished and on_complete:
+                on_complete()
+
+        return [self.submit(url, done) for url in urls]
+
+    def shutdown(self):
+        """Stop accepting work and close pooled connections."""
+        self.executor.shutdown(wait=False, cancel_futures=True)
+        self.session.close()
@@ -0,0 +1,115 @@
+"""Subscription model that keeps the feed tree in step with the subscription store."""
+from subscriptions import group_by_category
+
+
+class FeedTree:
+    """Apply subscription changes to the store and to single nodes of a wx.TreeCtrl.
+
+    The tree is built once; after that every add, rename or removal touches
+    only the affected node, found through the URL and category indexes.
+    """
+
+    def __init__(self, tree, store):
+        self.tree = tree
+        self.store = store
+        self.feed_items = {}
+        self.category_items = {}
+        self.titles = {}
+
+    def feeds(self):
+        """Return every subscription as (url, description, category)."""
+        return self.store.feeds()
+
+    def rebuild(self):
+        """Build the whole tree from the store."""
+        self.tree.Freeze()
+        try:
+            self.tree.DeleteAllItems()
+            self.feed_items.clear()
+            self.category_items.clear()
+            self.titles.clear()
+            root = self.tree.AddRoot("Feeds")
+
+            categories = group_by_category(self.store.feeds())
+            for category in self.store.categories():
+                self._append_category(category)
+                for url, description in categories.get(category, ()):
+                    self._append_feed(url, description, category)
+
+            self.tree.Expand(root)
+        finally:
+            self.tree.Thaw()
+
+    def _append_category(self, category):
+        item = self.tree.AppendItem(self.tree.GetRootItem(), category)
+        self.category_items[category] = item
+        return item
+
+    def _append_feed(self, url, description, category):
+        parent = self.category_items.get(category) or self._append_category(category)
+        item = self.tree.AppendItem(parent, description)
+        self.tree.SetItemData(item, url)
+        self.feed_items[url] = item
+        self.titles[url] = description
+        return item
+
+    def category_of(self, item):
+        """Return the category name of a category or feed item, or None for the root."""
+        if item == self.tree.GetRootItem():
+            return None
+        if self.tree.GetItemData(item):
+            item = self.tree.GetItemParent(item)
+        return self.tree.GetItemText(item)
+
+    def add_category(self, category):
+        """Add an empty category; returns False if it already exists."""
+        if not self.store.add_category(category):
+            return False
+        self._append_category(category)
+        return True
+
+    def rename_category(self, old_name, new_name):
+        """Rename a category; returns False if the new name is taken."""
+        if not self.store.rename_category(old_name, new_name):
+            return False
+        item = self.category_items.pop(old_name)
+        self.category_items[new_name] = item
+        self.tree.SetItemText(item, new_name)
+        return True
+
+    def remove_category(self, category):
+        """Remove a category and its feeds; returns the removed feed URLs."""
+        urls = self.store.remove_category(category)
+        for url in urls:
+            self.feed_items.pop(url, None)
+            self.titles.pop(url, None)
+        item = self.category_items.pop(category, None)
+        if item is not None:
+            self.tree.Delete(item)
+        return urls
+
+    def add_feed(self, url, description, category):
+        """Subscribe to a feed; returns its tree item, or None if it is already subscribed."""
+        if not self.store.add_feed(url, description, category):
+            return None
+        return self._append_feed(url, description, category)
+
+    def update_feed(self, old_url, url, description):
+        """Change a feed's URL and description; returns False if the new URL is already subscribed."""
+        if not self.store.update_feed(old_url, url, description):
+            return False
+        item = self.feed_items.pop(old_url)
+        self.titles.pop(old_url, None)
+        self.feed_items[url] = item
+        self.titles[url] = description
+        self.tree.SetItemText(item, description)
+        self.tree.SetItemData(item, url)
+        return True
+
+    def remove_feed(self, url):
+        """Unsubscribe from a feed."""
+        self.store.remove_feed(url)
+        self.titles.pop(url, None)
+        item = self.feed_items.pop(url, None)
+        if item is not None:
+            self.tree.Delete(item)
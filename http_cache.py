@@ -0,0 +1,101 @@
+"""Persistent conditional GET cache (ETag / Last-Modified) for parsed feeds."""
+import hashlib
+import os
+import pickle
+import tempfile
+import threading
+
+
+class FeedCache:
+    """On-disk cache of HTTP validators and the last parsed result of each feed URL."""
+
+    def __init__(self, directory=os.path.join("cache", "feeds")):
+        self.directory = directory
+        os.makedirs(self.directory, exist_ok=True)
+        self._records = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _path(self, url):
+        """Return the cache file for a URL."""
+        digest = hashlib.sha1(url.encode("utf-8")).hexdigest()
+        return os.path.join(self.directory, f"{digest}.pickle")
+
+    def _load(self, url):
+        """Return the cached record for a URL, reading it from disk on first use."""
+        with self._lock:
+            if url in self._records:
+                return self._records[url]
+
+        record = None
+        try:
+            with open(self._path(url), "rb") as f:
+                record = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError):
+            pass
+
+        with self._lock:
+            self._records.setdefault(url, record)
+            return self._records[url]
+
+    def validators(self, url):
+        """Return the (etag, modified) pair last seen for a URL."""
+        record = self._load(url)
+        if not record:
+            return None, None
+        return record["etag"], record["modified"]
+
+    def request_headers(self, url):
+        """Return the conditional request headers to send for a URL."""
+        etag, modified = self.validators(url)
+        headers = {}
+        if etag:
+            headers["If-None-Match"] = etag
+        if modified:
+            headers["If-Modified-Since"] = modified
+        return headers
+
+    def get(self, url):
+        """Return the cached parsed feed for a URL, or None."""
+        record = self._load(url)
+        return record["feed"] if record else None
+
+    def not_modified(self, url):
+        """Serve a 304 Not Modified response from the cache."""
+        feed = self.get(url)
+        if feed is not None:
+            with self._lock:
+                self.hits += 1
+        return feed
+
+    def store(self, url, feed, etag=None, modified=None):
+        """Remember a freshly parsed feed and its validators."""
+        # Exceptions raised while parsing are not always picklable
+        feed.pop("bozo_exception", None)
+        record = {"etag": etag, "modified": modified, "feed": feed}
+
+        with self._lock:
+            self.misses += 1
+            self._records[url] = record
+
+        # Write atomically so a crash never leaves a truncated cache file; each
+        # write gets its own temp file, as the same feed may be stored twice at once
+        path = self._path(url)
+        fd, temp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump(record, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temp_path, path)
+        except (OSError, pickle.PicklingError, TypeError, AttributeError) as e:
+            # The fetch itself succeeded; the feed stays cached in memory
+            print(f"Writing the feed cache failed for {url}: {e}")
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+
+    def stats(self):
+        """Return the hit and miss counters."""
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses}
@@ -0,0 +1,180 @@
+"""Bounded on-disk cache of entry thumbnails, downscaled to display size."""
+import hashlib
+import io
+import os
+import pathlib
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+# Largest thumbnail shown in the content panel, in pixels
+DISPLAY_SIZE = (600, 400)
+
+# Images larger than this are not downloaded
+MAX_DOWNLOAD_BYTES = 10 * 1024 * 1024
+
+
+def downscale(data, size=DISPLAY_SIZE):
+    """Return (bytes, extension) of an image shrunk to fit size.
+
+    Without Pillow the image is kept as downloaded.
+    """
+    try:
+        from PIL import Image
+    except ImportError:
+        return data, "img"
+
+    with Image.open(io.BytesIO(data)) as image:
+        image.thumbnail(size)
+        output = io.BytesIO()
+        if image.mode in ("RGBA", "LA", "P"):
+            image.save(output, "PNG", optimize=True)
+            return output.getvalue(), "png"
+        image.convert("RGB").save(output, "JPEG", quality=85, optimize=True)
+        return output.getvalue(), "jpg"
+
+
+class ImageCache:
+    """Thumbnails stored under ``directory``, evicting the least recently used beyond max_bytes.
+
+    Images are downloaded on a small background pool with ``prefetch``;
+    ``local_path`` only ever looks at disk, so it is safe on the GUI thread.
+    """
+
+    def __init__(self, directory=os.path.join("cache", "images"), max_bytes=200 * 1024 * 1024,
+                 max_workers=4, timeout=15):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.timeout = timeout
+        os.makedirs(self.directory, exist_ok=True)
+
+        self.session = requests.Session()
+        self.session.headers["User-Agent"] = "rss-reader (+https://github.com/dms-codes/rss-reader)"
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="image-fetch")
+        self.lock = threading.Lock()
+        self.in_flight = set()
+
+        # file name -> size, least recently used first; recency survives restarts as mtime
+        self.files = OrderedDict()
+        self.total_bytes = 0
+        entries = []
+        for entry in os.scandir(self.directory):
+            if entry.is_file() and not entry.name.endswith(".tmp"):
+                stat = entry.stat()
+                entries.append((stat.st_mtime, entry.name, stat.st_size))
+        for _, name, size in sorted(entries):
+            self.files[name] = size
+            self.total_bytes += size
+        self.by_key = {name.split(".")[0]: name for name in self.files}
+        self._evict()
+
+    @staticmethod
+    def key(url):
+        return hashlib.sha1(url.encode("utf-8")).hexdigest()
+
+    def local_path(self, url, touch=True):
+        """Return the cached file of an image URL, or None.
+
+        With touch the image is marked recently used, also on disk.
+        """
+        if not url:
+            return None
+        with self.lock:
+            name = self.by_key.get(self.key(url))
+            if name is None:
+                return None
+            if touch:
+                self.files.move_to_end(name)
+        path = os.path.join(self.directory, name)
+        if touch:
+            try:
+                os.utime(path)
+            except OSError:
+                return None
+        return path
+
+    def local_url(self, url):
+        """Return a file:// URL for a cached image, or None."""
+        path = self.local_path(url)
+        return pathlib.Path(path).resolve().as_uri() if path else None
+
+    def base_url(self):
+        """Return the file:// URL of the cache directory, for pages that show cached images."""
+        return pathlib.Path(self.directory).resolve().as_uri() + "/"
+
+    def fetch(self, url):
+        """Download, downscale and store one image, returning its local path."""
+        path = self.local_path(url)
+        if path:
+            return path
+
+        with self.session.get(url, timeout=self.timeout, stream=True) as response:
+            response.raise_for_status()
+            data = response.raw.read(MAX_DOWNLOAD_BYTES + 1, decode_content=True)
+        if len(data) > MAX_DOWNLOAD_BYTES:
+            raise ValueError(f"image larger than {MAX_DOWNLOAD_BYTES} bytes: {url}")
+        data, extension = downscale(data)
+
+        # Write atomically so a crash never leaves a truncated image
+        key = self.key(url)
+        name = f"{key}.{extension}"
+        path = os.path.join(self.directory, name)
+        temp_path = f"{path}.tmp"
+        with open(temp_path, "wb") as f:
+            f.write(data)
+        os.replace(temp_path, path)
+
+        with self.lock:
+            self.total_bytes += len(data) - self.files.pop(name, 0)
+            self.files[name] = len(data)
+            self.by_key[key] = name
+        self._evict()
+        return path
+
+    def _evict(self):
+        """Delete the least recently used images until the cache fits max_bytes (keeping the newest)."""
+        evicted = []
+        with self.lock:
+            while self.total_bytes > self.max_bytes and len(self.files) > 1:
+                name, size = self.files.popitem(last=False)
+                self.by_key.pop(name.split(".")[0], None)
+                self.total_bytes -= size
+                evicted.append(name)
+        for name in evicted:
+            try:
+                os.remove(os.path.join(self.directory, name))
+            except OSError:
+                pass
+
+    def prefetch(self, urls, callback=None):
+        """Fetch images in the background; callback(url) runs on a worker thread after each download."""
+        for url in dict.fromkeys(url for url in urls if url):
+            with self.lock:
+                if url in self.in_flight or self.key(url) in self.by_key:
+                    continue
+                self.in_flight.add(url)
+            self.executor.submit(self._prefetch, url, callback)
+
+    def _prefetch(self, url, callback):
+        try:
+            self.fetch(url)
+        except Exception as e:
+            print(f"Thumbnail download failed for {url}: {e}")
+            return
+        finally:
+            with self.lock:
+                self.in_flight.discard(url)
+        if callback:
+            callback(url)
+
+    def stats(self):
+        """Return the number of cached images and their total size in bytes."""
+        with self.lock:
+            return {"images": len(self.files), "bytes": self.total_bytes}
+
+    def shutdown(self):
+        """Stop downloading."""
+        self.executor.shutdown(wait=False, cancel_futures=True)
+        self.session.close()
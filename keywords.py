@@ -0,0 +1,98 @@
+"""Keyword extraction ranked by TF-IDF against the locally stored corpus."""
+import math
+import re
+import threading
+from collections import Counter
+
+TOKEN_PATTERN = re.compile(r"[^\W_]+")
+TAG_PATTERN = re.compile(r"<[^>]+>")
+
+
+def build_stop_words():
+    """Return the English, Norwegian and Indonesian (Sastrawi) stopwords as one frozen set."""
+    # Imported here so NLTK and Sastrawi load on first use, not at startup
+    from nltk.corpus import stopwords
+    from Sastrawi.StopWordRemover.StopWordRemoverFactory import StopWordRemoverFactory
+
+    stop_words = set(stopwords.words('english'))
+    stop_words.update(stopwords.words('norwegian'))
+    stop_words.update(StopWordRemoverFactory().get_stop_words())
+    return frozenset(stop_words)
+
+
+def entry_text(entry):
+    """Return the title and plain-text summary of an entry as one text for analysis.
+
+    Uses the text normalized at ingest when there is one, so the markup is not scanned again.
+    """
+    text = entry.get('body_text')
+    if text is None:
+        text = TAG_PATTERN.sub(" ", entry.get('summary') or "")
+    return f"{entry.get('title') or ''} {text}"
+
+
+class KeywordExtractor:
+    """Rank the terms of a text by TF-IDF against a corpus of previously seen documents."""
+
+    def __init__(self, stop_words=None):
+        self._stop_words = None if stop_words is None else frozenset(stop_words)
+        self.document_frequency = Counter()
+        self.document_count = 0
+        self.lock = threading.Lock()
+
+    @property
+    def stop_words(self):
+        """The frozen stopword index, built once on first use."""
+        if self._stop_words is None:
+            with self.lock:
+                if self._stop_words is None:
+                    self._stop_words = build_stop_words()
+        return self._stop_words
+
+    def tokenize(self, text):
+        """Split text into lowercase alphanumeric terms that are not stopwords."""
+        stop_words = self.stop_words
+        return [word for word in TOKEN_PATTERN.findall(text.lower()) if word not in stop_words]
+
+    def add_documents(self, texts):
+        """Add documents to the corpus statistics used for the IDF weights."""
+        frequency = Counter()
+        count = 0
+        for text in texts:
+            frequency.update(set(self.tokenize(text)))
+            count += 1
+        with self.lock:
+            self.document_frequency.update(frequency)
+            self.document_count += count
+
+    def fit(self, texts):
+        """Replace the corpus statistics with those of the given documents."""
+        with self.lock:
+            self.document_frequency = Counter()
+            self.document_count = 0
+        self.add_documents(texts)
+
+    def extract_batch(self, texts, top_n=3):
+        """Return the top_n keywords of each text, ranked by TF-IDF."""
+        with self.lock:
+            document_frequency = self.document_frequency
+            document_count = self.document_count
+
+        idf_cache = {}
+        results = []
+        for text in texts:
+            scores = []
+            for term, count in Counter(self.tokenize(text)).items():
+                idf = idf_cache.get(term)
+                if idf is None:
+                    # Smoothed IDF, so unseen terms still get a finite weight
+                    idf = math.log((1 + document_count) / (1 + document_frequency.get(term, 0))) + 1
+                    idf_cache[term] = idf
+                scores.append((count * idf, term))
+            scores.sort(key=lambda score: (-score[0], score[1]))
+            results.append([term for _, term in scores[:top_n]])
+        return results
+
+    def extract(self, text, top_n=3):
+        """Return the top_n keywords of a single text."""
+        return self.extract_batch([text], top_n)[0]
@@ -0,0 +1,166 @@
+"""Low-overhead instrumentation: a duration histogram per processing stage and counters per feed.
+
+Stages are timed with ``with metrics.time("parse"):``. A disabled Metrics
+hands out one shared no-op context manager, so instrumented code costs a
+method call when instrumentation is turned off.
+"""
+import bisect
+import json
+import threading
+import time
+from contextlib import nullcontext
+
+# Histogram bucket upper bounds in seconds
+BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# Per-feed counters, in display order
+FEED_COUNTERS = ("fetches", "not_modified", "errors", "entries", "bytes", "fetch_seconds")
+
+_DISABLED_TIMER = nullcontext()
+
+
+class Histogram:
+    """Count of durations per bucket, plus their total and maximum."""
+
+    def __init__(self):
+        self.buckets = [0] * (len(BUCKETS) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds):
+        self.buckets[bisect.bisect_left(BUCKETS, seconds)] += 1
+        self.count += 1
+        self.sum += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def quantile(self, q):
+        """Estimate a quantile as the upper bound of the bucket containing it, or None when empty."""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(BUCKETS, self.buckets):
+            seen += count
+            if seen >= rank:
+                return min(bound, self.max)
+        return self.max
+
+    def as_dict(self):
+        return {
+            "count": self.count,
+            "sum": self.sum,
+            "max": self.max,
+            "mean": self.sum / self.count if self.count else None,
+            "p50": self.quantile(0.5),
+            "p95": self.quantile(0.95),
+            "buckets": dict(zip([*map(str, BUCKETS), "+Inf"], self.buckets)),
+        }
+
+
+class _Timer:
+    """Context manager adding the time spent in its block to a stage."""
+
+    __slots__ = ("metrics", "stage", "started")
+
+    def __init__(self, metrics, stage):
+        self.metrics = metrics
+        self.stage = stage
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.metrics.observe(self.stage, time.perf_counter() - self.started)
+
+
+class Metrics:
+    """Thread-safe registry of stage histograms and per-feed counters."""
+
+    def __init__(self, enabled=True):
+        self.enabled = enabled
+        self.lock = threading.Lock()
+        self.stages = {}
+        self.feeds = {}
+        self.started = time.time()
+
+    def time(self, stage):
+        """Return a context manager that times its block as one observation of stage."""
+        if not self.enabled:
+            return _DISABLED_TIMER
+        return _Timer(self, stage)
+
+    def observe(self, stage, seconds):
+        """Record one duration of a stage."""
+        if not self.enabled:
+            return
+        with self.lock:
+            histogram = self.stages.get(stage)
+            if histogram is None:
+                histogram = self.stages[stage] = Histogram()
+            histogram.observe(seconds)
+
+    def count_feed(self, url, **increments):
+        """Add to a feed's counters, e.g. ``count_feed(url, fetches=1, bytes=1234)``."""
+        if not self.enabled:
+            return
+        with self.lock:
+            counters = self.feeds.get(url)
+            if counters is None:
+                counters = self.feeds[url] = dict.fromkeys(FEED_COUNTERS, 0)
+            for name, value in increments.items():
+                counters[name] += value
+
+    def reset(self):
+        """Forget every observation."""
+        with self.lock:
+            self.stages.clear()
+            self.feeds.clear()
+            self.started = time.time()
+
+    def snapshot(self):
+        """Return the current stage statistics and feed counters as plain data."""
+        with self.lock:
+            return {
+                "since": self.started,
+                "stages": {stage: histogram.as_dict() for stage, histogram in sorted(self.stages.items())},
+                "feeds": {url: dict(counters) for url, counters in self.feeds.items()},
+            }
+
+    def to_json(self):
+        """Return a snapshot as a JSON document."""
+        return json.dumps(self.snapshot(), indent=2)
+
+    def to_prometheus(self):
+        """Return a snapshot in the Prometheus text exposition format."""
+        snapshot = self.snapshot()
+        lines = [
+            "# HELP rss_reader_stage_seconds Time spent in each processing stage.",
+            "# TYPE rss_reader_stage_seconds histogram",
+        ]
+        for stage, stats in snapshot["stages"].items():
+            label = f'stage="{_escape(stage)}"'
+            cumulative = 0
+            for bound, count in stats["buckets"].items():
+                cumulative += count
+                lines.append(f'rss_reader_stage_seconds_bucket{{{label},le="{bound}"}} {cumulative}')
+            lines.append(f"rss_reader_stage_seconds_sum{{{label}}} {stats['sum']}")
+            lines.append(f"rss_reader_stage_seconds_count{{{label}}} {stats['count']}")
+
+        for name in FEED_COUNTERS:
+            metric = f"rss_reader_feed_{name}_total"
+            lines.append(f"# TYPE {metric} counter")
+            for url, counters in snapshot["feeds"].items():
+                lines.append(f'{metric}{{feed="{_escape(url)}"}} {counters[name]}')
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value):
+    """Escape a Prometheus label value."""
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+# Shared disabled registry for components created without one
+DISABLED = Metrics(enabled=False)
@@ -0,0 +1,232 @@
+"""Headless batch mode: fetch, analyze and export every feed without the GUI.
+
+Example::
+
+    python pipeline.py --output entries.jsonl
+    python pipeline.py --feeds feed_urls.txt --output entries.jsonl
+    python pipeline.py --format parquet --output entries.parquet
+"""
+import argparse
+import json
+import os
+import queue
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import analysis
+from content import normalize
+from entry_store import entry_timestamp
+from feed_fetcher import FeedFetcher
+from http_cache import FeedCache
+from keywords import KeywordExtractor, entry_text
+from metrics import Metrics
+from sentiment import MODELS, SentimentAnalyzer
+from settings import load_settings
+from subscriptions import SubscriptionStore, legacy_subscription, read_feed_urls
+
+# Keyword extractor and sentiment analyzer of each worker process, created once by init_worker
+extractor = None
+sentiment = None
+
+
+def entry_record(entry, url, description, category):
+    """Flatten a parsed feed entry into an exportable record."""
+    summary, text = normalize(entry.get('summary', ""))
+    return {
+        "feed_url": url,
+        "feed_title": description,
+        "category": category,
+        "id": entry.get('id') or entry.get('link'),
+        "title": entry.get('title', ""),
+        "link": entry.get('link', ""),
+        "published": entry.get('published') or entry.get('updated'),
+        "published_ts": entry_timestamp(entry),
+        "thumbnail": analysis.get_thumbnail(entry),
+        "summary": summary,
+        "text": text,
+    }
+
+
+def load_feeds(path):
+    """Return (url, description, category) of every feed in a subscription database or feed_urls.txt file."""
+    if path.endswith(".txt"):
+        return [feed for feed in map(legacy_subscription, read_feed_urls(path)) if feed[0]]
+    store = SubscriptionStore(path)
+    try:
+        return store.feeds()
+    finally:
+        store.close()
+
+
+def init_worker(sentiment_model="textblob"):
+    """Build the stopword index and sentiment model once per worker process."""
+    global extractor, sentiment
+    extractor = KeywordExtractor()
+    extractor.stop_words
+    # Already inside a worker process, so the analyzer scores in-process
+    sentiment = SentimentAnalyzer(sentiment_model, processes=0)
+
+
+def analyze_batch(records):
+    """Add keywords and sentiment to the records of one feed (runs in a worker process)."""
+    texts = [entry_text(record) for record in records]
+
+    # IDF weights come from the feed itself, the corpus each worker can see
+    extractor.fit(texts)
+    for record, keywords in zip(records, extractor.extract_batch(texts)):
+        record["keywords"] = keywords
+
+    try:
+        scores = sentiment.score_batch([record["text"] or record["title"] for record in records])
+    except Exception as e:
+        scores = [(None, f"Error analyzing sentiment: {e}")] * len(records)
+    for record, (score, label) in zip(records, scores):
+        record["sentiment_score"], record["sentiment"] = score, label
+    return records
+
+
+class JsonLinesWriter:
+    """Write records as one JSON object per line."""
+
+    def __init__(self, path):
+        self.file = sys.stdout if path == "-" else open(path, 'w', encoding='utf-8')
+
+    def write(self, records):
+        for record in records:
+            self.file.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self.file.flush()
+
+    def close(self):
+        if self.file is not sys.stdout:
+            self.file.close()
+
+
+class ParquetWriter:
+    """Write records to a Parquet file, one row group per batch."""
+
+    def __init__(self, path):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise SystemExit("Parquet output requires pyarrow: pip install pyarrow")
+
+        self.pa = pa
+        self.schema = pa.schema([
+            ("feed_url", pa.string()),
+            ("feed_title", pa.string()),
+            ("category", pa.string()),
+            ("id", pa.string()),
+            ("title", pa.string()),
+            ("link", pa.string()),
+            ("published", pa.string()),
+            ("published_ts", pa.float64()),
+            ("thumbnail", pa.string()),
+            ("summary", pa.string()),
+            ("text", pa.string()),
+            ("keywords", pa.list_(pa.string())),
+            ("sentiment_score", pa.float64()),
+            ("sentiment", pa.string()),
+        ])
+        self.writer = pq.ParquetWriter(path, self.schema)
+
+    def write(self, records):
+        if records:
+            self.writer.write_table(self.pa.Table.from_pylist(records, schema=self.schema))
+
+    def close(self):
+        self.writer.close()
+
+
+def run(feeds, writer, workers=None, analyze=True, cache=None, metrics=None, sentiment_model="textblob"):
+    """Fetch every feed concurrently, analyze each one in a process pool and stream it to writer.
+
+    Fetch and parse timings go to metrics, if given. sentiment_model names a model in sentiment.MODELS.
+    Returns (feed count, failed feed count, entry count).
+    """
+    feed_info = {url: (description, category) for url, description, category in feeds}
+    results = queue.Queue()
+    fetcher = FeedFetcher(cache=cache, metrics=metrics)
+    fetcher.fetch_all(feed_info, lambda url, feed, error: results.put((url, feed, error)))
+
+    pool = None
+    if analyze:
+        pool = ProcessPoolExecutor(max_workers=workers or os.cpu_count(), initializer=init_worker,
+                                   initargs=(sentiment_model,))
+    pending = []
+    failed = entries = 0
+    try:
+        # Hand each feed to the pool as soon as its fetch finishes
+        for _ in range(len(feed_info)):
+            url, feed, error = results.get()
+            if error is not None:
+                failed += 1
+                print(f"Error fetching {url}: {error}", file=sys.stderr)
+                continue
+
+            records = [entry_record(entry, url, *feed_info[url]) for entry in feed.entries]
+            entries += len(records)
+            if pool is None:
+                writer.write(records)
+            elif records:
+                pending.append(pool.submit(analyze_batch, records))
+
+            # Write finished batches without waiting for the rest
+            for future in [future for future in pending if future.done()]:
+                pending.remove(future)
+                writer.write(future.result())
+
+        for future in pending:
+            writer.write(future.result())
+    finally:
+        fetcher.shutdown()
+        if pool is not None:
+            pool.shutdown()
+
+    return len(feed_info), failed, entries
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Fetch, analyze and export all feeds without the GUI")
+    parser.add_argument("--feeds", help="subscription database, or a pipe-delimited .txt feed list "
+                                        "(default: the reader's subscriptions)")
+    parser.add_argument("--output", default="-", help="output file, '-' for stdout (default)")
+    parser.add_argument("--format", choices=["jsonl", "parquet"], default="jsonl", help="output format")
+    parser.add_argument("--workers", type=int, default=None, help="analysis processes (default: CPU count)")
+    parser.add_argument("--no-analysis", action="store_true", help="skip keyword and sentiment analysis")
+    parser.add_argument("--sentiment-model", choices=sorted(MODELS), default=None,
+                        help="sentiment model (default: sentiment_model in settings.json)")
+    parser.add_argument("--no-cache", action="store_true", help="always download feeds in full")
+    parser.add_argument("--metrics", help="write fetch and parse metrics to this file "
+                                          "(Prometheus text for .prom, JSON otherwise)")
+    args = parser.parse_args(argv)
+
+    if args.format == "parquet" and args.output == "-":
+        parser.error("Parquet output needs a file name (--output)")
+
+    settings = load_settings()
+    metrics = Metrics() if args.metrics else None
+    writer = ParquetWriter(args.output) if args.format == "parquet" else JsonLinesWriter(args.output)
+    start = time.perf_counter()
+    try:
+        feed_count, failed, entries = run(
+            load_feeds(args.feeds or settings["subscriptions"]), writer,
+            workers=args.workers, analyze=not args.no_analysis,
+            cache=None if args.no_cache else FeedCache(), metrics=metrics,
+            sentiment_model=args.sentiment_model or settings["sentiment_model"],
+        )
+    finally:
+        writer.close()
+
+    elapsed = time.perf_counter() - start
+    print(f"{entries} entries from {feed_count - failed}/{feed_count} feeds in {elapsed:.1f}s "
+          f"({entries / elapsed if elapsed else 0:.1f} entries/s)", file=sys.stderr)
+
+    if metrics is not None:
+        with open(args.metrics, 'w', encoding='utf-8') as f:
+            f.write(metrics.to_prometheus() if args.metrics.endswith(".prom") else metrics.to_json())
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,785 @@
+"""Main window of the RSS Reader; started by main.py."""
+import time
+import wx
+import wx.dataview
+import wx.html2
+import os
+import threading
+from feed_fetcher import FeedFetcher
+from http_cache import FeedCache
+from image_cache import ImageCache
+import analysis
+from diagnostics import DiagnosticsFrame
+from entry_store import EntryStore, EntryView, SearchView
+from feed_tree import FeedTree
+from keywords import KeywordExtractor, entry_text
+from metrics import Metrics
+from translation import GoogleBackend, TranslationService
+from render_cache import ArticleRenderer, LatencyRecorder, RenderCache
+from river import RiverView
+from scheduler import RefreshScheduler
+from sentiment import LABELS, SentimentAnalyzer
+from settings import load_settings
+from subscriptions import SubscriptionStore
+from title_list import TitleListCtrl
+
+# Number of titles whose translations are prefetched when a feed is shown
+PREFETCH_TITLES = 50
+
+# Number of entries above and below the selection that are pre-rendered
+PRERENDER_NEIGHBORS = 3
+
+# How often the refresh scheduler is asked for feeds that are due
+SCHEDULER_TICK_MS = 15000
+
+
+class RSSReaderFrame(wx.Frame):
+    """Main application frame for the RSS Reader."""
+
+    def __init__(self, parent, title, settings=None, startup_started=None):
+        super().__init__(parent, title=title, size=(800, 600))
+
+        # Set program icon
+        self.set_program_icon("rss_icon.png")
+
+        # Load settings and the subscriptions (imported from feed_urls.txt on first run)
+        self.settings = settings if settings is not None else load_settings()
+        self.subscriptions = SubscriptionStore(self.settings["subscriptions"])
+
+        # Stage timings and per-feed counters, shown in the diagnostics window
+        self.metrics = Metrics(enabled=self.settings["metrics_enabled"])
+        self.diagnostics = None
+
+        # Local entry store, pruned according to the retention policy
+        self.entry_store = EntryStore(
+            self.settings["database"],
+            retention_days=self.settings["retention_days"],
+            max_entries_per_feed=self.settings["max_entries_per_feed"],
+            feed_title=lambda url: self.feed_titles.get(url, url),
+        )
+        self.entry_store.prune()
+
+        # Keyword extractor; stopwords and corpus statistics are loaded by warm_up
+        self.keyword_extractor = KeywordExtractor()
+
+        # Cached translation service for titles and summaries
+        self.translator = TranslationService(
+            GoogleBackend(),
+            target=self.settings["translation_target"],
+            cache_path=os.path.join("cache", "translations.db"),
+        )
+
+        # Background fetch engine
+        self.feed_cache = FeedCache()
+        self.fetcher = FeedFetcher(cache=self.feed_cache, metrics=self.metrics)
+
+        # Sentiment of every stored entry, scored in batches at ingest
+        self.sentiment = SentimentAnalyzer(self.settings["sentiment_model"],
+                                           processes=self.settings["sentiment_processes"])
+        self.sentiment_filter = None
+        self.collapse_duplicates = self.settings["collapse_duplicates"]
+
+        # Downscaled thumbnails, downloaded when entries are stored
+        self.image_cache = ImageCache(max_bytes=self.settings["image_cache_mb"] * 1024 * 1024)
+        self.displayed_entry_id = None
+
+        # Rendered article pages and selection-to-paint latency
+        self.article_renderer = ArticleRenderer(
+            self.settings, self.entry_store, self.translator, self.keyword_extractor, self.metrics,
+            self.image_cache, self.sentiment,
+        )
+        self.render_cache = RenderCache(self.article_renderer.render)
+        self.selection_latency = LatencyRecorder()
+        self.selection_started = None
+        self.current_feed_urls = set()
+        self.refresh_started = None
+        self.refresh_done = 0
+        self.refresh_total = 0
+
+        # Per-feed refresh times, learned from each feed's posting rate
+        self.scheduler = RefreshScheduler()
+        for url, _, _ in self.subscriptions.feeds():
+            self.scheduler.add(url)
+
+        # Initialize UI
+        self.setup_ui()
+
+        # Populate the feed URL tree with categories; later changes update single nodes
+        self.feed_tree = FeedTree(self.feed_url_tree, self.subscriptions)
+        self.feed_tree.rebuild()
+        self.feed_titles = self.feed_tree.titles
+
+        # Background refreshing, paced per feed by the scheduler
+        self.refresh_timer = wx.Timer(self)
+        self.Bind(wx.EVT_TIMER, self.on_scheduler_tick, self.refresh_timer)
+        if self.settings["auto_refresh"]:
+            self.refresh_timer.Start(SCHEDULER_TICK_MS)
+
+        # Bind right-click context menu
+        self.feed_url_tree.Bind(wx.EVT_TREE_ITEM_RIGHT_CLICK, self.on_tree_right_click)
+        self.Bind(wx.EVT_CLOSE, self.on_close)
+
+        # Finalize window setup
+        self.Maximize(True)
+        self.Centre()
+        self.Show()
+
+        # Load the NLP libraries once the window is on screen
+        if self.settings["analysis_enabled"]:
+            threading.Thread(target=self.warm_up, daemon=True).start()
+
+        # Find the duplicates among entries stored before duplicate detection
+        threading.Thread(target=self.cluster_backlog, daemon=True).start()
+
+        # Startup benchmark: report the time since startup_started (a perf_counter() value) and exit
+        self.startup_started = startup_started
+        if startup_started is not None:
+            wx.CallAfter(self.report_startup)
+
+    def set_program_icon(self, icon_path):
+        """Set the program icon."""
+        if os.path.exists(icon_path):
+            self.SetIcon(wx.Icon(icon_path, wx.BITMAP_TYPE_PNG))
+
+    def setup_ui(self):
+        """Set up the main UI with split panes."""
+        # Main splitters
+        self.splitter1 = wx.SplitterWindow(self)
+        self.splitter2 = wx.SplitterWindow(self.splitter1)
+
+        # Create panels
+        self.feed_url_panel = self.create_feed_url_panel(self.splitter1)
+        self.title_panel = self.create_title_panel(self.splitter2)
+        self.content_panel = self.create_content_panel(self.splitter2)
+
+        # Add Copy to Clipboard button
+        self.add_toolbar()
+        self.CreateStatusBar(2)
+        self.SetStatusWidths([-3, -1])
+
+        # Configure splitters
+        self.splitter2.SplitVertically(self.title_panel, self.content_panel, sashPosition=300)
+        self.splitter1.SplitVertically(self.feed_url_panel, self.splitter2, sashPosition=200)
+
+    def add_toolbar(self):
+        """Add a toolbar with 'Copy Screenshot to Clipboard', 'Refresh All' and 'Diagnostics' buttons."""
+        toolbar = self.CreateToolBar()
+        copy_btn = toolbar.AddTool(wx.ID_ANY, "Copy to Clipboard", wx.ArtProvider.GetBitmap(wx.ART_COPY, wx.ART_TOOLBAR))
+        refresh_btn = toolbar.AddTool(wx.ID_ANY, "Refresh All", wx.ArtProvider.GetBitmap(wx.ART_REDO, wx.ART_TOOLBAR),
+                                      shortHelp="Refresh all feeds")
+        diagnostics_btn = toolbar.AddTool(wx.ID_ANY, "Diagnostics",
+                                          wx.ArtProvider.GetBitmap(wx.ART_REPORT_VIEW, wx.ART_TOOLBAR),
+                                          shortHelp="Show stage timings and feed statistics")
+        toolbar.Realize()
+
+        # Bind the toolbar buttons
+        self.Bind(wx.EVT_TOOL, self.copy_content_panel_to_clipboard, copy_btn)
+        self.Bind(wx.EVT_TOOL, self.on_refresh_all, refresh_btn)
+        self.Bind(wx.EVT_TOOL, self.on_show_diagnostics, diagnostics_btn)
+
+    def on_show_diagnostics(self, event):
+        """Open the diagnostics window, or bring it to the front if it is already open."""
+        if not self.metrics.enabled:
+            wx.MessageBox("Instrumentation is turned off (\"metrics_enabled\" in settings.json).",
+                          "Diagnostics", wx.OK | wx.ICON_INFORMATION)
+            return
+        if self.diagnostics:
+            self.diagnostics.Raise()
+            return
+        self.diagnostics = DiagnosticsFrame(self, self.metrics, feed_title=lambda url: self.feed_titles.get(url, url))
+        self.diagnostics.Show()
+
+    def copy_content_panel_to_clipboard(self, event):
+        """Capture the content panel and copy it to the clipboard."""
+        # Get the size of the content panel
+        size = self.content_panel.GetSize()
+        bitmap = wx.Bitmap(size.width, size.height)
+
+        # Create a memory device context
+        memory_dc = wx.MemoryDC(bitmap)
+        memory_dc.Blit(0, 0, size.width, size.height, wx.ClientDC(self.content_panel), 0, 0)
+        memory_dc.SelectObject(wx.NullBitmap)
+
+        # Copy bitmap to clipboard
+        if wx.TheClipboard.Open():
+            wx.TheClipboard.SetData(wx.BitmapDataObject(bitmap))
+            wx.TheClipboard.Close()
+            wx.MessageBox("Screenshot copied to clipboard!", "Success", wx.OK | wx.ICON_INFORMATION)
+        else:
+            wx.MessageBox("Failed to open clipboard.", "Error", wx.OK | wx.ICON_ERROR)
+
+
+    def create_feed_url_panel(self, parent):
+        """Create the left panel for managing feed URLs."""
+        panel = wx.Panel(parent)
+
+        # TreeCtrl for feed URLs
+        self.feed_url_tree = wx.TreeCtrl(panel, style=wx.TR_DEFAULT_STYLE | wx.TR_EDIT_LABELS)
+        self.feed_url_tree.Bind(wx.EVT_TREE_SEL_CHANGED, self.on_feed_selected)
+
+        # Buttons
+        buttons = [
+            ("Add URL", self.on_add_url),
+            ("Remove URL", self.on_remove_url),
+            ("Edit URL", self.on_edit_url),
+        ]
+
+        button_sizer = wx.BoxSizer(wx.VERTICAL)
+        for label, handler in buttons:
+            button = wx.Button(panel, label=label)
+            button.Bind(wx.EVT_BUTTON, handler)
+            button_sizer.Add(button, 0, wx.EXPAND | wx.ALL, 5)
+
+        # Layout
+        sizer = wx.BoxSizer(wx.VERTICAL)
+        sizer.Add(self.feed_url_tree, 1, wx.EXPAND | wx.ALL, 5)
+        sizer.Add(button_sizer, 0, wx.EXPAND)
+        panel.SetSizer(sizer)
+
+        return panel
+
+    def remove_images_from_content(self, content):
+        """Remove <img> tags from the HTML content."""
+        return analysis.remove_images_from_content(content)
+
+    def get_thumbnail(self, entry):
+        """Retrieve the thumbnail or media content from the feed entry."""
+        return analysis.get_thumbnail(entry)
+
+    def get_keywords(self, text):
+        """Extract keywords from the given text."""
+        return self.keyword_extractor.extract(text)
+
+    def load_keyword_corpus(self):
+        """Build the keyword corpus statistics from every stored entry."""
+        self.keyword_extractor.fit(entry_text(entry) for entry in self.entry_store.iter_documents())
+
+    def warm_up(self):
+        """Import the analysis libraries and build their indexes in the background."""
+        try:
+            with self.metrics.time("warm_up"):
+                self.keyword_extractor.stop_words
+                import textblob  # noqa: F401
+                backend_warm_up = getattr(self.translator.backend, "warm_up", None)
+                if backend_warm_up:
+                    backend_warm_up()
+                self.load_keyword_corpus()
+        except Exception as e:
+            print(f"Warm-up failed: {e}")
+
+    def cluster_backlog(self):
+        """Cluster previously stored entries into stories in the background."""
+        try:
+            clustered = self.entry_store.cluster_backlog()
+        except Exception as e:
+            print(f"Clustering stored entries failed: {e}")
+            return
+        if clustered:
+            print(f"Clustered {clustered} stored entries into stories")
+
+    def report_startup(self):
+        """Print the time from process start to a filled, visible window and exit."""
+        print(f"startup: ready after {time.perf_counter() - self.startup_started:.3f}s "
+              f"({self.feed_url_tree.GetCount()} tree items)", flush=True)
+        self.Close()
+
+    def get_sentiment_label(self, content):
+        """Analyze sentiment of the given content."""
+        return analysis.get_sentiment_label(content)
+
+    def get_publication_date(self, entry):
+        """Retrieve the publication date of the feed entry."""
+        return analysis.get_publication_date(entry)
+
+
+    def render_settings(self):
+        """Return the settings that change how an article renders, for the render cache key."""
+        return self.settings["analysis_enabled"], self.settings["translation_target"]
+
+    def on_title_selected(self, event):
+        """Display the content of the selected feed item and pre-render its neighbors."""
+        index = self.title_list.GetFirstSelected()
+        entry = self.title_list.entry(index)
+        if entry is None or entry['id'] == self.displayed_entry_id:
+            return
+
+        self.displayed_entry_id = entry['id']
+        self.selection_started = time.perf_counter()
+        with self.metrics.time("select"):
+            html = self.render_cache.get(entry, self.render_settings())
+        self.content_html.SetPage(html, self.image_cache.base_url())
+        self.title_list.refresh_entry(entry)
+
+        # Pre-render the entries around the selection, nearest first
+        neighbors = []
+        for distance in range(1, PRERENDER_NEIGHBORS + 1):
+            neighbors.extend(self.title_list.entry(index + offset) for offset in (distance, -distance))
+        self.render_cache.prefetch([neighbor for neighbor in neighbors if neighbor], self.render_settings())
+
+    def on_page_loaded(self, event):
+        """Record how long it took from selecting an entry to showing its page."""
+        if self.selection_started is not None:
+            elapsed = time.perf_counter() - self.selection_started
+            self.selection_latency.add(elapsed)
+            self.metrics.observe("paint", elapsed)
+            self.selection_started = None
+            self.SetStatusText(f"Article shown ({self.selection_latency.summary()})")
+        event.Skip()
+
+
+    def create_title_panel(self, parent):
+        """Create the middle panel for displaying feed titles."""
+        panel = wx.Panel(parent)
+
+        # Search box over every stored entry
+        self.search_box = wx.SearchCtrl(panel, style=wx.TE_PROCESS_ENTER)
+        self.search_box.ShowCancelButton(True)
+        self.search_box.SetDescriptiveText("Search all entries")
+        self.search_box.Bind(wx.EVT_SEARCH, self.on_search)
+        self.search_box.Bind(wx.EVT_SEARCH_CANCEL, self.on_search_cancel)
+
+        # Sentiment filter of the title list
+        self.sentiment_choice = wx.Choice(panel, choices=["All sentiments"] + list(LABELS))
+        self.sentiment_choice.SetSelection(0)
+        self.sentiment_choice.Bind(wx.EVT_CHOICE, self.on_sentiment_filter)
+
+        # Show a story carried by several feeds as one row
+        self.collapse_checkbox = wx.CheckBox(panel, label="Collapse duplicates")
+        self.collapse_checkbox.SetValue(self.collapse_duplicates)
+        self.collapse_checkbox.Bind(wx.EVT_CHECKBOX, self.on_collapse_duplicates)
+
+        self.title_list = TitleListCtrl(
+            panel,
+            feed_title=lambda url: self.feed_titles.get(url, url),
+            thumbnail=lambda entry: self.image_cache.local_path(entry.get('thumbnail'), touch=False),
+        )
+        self.title_list.Bind(wx.EVT_LIST_ITEM_SELECTED, self.on_title_selected)
+
+        # Layout
+        search_sizer = wx.BoxSizer(wx.HORIZONTAL)
+        search_sizer.Add(self.search_box, 1, wx.EXPAND | wx.RIGHT, 5)
+        search_sizer.Add(self.sentiment_choice, 0, wx.EXPAND | wx.RIGHT, 5)
+        search_sizer.Add(self.collapse_checkbox, 0, wx.ALIGN_CENTER_VERTICAL)
+        sizer = wx.BoxSizer(wx.VERTICAL)
+        sizer.Add(search_sizer, 0, wx.EXPAND | wx.LEFT | wx.RIGHT | wx.TOP, 5)
+        sizer.Add(self.title_list, 1, wx.EXPAND | wx.ALL, 5)
+        panel.SetSizer(sizer)
+
+        return panel
+
+    def create_content_panel(self, parent):
+        """Create the right panel for displaying feed content."""
+        panel = wx.Panel(parent)
+        self.content_html = wx.html2.WebView.New(panel)
+        self.content_html.Bind(wx.html2.EVT_WEBVIEW_LOADED, self.on_page_loaded)
+
+        # Layout
+        sizer = wx.BoxSizer(wx.VERTICAL)
+        sizer.Add(self.content_html, 1, wx.EXPAND | wx.ALL, 5)
+        panel.SetSizer(sizer)
+
+        return panel
+
+    def on_feed_selected(self, event):
+        """Show the stored entries of the selected feed or category and refresh them in the background.
+
+        Selecting a category or the root node shows a river of all feeds below it.
+        """
+        item = self.feed_url_tree.GetSelection()
+        if not item.IsOk():
+            return
+
+        feed_urls = self.feeds_under(item)
+        if not feed_urls:
+            return
+
+        self.current_feed_urls = set(feed_urls)
+        self.search_box.SetValue("")
+        with self.metrics.time("open_view"):
+            self.show_entry_view(self.entry_view(feed_urls))
+        self.show_sentiment_summary()
+
+        # Fetch without blocking the UI; results come back via on_feed_fetched
+        if len(feed_urls) == 1:
+            self.SetStatusText(f"Fetching {feed_urls[0]} ...")
+        else:
+            self.SetStatusText(f"Fetching {len(feed_urls)} feeds ...")
+        self.fetcher.fetch_all(feed_urls, self.post_feed_fetched)
+
+    def on_search(self, event):
+        """Show the stored entries matching the search box text, best matches first."""
+        query = self.search_box.GetValue().strip()
+        if not query:
+            self.on_search_cancel(event)
+            return
+
+        with self.metrics.time("search"):
+            view = SearchView(self.entry_store, query, sentiment=self.sentiment_filter,
+                              collapse=self.collapse_duplicates)
+            self.show_entry_view(view)
+        self.SetStatusText(f"{len(view)} entries match '{query}'")
+
+    def on_search_cancel(self, event):
+        """Leave the search results and go back to the selected feeds."""
+        self.search_box.SetValue("")
+        if self.current_feed_urls:
+            self.show_entry_view(self.entry_view(list(self.current_feed_urls)))
+        else:
+            self.title_list.clear()
+        self.SetStatusText("")
+
+    def on_sentiment_filter(self, event):
+        """Show only the entries with the chosen sentiment, in the feeds or the search results."""
+        selection = self.sentiment_choice.GetSelection()
+        self.sentiment_filter = LABELS[selection - 1] if selection > 0 else None
+        self.reshow_entries(event)
+
+    def on_collapse_duplicates(self, event):
+        """Switch between one row per story and one row per entry."""
+        self.collapse_duplicates = self.collapse_checkbox.GetValue()
+        self.reshow_entries(event)
+
+    def reshow_entries(self, event):
+        """Show the search results or selected feeds again, after the filters changed."""
+        if self.search_box.GetValue().strip():
+            self.on_search(event)
+        elif self.current_feed_urls:
+            self.show_entry_view(self.entry_view(list(self.current_feed_urls)))
+
+    def show_sentiment_summary(self):
+        """Show the sentiment of the selected feeds' entries in the second status bar field."""
+        if not self.current_feed_urls:
+            self.SetStatusText("", 1)
+            return
+        summary = self.entry_store.sentiment_summary(self.current_feed_urls)
+        text = ", ".join(f"{summary[label]} {label.lower()}" for label in LABELS)
+        if summary["mean"] is not None:
+            text += f" (mean {summary['mean']:+.2f})"
+        self.SetStatusText(text, 1)
+
+    def feeds_under(self, item):
+        """Return the feed URLs of a tree item and all of its descendants."""
+        url = self.feed_url_tree.GetItemData(item)
+        if url:
+            return [url]
+
+        feed_urls = []
+        child, cookie = self.feed_url_tree.GetFirstChild(item)
+        while child.IsOk():
+            feed_urls.extend(self.feeds_under(child))
+            child, cookie = self.feed_url_tree.GetNextChild(item, cookie)
+        return list(dict.fromkeys(feed_urls))
+
+    def ingest_feed(self, url, feed, error):
+        """Analyze new or changed entries and merge them into the store (runs on a worker thread)."""
+        self.scheduler.record(url, feed, error)
+        if error is not None:
+            return 0, error
+        try:
+            with self.metrics.time("store_diff"):
+                rows = self.entry_store.changed_rows(url, feed.entries)
+
+            # Keywords are extracted once per feed batch, against the updated corpus;
+            # if that fails (e.g. without the NLTK stopwords) the rows are stored without them
+            if self.settings["analysis_enabled"] and rows:
+                try:
+                    with self.metrics.time("keywords"):
+                        texts = [entry_text(row) for row in rows]
+                        self.keyword_extractor.add_documents(text for row, text in zip(rows, texts) if row["is_new"])
+                        batch = self.keyword_extractor.extract_batch(texts)
+                except Exception as e:
+                    print(f"Keyword extraction failed for {url}: {e}")
+                else:
+                    for row, keywords in zip(rows, batch):
+                        row["keywords"] = ",".join(keywords)
+
+                # Sentiment too; entries it fails for are scored when they are first viewed
+                try:
+                    with self.metrics.time("sentiment"):
+                        scores = self.sentiment.score_batch([row["body_text"] or row["title"] or "" for row in rows])
+                except Exception as e:
+                    print(f"Sentiment analysis failed for {url}: {e}")
+                else:
+                    for row, (score, label) in zip(rows, scores):
+                        row["sentiment_score"], row["sentiment_label"] = score, label
+
+            with self.metrics.time("store_write"):
+                self.entry_store.write_rows(rows)
+
+            # Download thumbnails now, so neither the list nor the article waits for them
+            self.image_cache.prefetch((row["thumbnail"] for row in rows),
+                                      callback=lambda image_url: wx.CallAfter(self.title_list.refresh_visible))
+            return len(rows), None
+        except Exception as e:
+            return 0, e
+
+    def post_feed_fetched(self, url, feed, error):
+        """Ingest a fetch result on the worker thread, then notify the UI thread."""
+        changed, error = self.ingest_feed(url, feed, error)
+        wx.CallAfter(self.on_feed_fetched, url, changed, error)
+
+    def post_refresh_fetched(self, url, feed, error):
+        """Ingest a 'Refresh All' fetch result, then notify the UI thread."""
+        changed, error = self.ingest_feed(url, feed, error)
+        wx.CallAfter(self.on_feed_fetched, url, changed, error, refresh=True)
+
+    def post_scheduled_fetched(self, url, feed, error):
+        """Ingest a scheduled background fetch result, then notify the UI thread."""
+        changed, error = self.ingest_feed(url, feed, error)
+        wx.CallAfter(self.on_feed_fetched, url, changed, error, scheduled=True)
+
+    def on_feed_fetched(self, url, changed, error, refresh=False, scheduled=False):
+        """Reload the title list from the store if a visible feed changed."""
+        is_current = url in self.current_feed_urls
+        if error is None and changed and is_current:
+            self.show_entry_view(self.title_list.view.reload())
+            self.show_sentiment_summary()
+
+        if scheduled:
+            # Background refreshes stay quiet; failures are retried with backoff
+            return
+        if refresh:
+            self.refresh_done += 1
+            self.SetStatusText(f"Refreshed {self.refresh_done}/{self.refresh_total} feeds")
+        elif error is not None:
+            self.SetStatusText(f"Error fetching {url}")
+            if is_current and len(self.current_feed_urls) == 1:
+                wx.MessageBox(f"Error fetching feed: {error}", "Error", wx.OK | wx.ICON_ERROR)
+        elif is_current:
+            self.SetStatusText(f"{self.title_list.GetItemCount()} entries ({changed} new or updated)")
+
+    def on_refresh_all(self, event):
+        """Fetch every subscribed feed concurrently."""
+        if self.refresh_started is not None:
+            return
+
+        urls = [url for url, _, _ in self.feed_tree.feeds()]
+        self.refresh_started = time.perf_counter()
+        self.refresh_done = 0
+        self.refresh_total = len(set(urls))
+        self.SetStatusText(f"Refreshing {self.refresh_total} feeds ...")
+        self.fetcher.fetch_all(urls, self.post_refresh_fetched,
+                               on_complete=lambda: wx.CallAfter(self.on_refresh_complete))
+
+    def on_scheduler_tick(self, event):
+        """Fetch the feeds the scheduler says are due."""
+        if self.refresh_started is not None:
+            return
+        urls = self.scheduler.due()
+        if urls:
+            self.fetcher.fetch_all(urls, self.post_scheduled_fetched)
+
+    def on_refresh_complete(self):
+        """Report how long a full refresh took."""
+        elapsed = time.perf_counter() - self.refresh_started
+        self.refresh_started = None
+        self.entry_store.prune()
+        stats = self.feed_cache.stats()
+        self.SetStatusText(
+            f"Refreshed {self.refresh_total} feeds in {elapsed:.1f}s "
+            f"(cache: {stats['hits']} unchanged, {stats['misses']} downloaded)"
+        )
+
+    def entry_view(self, feed_urls):
+        """Return a view over the given feeds' stored entries in the title list's current order and filters.
+
+        Several unfiltered, uncollapsed feeds shown newest first are streamed as a river.
+        """
+        current = self.title_list.view
+        if current is None or current.sort_key is None:
+            sort_key, descending = "published", True
+        else:
+            sort_key, descending = current.sort_key, current.descending
+        if (len(feed_urls) > 1 and sort_key == "published" and descending
+                and self.sentiment_filter is None and not self.collapse_duplicates):
+            return RiverView(self.entry_store, feed_urls)
+        return EntryView(self.entry_store, feed_urls, sort_key, descending,
+                         sentiment=self.sentiment_filter, collapse=self.collapse_duplicates)
+
+    def show_entry_view(self, view):
+        """Show an entry view in the title list, keeping the displayed entry selected if present."""
+        self.title_list.set_view(view, self.displayed_entry_id)
+
+        # Translate the titles on screen before they are clicked
+        if self.settings["analysis_enabled"]:
+            titles = [entry.get('title', "No Title Available") for entry in view.head(PREFETCH_TITLES)]
+            self.translator.prefetch([title.strip() for title in titles])
+
+        if self.title_list.selected_entry() is None:
+            self.displayed_entry_id = None
+            self.selection_started = None
+            self.content_html.SetPage("<html><body></body></html>", "")
+
+    def on_close(self, event):
+        """Stop background work before the window is destroyed."""
+        self.refresh_timer.Stop()
+        self.fetcher.shutdown()
+        self.render_cache.shutdown()
+        self.image_cache.shutdown()
+        self.sentiment.shutdown()
+        self.translator.close()
+        self.entry_store.close()
+        self.subscriptions.close()
+        event.Skip()
+
+    def on_remove_category(self, event):
+        """Remove a selected category."""
+        item = self.feed_url_tree.GetSelection()
+        category = self.feed_tree.category_of(item) if item.IsOk() else None
+        if category is None:
+            return
+
+        # Confirm removal
+        confirm = wx.MessageBox(
+            f"Are you sure you want to remove the category '{category}' and all its feeds?",
+            "Confirm",
+            wx.YES_NO | wx.ICON_WARNING,
+        )
+        if confirm == wx.YES:
+            # Remove all feeds in this category
+            for url in self.feed_tree.remove_category(category):
+                self.scheduler.remove(url)
+
+    def on_add_category(self, event):
+        """Add a new category."""
+        dialog = wx.TextEntryDialog(self, "Enter new category name:", "Add Category")
+        if dialog.ShowModal() == wx.ID_OK:
+            category = dialog.GetValue().strip()
+            if category:
+                # Existing categories are left alone
+                self.feed_tree.add_category(category)
+        dialog.Destroy()
+
+    def on_tree_right_click(self, event):
+        """Show a context menu when an item in the tree is right-clicked."""
+        item = event.GetItem()
+        if not item.IsOk():
+            return
+
+        self.feed_url_tree.SelectItem(item)
+        is_root = item == self.feed_url_tree.GetRootItem()
+        is_category = not self.feed_url_tree.GetItemData(item)
+
+        # Create a context menu
+        menu = wx.Menu()
+        if is_root or is_category:
+            # Category-related options
+            menu.Append(wx.ID_ADD, "Add Category")
+            menu.Bind(wx.EVT_MENU, self.on_add_category, id=wx.ID_ADD)
+            if is_category:
+                menu.Append(wx.ID_EDIT, "Edit Category")
+                menu.Append(wx.ID_DELETE, "Remove Category")
+                menu.Bind(wx.EVT_MENU, self.on_edit_category, id=wx.ID_EDIT)
+                menu.Bind(wx.EVT_MENU, self.on_remove_category, id=wx.ID_DELETE)
+        else:
+            # Feed URL-related options
+            menu.Append(wx.ID_EDIT, "Edit Feed URL")
+            menu.Append(wx.ID_DELETE, "Remove Feed URL")
+            menu.Bind(wx.EVT_MENU, self.on_edit_url, id=wx.ID_EDIT)
+            menu.Bind(wx.EVT_MENU, self.on_remove_url, id=wx.ID_DELETE)
+
+        # Show the menu
+        self.PopupMenu(menu)
+        menu.Destroy()
+
+
+    def on_add_url(self, event):
+        """Add a new feed URL under a selected category."""
+        # Ensure a category (or a feed in it) is selected
+        item = self.feed_url_tree.GetSelection()
+        category = self.feed_tree.category_of(item) if item.IsOk() else None
+        if category is None:
+            wx.MessageBox("Please select a category first.", "Error", wx.OK | wx.ICON_ERROR)
+            return
+
+        # Prompt user for the feed URL
+        dialog = wx.TextEntryDialog(self, "Enter Feed URL:", "Add Feed URL")
+        if dialog.ShowModal() == wx.ID_OK:
+            url = dialog.GetValue().strip()
+            if url:
+                try:
+                    # Parse the feed, reusing the cached copy when it has not changed
+                    feed = self.fetcher.fetch(url)
+                    if feed.bozo:  # Check for parsing errors
+                        wx.MessageBox("Invalid feed URL. Please try again.", "Error", wx.OK | wx.ICON_ERROR)
+                        return
+
+                    # Fetch the description from the first item's title
+                    description = feed.feed.title if 'title' in feed.feed else "No Title Available"
+
+                    # Add the URL and description to the feed list
+                    if self.feed_tree.add_feed(url, description, category) is None:
+                        wx.MessageBox("This feed is already subscribed.", "Error", wx.OK | wx.ICON_ERROR)
+                        return
+                    self.scheduler.add(url)
+                    self.scheduler.record(url, feed, None)
+                except Exception as e:
+                    wx.MessageBox(f"Error fetching feed: {str(e)}", "Error", wx.OK | wx.ICON_ERROR)
+            else:
+                wx.MessageBox("The URL cannot be empty.", "Error", wx.OK | wx.ICON_ERROR)
+        dialog.Destroy()
+
+
+    def on_remove_url(self, event):
+        """Remove the selected feed URL."""
+        item = self.feed_url_tree.GetSelection()
+        feed_url = self.feed_url_tree.GetItemData(item) if item.IsOk() else None
+        if not feed_url:
+            return
+
+        # Confirm removal
+        confirm = wx.MessageBox(
+            f"Are you sure you want to remove this feed URL?",
+            "Confirm",
+            wx.YES_NO | wx.ICON_WARNING,
+        )
+        if confirm == wx.YES:
+            self.feed_tree.remove_feed(feed_url)
+            self.scheduler.remove(feed_url)
+
+    def on_edit_category(self, event):
+        """Edit the selected category name."""
+        item = self.feed_url_tree.GetSelection()
+        old_category = self.feed_tree.category_of(item) if item.IsOk() else None
+        if old_category is None:
+            return
+
+        dialog = wx.TextEntryDialog(self, "Edit Category Name:", "Edit Category", old_category)
+        if dialog.ShowModal() == wx.ID_OK:
+            new_category = dialog.GetValue().strip()
+            if new_category and new_category != old_category:
+                # Update category name
+                if not self.feed_tree.rename_category(old_category, new_category):
+                    wx.MessageBox(f"The category '{new_category}' already exists.", "Error", wx.OK | wx.ICON_ERROR)
+        dialog.Destroy()
+
+    def get_feed_description(self, url):
+        """Fetch the description of the feed from the URL."""
+        feed = self.fetcher.fetch(url)
+        return feed.feed.get('title', 'No Title Available')
+
+    def on_edit_url(self, event):
+        """Edit the selected feed URL and description."""
+        item = self.feed_url_tree.GetSelection()
+        current_url = self.feed_url_tree.GetItemData(item) if item.IsOk() else None
+        feed = self.subscriptions.feed(current_url) if current_url else None
+        if feed is None:
+            return
+
+        url, description, _ = feed
+        dialog = wx.TextEntryDialog(
+            self,
+            "Edit Feed URL|Description:",
+            "Edit Feed URL",
+            f"{url}|{description}",
+        )
+        if dialog.ShowModal() == wx.ID_OK:
+            # Descriptions may contain '|' themselves; URLs do not
+            updated_entry = dialog.GetValue().split('|', 1)
+            if len(updated_entry) == 2:
+                updated_url, updated_description = (value.strip() for value in updated_entry)
+                if not self.feed_tree.update_feed(current_url, updated_url, updated_description):
+                    wx.MessageBox("This feed is already subscribed.", "Error", wx.OK | wx.ICON_ERROR)
+                elif updated_url != current_url:
+                    self.scheduler.rename(current_url, updated_url)
+        dialog.Destroy()
@@ -0,0 +1,105 @@
+"""Compact in-memory entry records.
+
+Lists, rivers and feed caches hold many entries at once, so entries are
+kept as ``__slots__`` objects rather than dicts or feedparser results:
+no per-entry dict, feed URLs and sentiment labels interned so every entry
+of a feed shares one string, and the large fields of stored entries left
+in the database until an article is opened.
+
+Both record types answer the dict-style reads the rest of the reader uses
+(``entry['id']``, ``entry.get('title')``, ``'thumbnail' in entry``), where
+a field that is None counts as missing, as in the stored entry dicts they
+replace.
+"""
+import sys
+
+
+class Record:
+    """Dict-style access to the fields of a slotted record."""
+
+    __slots__ = ()
+
+    def _value(self, key):
+        return getattr(self, key, None)
+
+    def __getitem__(self, key):
+        value = self._value(key)
+        if value is None:
+            raise KeyError(key)
+        return value
+
+    def get(self, key, default=None):
+        value = self._value(key)
+        return default if value is None else value
+
+    def __contains__(self, key):
+        return self._value(key) is not None
+
+    def __setitem__(self, key, value):
+        setattr(self, key, value)
+
+
+class ParsedEntry(Record):
+    """The fields of a fetched feed entry that ingest and the scheduler read, kept right after parsing.
+
+    Replaces feedparser's entry dicts, which also carry ``title_detail``,
+    ``summary_detail``, ``links`` and the parsed date tuples.
+    """
+
+    __slots__ = ("id", "title", "summary", "link", "published", "published_ts", "thumbnail")
+
+    def __init__(self, id, title, summary, link, published, published_ts, thumbnail):
+        self.id = id
+        self.title = title
+        self.summary = summary
+        self.link = link
+        self.published = published
+        self.published_ts = published_ts
+        self.thumbnail = thumbnail or None
+
+
+class EntryRecord(Record):
+    """A stored entry as shown in the title list.
+
+    Only the columns the list and the render cache key need are kept
+    (``fetched_at`` changes whenever the stored entry does); the columns in DETAIL_COLUMNS
+    (the summary and its normalized forms among them) are read from the
+    store in one query the first time one of them is used, and kept with
+    the record from then on. Assigning a detail column loads the others first.
+    """
+
+    COLUMNS = ("id", "feed_url", "link", "title", "published_ts", "fetched_at", "thumbnail",
+               "sentiment_score", "sentiment_label", "cluster_id")
+    DETAIL_COLUMNS = ("guid", "summary", "published", "keywords", "body_html", "body_text")
+
+    __slots__ = COLUMNS + ("store", "details", "duplicates", "snippet", "rank")
+
+    def __init__(self, store, row):
+        (self.id, feed_url, self.link, self.title, self.published_ts, self.fetched_at, self.thumbnail,
+         self.sentiment_score, sentiment_label, self.cluster_id) = row
+        self.feed_url = sys.intern(feed_url)
+        self.sentiment_label = sentiment_label and sys.intern(sentiment_label)
+        self.store = store
+        self.details = None
+
+    def _details(self):
+        details = self.details
+        if details is None:
+            details = self.details = dict(zip(self.DETAIL_COLUMNS, self.store.entry_details(self.id)))
+        return details
+
+    def _value(self, key):
+        if key in self.DETAIL_COLUMNS:
+            return self._details().get(key)
+        if key in self.__slots__:
+            return getattr(self, key, None)
+        return None
+
+    def __setitem__(self, key, value):
+        if key in self.DETAIL_COLUMNS:
+            self._details()[key] = value
+        else:
+            setattr(self, key, value)
+
+    def __repr__(self):
+        return f"<EntryRecord {self.id} {self.feed_url!r} {self.title!r}>"
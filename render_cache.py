@@ -0,0 +1,257 @@
+"""Cache of rendered article HTML, pre-rendered in the background for nearby entries."""
+import threading
+from collections import OrderedDict, deque
+from concurrent.futures import Future, ThreadPoolExecutor
+
+import analysis
+from content import normalize
+from keywords import entry_text
+from metrics import DISABLED
+
+
+class ArticleRenderer:
+    """Build the article HTML shown in the content panel.
+
+    Runs on the pre-render thread as well as the GUI thread, so it must not
+    touch any window.
+    """
+
+    def __init__(self, settings, entry_store, translator, keyword_extractor, metrics=None, image_cache=None,
+                 sentiment=None):
+        self.settings = settings
+        self.entry_store = entry_store
+        self.translator = translator
+        self.keyword_extractor = keyword_extractor
+        self.metrics = metrics or DISABLED
+        self.image_cache = image_cache
+        self.sentiment = sentiment
+
+    def body(self, entry):
+        """Return an entry's sanitized HTML and plain text.
+
+        Entries stored before ingest normalization are normalized once here and written back.
+        """
+        if 'body_html' not in entry:
+            with self.metrics.time("normalize"):
+                entry['body_html'], entry['body_text'] = normalize(entry.get('summary'))
+            if 'id' in entry:
+                self.entry_store.set_body(entry['id'], entry['body_html'], entry['body_text'])
+        return entry['body_html'], entry['body_text']
+
+    def sentiment_label(self, entry, text):
+        """Return an entry's sentiment label, computing and storing it if ingest did not."""
+        if 'sentiment_label' in entry:
+            return entry['sentiment_label']
+        try:
+            with self.metrics.time("sentiment"):
+                if self.sentiment is not None:
+                    score, label = self.sentiment.score(text)
+                else:
+                    score, label = analysis.get_sentiment(text)
+        except Exception as e:
+            return f"Error analyzing sentiment: {e}"
+
+        self.entry_store.set_sentiment(entry['id'], score, label)
+        entry['sentiment_score'], entry['sentiment_label'] = score, label
+        return label
+
+    def render(self, entry):
+        """Build the article HTML of an entry."""
+        with self.metrics.time("render"):
+            return self._render(entry)
+
+    def _render(self, entry):
+        title_ = entry.get('title', "No Title Available")
+        content, text = self.body(entry)
+
+        # Validate content
+        title_ = title_.strip() or "No Title Available"
+        content = content.strip() or "No Content Available"
+
+        link = entry.get('link', "#")
+        pub_date = analysis.get_publication_date(entry)
+        image = analysis.get_thumbnail(entry)
+        if image and self.image_cache is not None:
+            # Prefer the downscaled local copy; it also shows when offline
+            image = self.image_cache.local_url(image) or image
+
+        # Translation, keywords and sentiment are skipped when analysis is turned off
+        translated_title, translated_content = title_, content
+        analysis_html = ""
+        if self.settings["analysis_enabled"]:
+            try:
+                with self.metrics.time("translate"):
+                    translated_title = self.translator.translate(title_)
+            except Exception as e:
+                print(f"Translation Error (Title): {e}")
+                translated_title = "Translation not available"
+
+            try:
+                with self.metrics.time("translate"):
+                    translated_content = self.translator.translate(content)
+            except Exception as e:
+                print(f"Translation Error (Content): {e}")
+                translated_content = "Translation not available"
+
+            sentiment_label = self.sentiment_label(entry, text or title_)
+            if entry.get('keywords'):
+                keywords = entry['keywords'].split(',')
+            else:
+                with self.metrics.time("keywords"):
+                    if content == "No Content Available":
+                        keywords = self.keyword_extractor.extract(title_)
+                    else:
+                        keywords = self.keyword_extractor.extract(entry_text(entry))
+
+            analysis_html = (
+                f"<p><strong>Keywords:</strong> {', '.join(keywords)}</p>"
+                f"<p><strong>Sentiment:</strong> {sentiment_label}</p>"
+            )
+
+        if title_ == translated_title or content == translated_content:
+            # Construct HTML
+            html_content = (
+                f"<h1>{title_.title()}</h1>"
+                f"<p><strong>Published:</strong> {pub_date}</p>"
+                f"{analysis_html}"
+                f"<div>{content}</div>"
+            )
+        else:
+            # Construct HTML
+            html_content = (
+                f"<h1>{title_.title()}</h1>"
+                f"<h1>{translated_title.title()}</h1>"
+                f"<p><strong>Published:</strong> {pub_date}</p>"
+                f"{analysis_html}"
+                f"<div>{content}</div>"
+                f"<div>{translated_content}</div>"
+            )
+
+        if image:
+            html_content += f'<p><img src="{image}" alt="Thumbnail" style="max-width:100%;"></p>'
+        html_content += f'<p><a href="{link}">Read more</a></p>'
+
+        return html_content
+
+
+class RenderCache:
+    """LRU cache of article HTML keyed by entry and render settings.
+
+    Entries are rendered by ``render(entry)``, on the caller's thread for a
+    cache miss and on a single background thread for pre-rendering.
+    """
+
+    def __init__(self, render, max_entries=64):
+        self.render = render
+        self.max_entries = max_entries
+        self.pages = OrderedDict()
+        self.in_flight = {}
+        self.lock = threading.Lock()
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="prerender")
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(entry, settings_key):
+        """Return the cache key of an entry rendered with the given settings.
+
+        Built from the id and the time the stored entry last changed, so a
+        lookup does not load the entry's summary from the store.
+        """
+        return entry['id'], entry.get('fetched_at'), settings_key
+
+    def _store(self, key, html):
+        """Add a rendered page, evicting the least recently used ones."""
+        with self.lock:
+            self.pages[key] = html
+            self.pages.move_to_end(key)
+            while len(self.pages) > self.max_entries:
+                self.pages.popitem(last=False)
+
+    def _render(self, key, entry):
+        """Render an entry once, even if it is requested from several threads."""
+        with self.lock:
+            if key in self.pages:
+                return self.pages[key]
+            future = self.in_flight.get(key)
+            owner = future is None
+            if owner:
+                future = self.in_flight[key] = Future()
+
+        if not owner:
+            return future.result()
+
+        try:
+            html = self.render(entry)
+            self._store(key, html)
+            future.set_result(html)
+            return html
+        except Exception as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self.lock:
+                del self.in_flight[key]
+
+    def get(self, entry, settings_key):
+        """Return the HTML of an entry, rendering it now if it is not cached."""
+        key = self.key(entry, settings_key)
+        with self.lock:
+            if key in self.pages:
+                self.hits += 1
+                self.pages.move_to_end(key)
+                return self.pages[key]
+            self.misses += 1
+        return self._render(key, entry)
+
+    def prefetch(self, entries, settings_key):
+        """Render entries in the background, dropping work queued for an earlier selection."""
+        with self.lock:
+            self.generation += 1
+            generation = self.generation
+
+        def run(entry):
+            if generation != self.generation:
+                return
+            try:
+                self._render(self.key(entry, settings_key), entry)
+            except Exception as e:
+                print(f"Pre-rendering failed: {e}")
+
+        for entry in entries:
+            self.executor.submit(run, entry)
+
+    def clear(self):
+        """Forget every rendered page, e.g. after the render settings changed."""
+        with self.lock:
+            self.pages.clear()
+
+    def shutdown(self):
+        """Stop pre-rendering."""
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+
+class LatencyRecorder:
+    """Keep the most recent latency samples and report their percentiles."""
+
+    def __init__(self, size=1000):
+        self.samples = deque(maxlen=size)
+
+    def add(self, seconds):
+        self.samples.append(seconds)
+
+    def percentile(self, percent):
+        """Return the given percentile in seconds (nearest rank), or None without samples."""
+        if not self.samples:
+            return None
+        ordered = sorted(self.samples)
+        rank = max(0, min(len(ordered) - 1, round(percent / 100 * len(ordered)) - 1))
+        return ordered[rank]
+
+    def summary(self):
+        """Return the p50 and p99 latencies as text."""
+        if not self.samples:
+            return "no samples"
+        return (f"p50 {self.percentile(50) * 1000:.0f} ms, p99 {self.percentile(99) * 1000:.0f} ms "
+                f"over {len(self.samples)} selections")
@@ -0,0 +1,71 @@
+"""Newest-first "river" of entries merged from several feeds."""
+import heapq
+
+from entry_store import EntryView
+
+
+def merge_river(iterables):
+    """Merge per-feed iterables that are each newest first into one newest-first stream."""
+    return heapq.merge(*iterables, key=lambda entry: (entry['published_ts'], entry['id']), reverse=True)
+
+
+class RiverView:
+    """Date-ordered view over many feeds, built by a streaming k-way merge.
+
+    Each feed is read through its own cursor, so the first screen only costs
+    one small query per feed. Older entries are pulled from the merge on
+    demand as the list is scrolled, and the full river is never built.
+    """
+
+    sort_key = "published"
+    descending = True
+
+    def __init__(self, store, feed_urls, chunk_size=200):
+        self.store = store
+        self.feed_urls = list(feed_urls)
+        self.chunk_size = chunk_size
+        self.merged = merge_river(store.iter_feed(url) for url in self.feed_urls)
+        self.entries = []
+        self.positions = {}
+        self.has_more = True
+        self.load_more()
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __getitem__(self, index):
+        return self.entries[index]
+
+    def load_more(self, count=None):
+        """Pull the next count entries (a chunk by default) from the merge."""
+        for _ in range(count or self.chunk_size):
+            entry = next(self.merged, None)
+            if entry is None:
+                self.has_more = False
+                return
+            self.positions[entry['id']] = len(self.entries)
+            self.entries.append(entry)
+
+    def head(self, count):
+        """Return up to the first count entries."""
+        return self.entries[:count]
+
+    def index_of(self, entry_id):
+        """Return the position of an already loaded entry, or None."""
+        return self.positions.get(entry_id)
+
+    def sorted(self, sort_key, descending):
+        """Return a view over the same feeds in another order.
+
+        Only newest-first can be streamed; other orders are sorted by SQLite.
+        """
+        if sort_key == self.sort_key and descending == self.descending:
+            return RiverView(self.store, self.feed_urls, self.chunk_size)
+        return EntryView(self.store, self.feed_urls, sort_key, descending)
+
+    def reload(self):
+        """Return a fresh river that has loaded at least as many entries as this one."""
+        river = RiverView(self.store, self.feed_urls, self.chunk_size)
+        if len(river) < len(self):
+            river.load_more(len(self) - len(river))
+        return river
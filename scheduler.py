@@ -0,0 +1,219 @@
+"""Adaptive per-feed refresh scheduling.
+
+Each feed's polling interval is the geometric mean of its posting gap,
+learned from the publication times of its entries, and a target interval:
+for Poisson posting that minimizes the mean delay per new entry for a given
+number of fetches. Intervals stay within the bounds set by the feed's RSS
+``ttl``, its ``skipHours`` and the HTTP Cache-Control header. Failing feeds
+back off exponentially. Time comes from an injectable clock, so schedules can
+be simulated without waiting.
+"""
+import heapq
+import math
+import random
+import re
+import threading
+import time
+from urllib.parse import urlsplit
+
+from entry_store import entry_timestamp
+
+MAX_AGE_PATTERN = re.compile(r"max-age\s*=\s*(\d+)", re.IGNORECASE)
+
+# Entries used to estimate a feed's posting rate
+RATE_SAMPLE = 20
+
+
+def feed_hints(feed):
+    """Return (timestamps, ttl seconds, Cache-Control max-age, skip hours) of a parsed feed."""
+    timestamps = [timestamp for timestamp in map(entry_timestamp, feed.entries) if timestamp]
+
+    ttl = None
+    try:
+        ttl = int(feed.feed.get('ttl')) * 60
+    except (TypeError, ValueError):
+        pass
+
+    max_age = None
+    cache_control = feed.get('headers', {}).get('cache-control', "")
+    if "no-cache" not in cache_control and "no-store" not in cache_control:
+        match = MAX_AGE_PATTERN.search(cache_control)
+        if match:
+            max_age = int(match.group(1))
+
+    return timestamps, ttl, max_age, feed.get('skip_hours', ())
+
+
+class FeedState:
+    """Schedule of one feed."""
+
+    __slots__ = ("url", "host", "interval", "next_due", "failures", "skip_hours")
+
+    def __init__(self, url, interval, next_due):
+        self.url = url
+        self.host = urlsplit(url).netloc.lower()
+        self.interval = interval
+        self.next_due = next_due
+        self.failures = 0
+        self.skip_hours = frozenset()
+
+
+class RefreshScheduler:
+    """Decide when each subscribed feed is fetched next.
+
+    A feed posting once per target_interval is polled that often; one posting
+    four times as often is polled twice as often, and so on. ``due()`` hands
+    out the feeds whose time has come, at most ``per_host_limit`` per host
+    per call; fetch results are reported back with ``record()``. Thread-safe:
+    results may be recorded from fetch threads.
+    """
+
+    def __init__(self, clock=time.time, rng=None, min_interval=5 * 60, max_interval=24 * 3600,
+                 target_interval=30 * 60, max_backoff=24 * 3600,
+                 jitter=0.1, per_host_limit=4, host_spacing=5.0):
+        self.clock = clock
+        self.rng = rng or random.Random()
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.target_interval = target_interval
+        self.max_backoff = max_backoff
+        self.jitter = jitter
+        self.per_host_limit = per_host_limit
+        self.host_spacing = host_spacing
+
+        self.feeds = {}
+        self.heap = []
+        self.lock = threading.Lock()
+
+    def _push(self, state, next_due):
+        """Move a feed to a new due time, leaving its old heap entry to be skipped."""
+        state.next_due = self._after_skip_hours(next_due, state.skip_hours)
+        heapq.heappush(self.heap, (state.next_due, state.url))
+
+    def _jittered(self, seconds):
+        return seconds * self.rng.uniform(1 - self.jitter, 1 + self.jitter)
+
+    @staticmethod
+    def _after_skip_hours(when, skip_hours):
+        """Return when, or the start of the next UTC hour not listed in skip_hours."""
+        for _ in range(24):
+            if time.gmtime(when).tm_hour not in skip_hours:
+                return when
+            when = (when // 3600 + 1) * 3600
+        return when
+
+    def add(self, url, stagger=None):
+        """Schedule a new feed, first due at a random point within stagger seconds."""
+        with self.lock:
+            if url in self.feeds:
+                return
+            state = self.feeds[url] = FeedState(url, self.target_interval, 0)
+            spread = self.target_interval if stagger is None else stagger
+            self._push(state, self.clock() + self.rng.uniform(0, spread))
+
+    def remove(self, url):
+        with self.lock:
+            self.feeds.pop(url, None)
+
+    def rename(self, old_url, url):
+        """Keep the learned schedule of a feed whose URL changed."""
+        with self.lock:
+            state = self.feeds.pop(old_url, None)
+            if state is None:
+                return
+            renamed = self.feeds[url] = FeedState(url, state.interval, 0)
+            renamed.skip_hours = state.skip_hours
+            self._push(renamed, state.next_due)
+
+    def next_due(self, url):
+        """Return when a feed is fetched next (in clock time), or None if it is not scheduled."""
+        with self.lock:
+            state = self.feeds.get(url)
+            return state.next_due if state else None
+
+    def schedule(self):
+        """Return (url, next due time, interval, failures) of every feed, soonest first."""
+        with self.lock:
+            states = sorted(self.feeds.values(), key=lambda state: state.next_due)
+            return [(state.url, state.next_due, state.interval, state.failures) for state in states]
+
+    def due(self):
+        """Return the URLs of feeds that should be fetched now.
+
+        Feeds beyond the per-host limit are pushed back by a jittered
+        host_spacing, so one host never sees a burst of requests. Handed-out
+        feeds are provisionally rescheduled one interval ahead, in case their
+        result is never recorded.
+        """
+        now = self.clock()
+        urls = []
+        per_host = {}
+        postponed = []
+        with self.lock:
+            while self.heap and self.heap[0][0] <= now:
+                next_due, url = heapq.heappop(self.heap)
+                state = self.feeds.get(url)
+                if state is None or state.next_due != next_due:
+                    continue
+
+                count = per_host.get(state.host, 0)
+                per_host[state.host] = count + 1
+                if count >= self.per_host_limit:
+                    postponed.append((state, count // self.per_host_limit))
+                    continue
+                urls.append(url)
+                self._push(state, now + state.interval)
+
+            for state, rounds in postponed:
+                self._push(state, now + rounds * self.host_spacing + self.rng.uniform(0, self.host_spacing))
+        return urls
+
+    def posting_interval(self, timestamps, now):
+        """Estimate the seconds between new entries from their publication times, or None.
+
+        The time since the newest entry counts as a gap too, so feeds that
+        went quiet slow down instead of being polled at their old rate.
+        """
+        timestamps = sorted(timestamps, reverse=True)[:RATE_SAMPLE]
+        if not timestamps:
+            return None
+        quiet = max(0.0, now - timestamps[0])
+        if len(timestamps) == 1:
+            return quiet or None
+        mean_gap = (timestamps[0] - timestamps[-1]) / (len(timestamps) - 1)
+        return max(mean_gap, quiet)
+
+    def record_success(self, url, timestamps=(), ttl=None, max_age=None, skip_hours=()):
+        """Schedule a feed after a successful fetch."""
+        now = self.clock()
+        with self.lock:
+            state = self.feeds.get(url)
+            if state is None:
+                return
+            state.failures = 0
+            state.skip_hours = frozenset(int(hour) for hour in skip_hours)
+
+            gap = self.posting_interval(timestamps, now)
+            interval = state.interval if gap is None else math.sqrt(gap * self.target_interval)
+            floor = max(self.min_interval, ttl or 0, max_age or 0)
+            state.interval = min(max(interval, floor), max(self.max_interval, floor))
+            self._push(state, now + self._jittered(state.interval))
+
+    def record_failure(self, url):
+        """Back off exponentially after a failed fetch."""
+        now = self.clock()
+        with self.lock:
+            state = self.feeds.get(url)
+            if state is None:
+                return
+            state.failures += 1
+            delay = min(self.max_backoff, self.min_interval * 2 ** state.failures)
+            self._push(state, now + self._jittered(delay))
+
+    def record(self, url, feed, error):
+        """Schedule a feed from a FeedFetcher result."""
+        if error is not None:
+            self.record_failure(url)
+            return
+        timestamps, ttl, max_age, skip_hours = feed_hints(feed)
+        self.record_success(url, timestamps, ttl, max_age, skip_hours)
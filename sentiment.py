@@ -0,0 +1,187 @@
+"""Sentiment models, and batched sentiment scoring memoized by content hash.
+
+A model is any object with a ``name`` and a ``score_batch(texts)`` method
+returning one polarity in [-1, 1] per text. Models are looked up by name in
+MODELS, so worker processes can build their own copy.
+"""
+import hashlib
+import math
+import multiprocessing
+import re
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+
+LABELS = ("Positive", "Neutral", "Negative")
+
+TOKEN_PATTERN = re.compile(r"[^\W_]+")
+
+# Polarity words of news text, one weight each; words after a negation count reversed
+POSITIVE_WORDS = frozenset("""
+    bedre beste bra enighet fantastisk flott fornøyd fred glad gleder god gode godt hjelp jubel lykkelig løsning
+    positiv redde reddet seier suksess trygg trygt vant vekst vinner vinne
+    aman bagus bahagia baik bantuan berhasil damai gembira hebat juara kemenangan maju membantu menang positif
+    prestasi senang sepakat setuju sukses terbaik tumbuh untung
+    agree agreement best better excellent glad good great growth happy help love peace positive rescue rescued
+    safe success successful victory win wins won
+""".split())
+
+NEGATIVE_WORDS = frozenset("""
+    alvorlig angrep arrestert bekymret brann døde død dømt drap drept dårlig farlig feil flom frykt katastrofe
+    kollaps konkurs krig krise kritikk mangel nedgang problem problemer protest ras savnet siktet skade skadet
+    skyting smitte sorg streik svindel syk sykdom tap tapte trist trussel ulykke vold voldtekt
+    ancaman anjlok bahaya banjir bangkrut bencana berbahaya buruk ditangkap dihukum duka gagal gempa hilang
+    jelek kalah kebakaran kecelakaan kekerasan kerugian khawatir korban korupsi krisis kritik longsor luka
+    masalah mati meninggal mogok parah penembakan penipuan penyakit perang protes rugi runtuh sakit sedih
+    serangan takut tersangka tewas wabah
+    accident arrested attack bad bankrupt charged collapse convicted corruption crisis danger dangerous dead
+    death decline disaster disease earthquake fail failed fear fire flood fraud grief injured kill killed lose
+    loss losses lost missing outbreak problem protest sad serious shooting sick strike threat violence war
+    worried worse worst
+""".split())
+
+NEGATIONS = frozenset("ikke ingen aldri uten tidak tak bukan belum tanpa jangan not no never without".split())
+
+# Words after a negation whose polarity is reversed
+NEGATION_WINDOW = 3
+
+# Smoothing of the summed polarity into [-1, 1], as in VADER
+NORMALIZATION_ALPHA = 15
+
+
+def sentiment_label(score):
+    """Return the label of a polarity score."""
+    if score > 0:
+        return "Positive"
+    if score < 0:
+        return "Negative"
+    return "Neutral"
+
+
+class TextBlobModel:
+    """TextBlob's pattern-based polarity; accurate for English, slow, and blind to most other languages."""
+
+    name = "textblob"
+    # Scoring is CPU-bound enough to be worth a process pool
+    use_processes = True
+
+    def score_batch(self, texts):
+        # Imported here so TextBlob loads on first use, not at startup
+        from textblob import TextBlob
+        return [TextBlob(text).sentiment.polarity for text in texts]
+
+
+class LexiconModel:
+    """Word-list polarity for Norwegian, Indonesian and English news text.
+
+    Sums +1/-1 for each known word, reversing words shortly after a
+    negation, and smooths the sum into [-1, 1]. Orders of magnitude faster
+    than TextBlob, so it runs in the calling process.
+    """
+
+    name = "lexicon"
+    use_processes = False
+
+    def __init__(self, positive=POSITIVE_WORDS, negative=NEGATIVE_WORDS, negations=NEGATIONS):
+        self.polarity = {word: 1 for word in positive}
+        self.polarity.update((word, -1) for word in negative)
+        self.negations = negations
+
+    def score(self, text):
+        total = 0
+        negated = 0
+        for token in TOKEN_PATTERN.findall(text.lower()):
+            if token in self.negations:
+                negated = NEGATION_WINDOW
+                continue
+            polarity = self.polarity.get(token)
+            if polarity is not None:
+                total += -polarity if negated else polarity
+            if negated:
+                negated -= 1
+        return total / math.sqrt(total * total + NORMALIZATION_ALPHA) if total else 0.0
+
+    def score_batch(self, texts):
+        return [self.score(text) for text in texts]
+
+
+MODELS = {
+    TextBlobModel.name: TextBlobModel,
+    LexiconModel.name: LexiconModel,
+}
+
+# Models of a worker process, created on first use
+worker_models = {}
+
+
+def score_chunk(model_name, texts):
+    """Score texts with a named model (runs in a worker process)."""
+    if model_name not in worker_models:
+        worker_models[model_name] = MODELS[model_name]()
+    return worker_models[model_name].score_batch(texts)
+
+
+class SentimentAnalyzer:
+    """Score texts in batches with a sentiment model, memoizing results by content hash.
+
+    Models with ``use_processes`` are run on a pool of ``processes`` worker
+    processes, started on first use, so scoring never holds the GUI's GIL.
+    Thread-safe.
+    """
+
+    def __init__(self, model="textblob", processes=2, memory_size=10000, chunk_size=32):
+        self.model = MODELS[model]()
+        self.processes = processes
+        self.memory_size = memory_size
+        self.chunk_size = chunk_size
+        self.memory = OrderedDict()
+        self.lock = threading.Lock()
+        self.executor = None
+
+    def key(self, text):
+        return hashlib.sha1(f"{self.model.name}\x1f{text}".encode("utf-8")).hexdigest()
+
+    def _executor(self):
+        with self.lock:
+            if self.executor is None:
+                # Spawned rather than forked, as the reader forks from a threaded GUI process
+                self.executor = ProcessPoolExecutor(max_workers=self.processes,
+                                                    mp_context=multiprocessing.get_context("spawn"))
+            return self.executor
+
+    def _score(self, texts):
+        if not (self.model.use_processes and self.processes) or len(texts) == 1:
+            return self.model.score_batch(texts)
+        chunks = [texts[start:start + self.chunk_size] for start in range(0, len(texts), self.chunk_size)]
+        scores = self._executor().map(score_chunk, [self.model.name] * len(chunks), chunks)
+        return [score for chunk_scores in scores for score in chunk_scores]
+
+    def score_batch(self, texts):
+        """Return (score, label) for each text."""
+        keys = [self.key(text) for text in texts]
+        with self.lock:
+            known = {key: self.memory[key] for key in keys if key in self.memory}
+            for key in known:
+                self.memory.move_to_end(key)
+
+        # Texts seen before, or twice in this batch, are scored once
+        pending = {key: text for key, text in zip(keys, texts) if key not in known}
+        if pending:
+            scores = dict(zip(pending, self._score(list(pending.values()))))
+            known.update(scores)
+            with self.lock:
+                self.memory.update(scores)
+                while len(self.memory) > self.memory_size:
+                    self.memory.popitem(last=False)
+
+        return [(known[key], sentiment_label(known[key])) for key in keys]
+
+    def score(self, text):
+        """Return (score, label) of one text."""
+        return self.score_batch([text])[0]
+
+    def shutdown(self):
+        """Stop the worker processes."""
+        with self.lock:
+            if self.executor is not None:
+                self.executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,40 @@
+"""Application settings, read from an optional settings.json next to the feed list."""
+import json
+import os
+
+SETTINGS_FILE = 'settings.json'
+
+DEFAULTS = {
+    # SQLite database holding every fetched entry
+    "database": "rss_reader.db",
+    # SQLite database of subscriptions and categories, imported from feed_urls.txt on first run
+    "subscriptions": "subscriptions.db",
+    # Refresh feeds in the background, each at a pace learned from its posting rate (opt-in)
+    "auto_refresh": False,
+    # Retention policy for stored entries
+    "retention_days": 30,
+    "max_entries_per_feed": 500,
+    # Translation, keyword extraction and sentiment analysis (loads the NLP libraries)
+    "analysis_enabled": True,
+    # Sentiment model scoring entries as they are stored: "textblob" (English) or "lexicon"
+    # (fast word lists for Norwegian, Indonesian and English), and its worker processes
+    "sentiment_model": "textblob",
+    "sentiment_processes": 2,
+    # Show each story carried by several feeds as one row in the title list
+    "collapse_duplicates": False,
+    # Language that titles and summaries are translated into
+    "translation_target": "id",
+    # Disk space for downscaled entry thumbnails, least recently used evicted first
+    "image_cache_mb": 200,
+    # Stage timings and per-feed counters for the diagnostics window
+    "metrics_enabled": True,
+}
+
+
+def load_settings(path=SETTINGS_FILE):
+    """Return the default settings overridden by any values in the settings file."""
+    settings = dict(DEFAULTS)
+    if os.path.exists(path):
+        with open(path, 'r', encoding='utf-8') as f:
+            settings.update(json.load(f))
+    return settings
@@ -0,0 +1,172 @@
+"""The subscription list: an SQLite store, plus the legacy feed_urls.txt format it migrates from."""
+import os
+import sqlite3
+from collections import defaultdict
+
+FEED_URLS_FILE = 'feed_urls.txt'
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS categories (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS feeds (
+    id INTEGER PRIMARY KEY,
+    url TEXT NOT NULL UNIQUE,
+    title TEXT NOT NULL,
+    category_id INTEGER NOT NULL REFERENCES categories (id) ON DELETE CASCADE
+);
+CREATE INDEX IF NOT EXISTS idx_feeds_category ON feeds (category_id, id);
+"""
+
+# PRAGMA user_version once feed_urls.txt has been imported
+MIGRATED_VERSION = 1
+
+
+def read_feed_urls(path=FEED_URLS_FILE):
+    """Load (url, description, category) tuples from a pipe-delimited file."""
+    if os.path.exists(path):
+        with open(path, 'r', encoding='utf-8') as f:
+            return [tuple(line.strip().split('|')) for line in f.readlines()]
+    return []
+
+
+def write_feed_urls(feed_urls, path=FEED_URLS_FILE):
+    """Save (url, description, category) tuples to a pipe-delimited file."""
+    with open(path, 'w', encoding='utf-8') as f:
+        for url, description, category in feed_urls:
+            f.write(f"{url}|{description}|{category}\n")
+
+
+def legacy_subscription(fields):
+    """Turn the fields of one feed_urls.txt line into (url, description, category).
+
+    Titles containing '|' were split into extra fields; they are joined back
+    together, taking the first field as the URL and the last as the category.
+    """
+    url = fields[0].strip()
+    if len(fields) == 1:
+        return url, url, ""
+    if len(fields) == 2:
+        return url, fields[1].strip(), ""
+    return url, "|".join(fields[1:-1]).strip(), fields[-1].strip()
+
+
+def group_by_category(feed_urls):
+    """Return {category: [(url, description), ...]} in file order."""
+    categories = defaultdict(list)
+    for url, description, category in feed_urls:
+        categories[category].append((url, description))
+    return categories
+
+
+class SubscriptionStore:
+    """Subscriptions and categories in SQLite, in the order they were added.
+
+    Each change is its own transaction, so an add, rename or removal only
+    writes the affected rows and a crash never leaves a half-written list.
+    On first use the legacy feed_urls.txt is imported; the file is left as is.
+    """
+
+    def __init__(self, path, legacy_path=FEED_URLS_FILE):
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        with self.conn:
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.execute("PRAGMA foreign_keys=ON")
+            self.conn.executescript(SCHEMA)
+        if legacy_path and self.conn.execute("PRAGMA user_version").fetchone()[0] < MIGRATED_VERSION:
+            self.migrate(legacy_path)
+
+    def migrate(self, legacy_path):
+        """Import a feed_urls.txt file in one transaction."""
+        with self.conn:
+            for fields in read_feed_urls(legacy_path):
+                url, description, category = legacy_subscription(fields)
+                if not (url or description or category):
+                    continue
+                category_id = self._category_id(category)
+                if url:
+                    # A URL listed twice keeps its first category, as the tree already showed it
+                    self.conn.execute(
+                        "INSERT OR IGNORE INTO feeds (url, title, category_id) VALUES (?, ?, ?)",
+                        (url, description, category_id),
+                    )
+            self.conn.execute(f"PRAGMA user_version = {MIGRATED_VERSION}")
+
+    def _category_id(self, name):
+        """Return the id of a category, creating it if needed (inside the caller's transaction)."""
+        self.conn.execute("INSERT OR IGNORE INTO categories (name) VALUES (?)", (name,))
+        return self.conn.execute("SELECT id FROM categories WHERE name = ?", (name,)).fetchone()[0]
+
+    def feeds(self):
+        """Return every subscription as (url, description, category), grouped by category."""
+        return self.conn.execute(
+            "SELECT feeds.url, feeds.title, categories.name FROM feeds "
+            "JOIN categories ON categories.id = feeds.category_id "
+            "ORDER BY categories.id, feeds.id"
+        ).fetchall()
+
+    def categories(self):
+        """Return every category name, including empty ones, in the order they were added."""
+        return [name for name, in self.conn.execute("SELECT name FROM categories ORDER BY id")]
+
+    def feed(self, url):
+        """Return (url, description, category) of a subscription, or None."""
+        return self.conn.execute(
+            "SELECT feeds.url, feeds.title, categories.name FROM feeds "
+            "JOIN categories ON categories.id = feeds.category_id WHERE feeds.url = ?",
+            (url,),
+        ).fetchone()
+
+    def add_category(self, name):
+        """Add an empty category; returns False if it already exists."""
+        with self.conn:
+            return self.conn.execute("INSERT OR IGNORE INTO categories (name) VALUES (?)", (name,)).rowcount == 1
+
+    def rename_category(self, old_name, new_name):
+        """Rename a category; returns False if the new name is taken."""
+        try:
+            with self.conn:
+                self.conn.execute("UPDATE categories SET name = ? WHERE name = ?", (new_name, old_name))
+        except sqlite3.IntegrityError:
+            return False
+        return True
+
+    def remove_category(self, name):
+        """Remove a category and its feeds; returns the removed feed URLs."""
+        with self.conn:
+            urls = [url for url, in self.conn.execute(
+                "SELECT url FROM feeds WHERE category_id = (SELECT id FROM categories WHERE name = ?)", (name,)
+            )]
+            self.conn.execute("DELETE FROM categories WHERE name = ?", (name,))
+        return urls
+
+    def add_feed(self, url, description, category):
+        """Subscribe to a feed; returns False if the URL is already subscribed."""
+        try:
+            with self.conn:
+                self.conn.execute(
+                    "INSERT INTO feeds (url, title, category_id) VALUES (?, ?, ?)",
+                    (url, description, self._category_id(category)),
+                )
+        except sqlite3.IntegrityError:
+            return False
+        return True
+
+    def update_feed(self, old_url, url, description):
+        """Change a feed's URL and description; returns False if the new URL is already subscribed."""
+        try:
+            with self.conn:
+                self.conn.execute("UPDATE feeds SET url = ?, title = ? WHERE url = ?", (url, description, old_url))
+        except sqlite3.IntegrityError:
+            return False
+        return True
+
+    def remove_feed(self, url):
+        """Unsubscribe from a feed."""
+        with self.conn:
+            self.conn.execute("DELETE FROM feeds WHERE url = ?", (url,))
+
+    def close(self):
+        self.conn.close()
@@ -0,0 +1,105 @@
+"""Paging, positions and collapsed story clusters of entry views over a small store."""
+import pytest
+
+from benchmarks.fixtures import make_entries, syndicated_entries
+from entry_store import EntryStore, EntryView
+
+SORT_KEYS = ("published", "title", "feed", "sentiment")
+
+
+@pytest.fixture
+def store(tmp_path):
+    """A store with two feeds sharing half their stories and a third unrelated one.
+
+    Some entries of the third feed have no title, and only every third
+    entry has a sentiment score, so the sorts meet NULLs.
+    """
+    store = EntryStore(str(tmp_path / "entries.db"))
+    originals, syndicated, _ = syndicated_entries(40, overlap=0.5)
+    others = make_entries(10, seed=5)
+    for entry in others[::4]:
+        entry["title"] = None
+    for feed_url, entries in (("a", originals), ("b", syndicated), ("c", others)):
+        store.write_rows(store.changed_rows(feed_url, entries))
+    for index, (entry_id,) in enumerate(store.conn.execute("SELECT id FROM entries ORDER BY id").fetchall()):
+        if index % 3 == 0:
+            store.set_sentiment(entry_id, (index % 7 - 3) / 3, "Positive" if index % 2 else "Negative")
+    yield store
+    store.close()
+
+
+def stored(store):
+    """Return every stored entry as (id, feed_url, published_ts, cluster_id, sentiment_label)."""
+    return store.conn.execute(
+        "SELECT id, feed_url, published_ts, cluster_id, sentiment_label FROM entries"
+    ).fetchall()
+
+
+def newest_of_each_story(rows):
+    """Return the ids of the newest entry of each story cluster among the given rows."""
+    newest = {}
+    for row in rows:
+        story = row[3] if row[3] is not None else -row[0]
+        if story not in newest or (row[2], row[0]) > (newest[story][2], newest[story][0]):
+            newest[story] = row
+    return {row[0] for row in newest.values()}
+
+
+def test_stories_shared_by_two_feeds_are_clustered(store):
+    clusters = {}
+    for _, feed_url, _, cluster_id, _ in stored(store):
+        clusters.setdefault(cluster_id, set()).add(feed_url)
+    assert sum(feeds == {"a", "b"} for feeds in clusters.values()) >= 15
+
+
+@pytest.mark.parametrize("feed_urls", [None, ["a"], ["b"], ["a", "b"], ["a", "c"], ["b", "c"]])
+@pytest.mark.parametrize("sentiment", [None, "Positive"])
+def test_collapsed_view_shows_the_newest_entry_of_each_story_in_it(store, feed_urls, sentiment):
+    rows = [row for row in stored(store)
+            if (feed_urls is None or row[1] in feed_urls) and (sentiment is None or row[4] == sentiment)]
+
+    view = EntryView(store, feed_urls, sentiment=sentiment, collapse=True, page_size=7)
+    shown = [entry['id'] for entry in view]
+    assert len(shown) == len(view)
+    assert set(shown) == newest_of_each_story(rows)
+
+    duplicates = sum(entry.get('duplicates', 0) for entry in view)
+    assert len(shown) + duplicates == len(rows)
+
+
+@pytest.mark.parametrize("sort_key", SORT_KEYS)
+@pytest.mark.parametrize("descending", [False, True])
+@pytest.mark.parametrize("collapse", [False, True])
+def test_index_of_matches_the_paged_order(store, sort_key, descending, collapse):
+    view = EntryView(store, ["a", "b", "c"], sort_key, descending, page_size=7, collapse=collapse)
+    ids = [entry['id'] for entry in view]
+    assert len(ids) == len(set(ids)) == len(view)
+
+    # A fresh view for every lookup, so positions come from the database rather than cached pages
+    for position, entry_id in enumerate(ids):
+        assert EntryView(store, ["a", "b", "c"], sort_key, descending, collapse=collapse).index_of(entry_id) == position
+    assert view.index_of(-1) is None
+
+
+@pytest.mark.parametrize("descending", [False, True])
+def test_feed_sort_follows_the_shown_titles(store, descending):
+    titles = {"a": "Zeta", "b": "alpha", "c": "Mu"}
+    store.feed_title = titles.get
+    view = EntryView(store, ["a", "b", "c"], "feed", descending)
+
+    feeds = list(dict.fromkeys(entry['feed_url'] for entry in view))
+    assert feeds == (["a", "c", "b"] if descending else ["b", "c", "a"])
+    for feed_url in feeds:
+        published = [entry['published_ts'] for entry in view if entry['feed_url'] == feed_url]
+        assert published == sorted(published, reverse=True)
+
+
+def test_story_heads_follow_deletes(store):
+    store.prune(max_entries_per_feed=30)
+    # Feed b holds the newer copy of each shared story, so this deletes their heads
+    with store.lock, store.conn:
+        store.conn.execute("DELETE FROM entries WHERE feed_url = 'b'")
+    heads = {entry_id for entry_id, in store.conn.execute("SELECT id FROM entries WHERE cluster_head")}
+    assert heads == newest_of_each_story(stored(store))
+    assert {entry['id'] for entry in EntryView(store, collapse=True)} == heads == {
+        entry_id for entry_id, in store.conn.execute("SELECT id FROM entries")}
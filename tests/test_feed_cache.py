@@ -0,0 +1,67 @@
+"""Conditional GETs against the local fixture server, and concurrent fetches of one feed."""
+import queue
+import threading
+
+from benchmarks.fixtures import FixtureServer
+from feed_fetcher import FeedFetcher
+from http_cache import FeedCache
+
+
+def test_unchanged_feed_is_served_from_the_cache(tmp_path):
+    cache = FeedCache(str(tmp_path))
+    fetcher = FeedFetcher(cache=cache)
+    with FixtureServer() as server:
+        url = server.url("rss", 10)
+        first = fetcher.fetch(url)
+        second = fetcher.fetch(url)
+    fetcher.shutdown()
+
+    (_, first_headers, first_status), (_, second_headers, second_status) = server.requests
+    assert first_status == 200 and "If-None-Match" not in first_headers
+    assert second_headers["If-None-Match"] == cache.validators(url)[0]
+    assert second_status == 304
+    assert second is first and len(second.entries) == 10
+    assert cache.stats() == {"hits": 1, "misses": 1}
+
+    # A new cache reads the validators and the feed back from disk
+    assert [entry.id for entry in FeedCache(str(tmp_path)).get(url).entries] == [entry.id for entry in first.entries]
+
+
+def test_concurrent_stores_of_one_feed_all_succeed(tmp_path):
+    cache = FeedCache(str(tmp_path))
+    errors = []
+
+    def store():
+        for _ in range(30):
+            try:
+                cache.store("https://a.example/feed", {"entries": []}, etag='"1"')
+            except Exception as e:
+                errors.append(e)
+
+    threads = [threading.Thread(target=store) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert [path.suffix for path in tmp_path.iterdir()] == [".pickle"]
+
+
+def test_duplicate_submits_share_one_fetch(tmp_path):
+    fetcher = FeedFetcher(per_host_limit=1, cache=FeedCache(str(tmp_path)))
+    results = queue.Queue()
+    with FixtureServer() as server:
+        url = server.url("rss", 10)
+        # Hold the host's only slot so both submits arrive while the first fetch waits
+        slot = fetcher._host_slot(url)
+        slot.acquire()
+        futures = [fetcher.submit(url, lambda url, feed, error: results.put((feed, error)))
+                   for _ in range(2)]
+        slot.release()
+        (first, first_error), (second, second_error) = results.get(timeout=10), results.get(timeout=10)
+    fetcher.shutdown()
+
+    assert futures[0] is futures[1]
+    assert len(server.requests) == 1
+    assert first is second and first_error is second_error is None
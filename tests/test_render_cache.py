@@ -0,0 +1,26 @@
+"""Render cache lookups of stored entries."""
+from benchmarks.fixtures import make_entries
+from entry_store import EntryStore
+from render_cache import RenderCache
+
+
+def test_lookups_do_not_load_the_summary(tmp_path):
+    store = EntryStore(str(tmp_path / "entries.db"))
+    store.upsert_entries("a", make_entries(3))
+    rendered = []
+    cache = RenderCache(lambda entry: rendered.append(entry['id']) or f"<p>{entry['summary']}</p>")
+
+    first = store.entries_for_feed("a")[0]
+    cache.get(first, "settings")
+    again = store.entries_for_feed("a")[0]
+    assert cache.get(again, "settings") == cache.get(first, "settings")
+    assert rendered == [first['id']]
+    assert again.details is None
+
+    # A changed entry is rendered again
+    changed = make_entries(3)
+    changed[0]["summary"] = "Rewritten"
+    store.upsert_entries("a", changed)
+    assert cache.get(store.entries_for_feed("a")[0], "settings") == "<p>Rewritten</p>"
+    cache.shutdown()
+    store.close()
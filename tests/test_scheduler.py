@@ -0,0 +1,109 @@
+"""Deterministic checks of the refresh scheduler on a simulated clock."""
+import calendar
+import random
+import types
+
+from benchmarks.fixtures import SimulatedClock
+from scheduler import RefreshScheduler, feed_hints
+
+# 2024-01-01 02:30 UTC
+START = calendar.timegm((2024, 1, 1, 2, 30, 0))
+
+
+def make_scheduler(clock, **options):
+    """Return a scheduler without jitter, so due times are exact."""
+    options.setdefault("jitter", 0)
+    return RefreshScheduler(clock=clock, rng=random.Random(0), **options)
+
+
+def add_feed(scheduler, url):
+    """Schedule a feed due right away and hand it out, as the first fetch does."""
+    scheduler.add(url, stagger=0)
+    assert scheduler.due() == [url]
+
+
+def test_posting_rate_sets_interval():
+    clock = SimulatedClock(START)
+    scheduler = make_scheduler(clock, target_interval=1800)
+    add_feed(scheduler, "https://a.example/feed")
+
+    # Posting every 450 s, four times as often as the target: polled twice as often
+    scheduler.record_success("https://a.example/feed", [START - 450 * index for index in range(10)])
+    assert scheduler.next_due("https://a.example/feed") == START + 900
+
+
+def test_failures_back_off_exponentially_up_to_the_cap():
+    clock = SimulatedClock(START)
+    scheduler = make_scheduler(clock, min_interval=300, max_backoff=3600)
+    url = "https://a.example/feed"
+    add_feed(scheduler, url)
+
+    delays = []
+    for _ in range(5):
+        scheduler.record_failure(url)
+        delays.append(scheduler.next_due(url) - clock.now)
+    assert delays == [600, 1200, 2400, 3600, 3600]
+    assert scheduler.schedule()[0][3] == 5
+
+    scheduler.record_success(url, [START - 1800 * index for index in range(10)])
+    assert scheduler.schedule()[0][3] == 0
+    assert scheduler.next_due(url) == START + 1800
+
+
+def test_skip_hours_move_the_fetch_to_the_next_allowed_hour():
+    clock = SimulatedClock(START)
+    scheduler = make_scheduler(clock, target_interval=3600)
+    url = "https://a.example/feed"
+    add_feed(scheduler, url)
+
+    # Due at 03:30, but 03:00 and 04:00 are skipped
+    scheduler.record_success(url, [START - 3600 * index for index in range(10)], skip_hours=[3, 4])
+    assert scheduler.next_due(url) == calendar.timegm((2024, 1, 1, 5, 0, 0))
+
+
+def test_ttl_and_max_age_are_floors():
+    clock = SimulatedClock(START)
+    scheduler = make_scheduler(clock, max_interval=3600)
+    add_feed(scheduler, "https://a.example/ttl")
+    add_feed(scheduler, "https://b.example/max-age")
+    fast = [START - 60 * index for index in range(10)]
+
+    # A feed posting every minute is still polled no more often than its ttl, even above max_interval
+    scheduler.record_success("https://a.example/ttl", fast, ttl=2 * 3600)
+    assert scheduler.next_due("https://a.example/ttl") == START + 2 * 3600
+    scheduler.record_success("https://b.example/max-age", fast, max_age=900)
+    assert scheduler.next_due("https://b.example/max-age") == START + 900
+
+
+def test_feed_hints_read_ttl_max_age_and_skip_hours():
+    feed = types.SimpleNamespace(
+        entries=[{"published_ts": START}],
+        feed={"ttl": "15"},
+        get={"headers": {"cache-control": "public, max-age=600"}, "skip_hours": [1, 2]}.get,
+    )
+    assert feed_hints(feed) == ([START], 900, 600, [1, 2])
+
+    feed.get = {"headers": {"cache-control": "no-cache, max-age=600"}}.get
+    assert feed_hints(feed)[2] is None
+
+
+def test_requests_to_one_host_are_postponed_beyond_the_limit():
+    clock = SimulatedClock(START)
+    scheduler = make_scheduler(clock, per_host_limit=2, host_spacing=5.0)
+    urls = [f"https://a.example/{index}" for index in range(5)]
+    for url in urls:
+        scheduler.add(url, stagger=0)
+    scheduler.add("https://b.example/feed", stagger=0)
+
+    first = scheduler.due()
+    assert len([url for url in first if url.startswith("https://a.example/")]) == 2
+    assert "https://b.example/feed" in first
+
+    # The rest follow per_host_limit at a time, each round host_spacing (plus up to host_spacing of jitter) later
+    postponed = sorted(scheduler.next_due(url) for url in urls if url not in first)
+    assert START + 5 <= postponed[0] <= postponed[1] < START + 10 <= postponed[2] < START + 15
+    handed_out = set(first)
+    for _ in range(3):
+        clock.advance(5)
+        handed_out.update(scheduler.due())
+    assert set(urls) <= handed_out
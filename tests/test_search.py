@@ -0,0 +1,24 @@
+"""Full-text search over stored entries."""
+from entry_store import EntryStore
+
+
+def entry(guid, title, summary):
+    return {"id": guid, "title": title, "summary": summary, "link": f"https://news.example.com/{guid}",
+            "published": "Mon, 01 Jan 2024 12:00:00 GMT", "published_ts": 1704110400}
+
+
+def test_snippets_highlight_matches_in_title_or_body(tmp_path):
+    store = EntryStore(str(tmp_path / "entries.db"))
+    store.upsert_entries("a", [
+        entry("1", "Storm warning for Stavanger", "<p>Ferries are cancelled along the coast.</p>"),
+        entry("2", "Ferry news", "<p>The new ferry to Stavanger starts in June.</p>"),
+    ])
+
+    # Only in a title
+    assert [hit['snippet'] for hit in store.search("storm")] == ["<b>Storm</b> warning for Stavanger"]
+
+    # In a title and in a body
+    hits = store.search("stavanger")
+    assert len(hits) == 2
+    assert all("<b>Stavanger</b>" in hit['snippet'] for hit in hits)
+    store.close()
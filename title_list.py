@@ -0,0 +1,173 @@
+"""Virtual list control for the entry titles of the selected feed."""
+import time
+
+import wx
+
+# (heading, sort key, width)
+COLUMNS = [
+    ("Title", "title", 420),
+    ("Date", "published", 130),
+    ("Feed", "feed", 180),
+    ("Sentiment", "sentiment", 80),
+]
+
+# Sort keys that start out newest/highest first when their column is clicked
+DESCENDING_BY_DEFAULT = {"published", "sentiment"}
+
+# Rows from the end of a lazily growing view at which the next chunk is requested
+LOAD_MORE_MARGIN = 50
+
+# Edge of the square thumbnails in the title column, in pixels
+THUMBNAIL_SIZE = 32
+
+# Thumbnails kept in the image list before it is emptied and refilled
+MAX_LIST_IMAGES = 512
+
+
+class TitleListCtrl(wx.ListCtrl):
+    """Report-style virtual list that only renders the visible rows of an entry view.
+
+    The view is an EntryView or a RiverView; rivers grow as the list is scrolled.
+    With a thumbnail(entry) callback returning a local image file, rows show
+    the entry's thumbnail next to the title.
+    """
+
+    def __init__(self, parent, feed_title=None, thumbnail=None):
+        super().__init__(parent, style=wx.LC_REPORT | wx.LC_VIRTUAL | wx.LC_SINGLE_SEL)
+        for index, (heading, _, width) in enumerate(COLUMNS):
+            self.InsertColumn(index, heading, width=width)
+
+        self.feed_title = feed_title or (lambda url: url)
+        self.thumbnail = thumbnail
+        self.image_indexes = {}
+        if thumbnail is not None:
+            self.images = wx.ImageList(THUMBNAIL_SIZE, THUMBNAIL_SIZE)
+            self.SetImageList(self.images, wx.IMAGE_LIST_SMALL)
+        self.view = None
+        self.loading_more = False
+        self.Bind(wx.EVT_LIST_COL_CLICK, self.on_column_click)
+
+    def set_view(self, view, selected_id=None):
+        """Show a new entry view, reselecting selected_id if it is part of it."""
+        self.view = view
+        self.SetItemCount(len(view))
+        self.select(view.index_of(selected_id) if selected_id is not None else None)
+        self.Refresh()
+
+    def clear(self):
+        """Remove every row."""
+        self.view = None
+        self.SetItemCount(0)
+
+    def entry(self, index):
+        """Return the entry shown at a row, or None."""
+        if self.view is None or index < 0:
+            return None
+        try:
+            return self.view[index]
+        except IndexError:
+            return None
+
+    def selected_entry(self):
+        """Return the entry of the selected row, or None."""
+        return self.entry(self.GetFirstSelected())
+
+    def select(self, index):
+        """Select and scroll to a row, or clear the selection when index is None."""
+        selected = self.GetFirstSelected()
+        if selected != -1 and selected != index:
+            self.Select(selected, on=False)
+        if index is not None:
+            self.Select(index)
+            self.Focus(index)
+            self.EnsureVisible(index)
+
+    def refresh_entry(self, entry):
+        """Redraw the row showing an entry after its fields changed."""
+        index = self.GetFirstSelected()
+        if self.entry(index) is entry:
+            self.RefreshItem(index)
+
+    def OnGetItemText(self, item, column):
+        """Return the text of one cell; called by wx only for visible rows."""
+        if (not self.loading_more and getattr(self.view, 'has_more', False)
+                and item >= self.GetItemCount() - LOAD_MORE_MARGIN):
+            # Scrolled near the end of a river: page in older entries
+            self.loading_more = True
+            wx.CallAfter(self.load_more)
+
+        entry = self.entry(item)
+        if entry is None:
+            return ""
+        key = COLUMNS[column][1]
+        if key == "title":
+            title = entry.get('title', "No Title Available")
+            if entry.get('duplicates'):
+                # Collapsed story cluster
+                title += f"  (+{entry['duplicates']})"
+            return title
+        if key == "published":
+            return time.strftime("%Y-%m-%d %H:%M", time.localtime(entry['published_ts']))
+        if key == "feed":
+            return self.feed_title(entry['feed_url'])
+        return entry.get('sentiment_label', "")
+
+    def OnGetItemImage(self, item):
+        """Return the image list index of a row's thumbnail, or -1; called by wx only for visible rows."""
+        entry = self.entry(item) if self.thumbnail is not None else None
+        path = self.thumbnail(entry) if entry is not None else None
+        if not path:
+            return -1
+
+        index = self.image_indexes.get(path)
+        if index is None:
+            if len(self.image_indexes) >= MAX_LIST_IMAGES:
+                # Start over rather than track usage; the visible rows reload on the next paint
+                self.images.RemoveAll()
+                self.image_indexes.clear()
+                wx.CallAfter(self.Refresh)
+            index = self.image_indexes[path] = self.add_thumbnail(path)
+        return index
+
+    def add_thumbnail(self, path):
+        """Add an image file to the image list, centered on a square, and return its index (-1 if unreadable)."""
+        with wx.LogNull():
+            image = wx.Image(path)
+        if not image.IsOk():
+            return -1
+
+        scale = min(THUMBNAIL_SIZE / image.GetWidth(), THUMBNAIL_SIZE / image.GetHeight())
+        width = max(1, int(image.GetWidth() * scale))
+        height = max(1, int(image.GetHeight() * scale))
+        image = image.Scale(width, height, wx.IMAGE_QUALITY_HIGH)
+        if not image.HasAlpha():
+            image.InitAlpha()
+        image.Resize((THUMBNAIL_SIZE, THUMBNAIL_SIZE),
+                     ((THUMBNAIL_SIZE - width) // 2, (THUMBNAIL_SIZE - height) // 2))
+        return self.images.Add(wx.Bitmap(image))
+
+    def refresh_visible(self):
+        """Redraw the rows on screen, e.g. after their thumbnails were downloaded."""
+        if self.GetItemCount():
+            top = self.GetTopItem()
+            self.RefreshItems(top, min(self.GetItemCount() - 1, top + self.GetCountPerPage()))
+
+    def load_more(self):
+        """Extend a lazily growing view by one chunk."""
+        self.loading_more = False
+        if getattr(self.view, 'has_more', False):
+            self.view.load_more()
+            self.SetItemCount(len(self.view))
+
+    def on_column_click(self, event):
+        """Sort the view by the clicked column, toggling the direction on repeated clicks."""
+        if self.view is None:
+            return
+        sort_key = COLUMNS[event.GetColumn()][1]
+        if sort_key == self.view.sort_key:
+            descending = not self.view.descending
+        else:
+            descending = sort_key in DESCENDING_BY_DEFAULT
+
+        selected = self.selected_entry()
+        self.set_view(self.view.sorted(sort_key, descending), selected['id'] if selected else None)
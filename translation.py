@@ -0,0 +1,152 @@
+"""Cached, batched translation with pluggable backends."""
+import hashlib
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+
+class GoogleBackend:
+    """Translate through Google Translate, packing short texts into as few requests as possible."""
+
+    # Google rejects requests longer than 5000 characters
+    max_request_chars = 4500
+
+    def __init__(self, source='auto'):
+        self.source = source
+        self.translators = {}
+
+    def warm_up(self):
+        """Import deep_translator ahead of the first translation."""
+        import deep_translator  # noqa: F401
+
+    def _translator(self, target):
+        """Return a reusable translator for the target language."""
+        if target not in self.translators:
+            from deep_translator import GoogleTranslator
+            self.translators[target] = GoogleTranslator(source=self.source, target=target)
+        return self.translators[target]
+
+    def _chunks(self, texts):
+        """Group single-line texts into newline-joined chunks below the request size limit."""
+        chunk, size = [], 0
+        for text in texts:
+            if chunk and size + len(text) + 1 > self.max_request_chars:
+                yield chunk
+                chunk, size = [], 0
+            chunk.append(text)
+            size += len(text) + 1
+        if chunk:
+            yield chunk
+
+    def translate_batch(self, texts, target):
+        """Translate a list of texts into the target language."""
+        translator = self._translator(target)
+        results = {}
+
+        # Multi-line or very long texts cannot be packed safely and go on their own
+        packable = [text for text in texts if "\n" not in text and len(text) < self.max_request_chars]
+        for chunk in self._chunks(packable):
+            translated = (translator.translate("\n".join(chunk)) or "").split("\n")
+            if len(translated) == len(chunk):
+                results.update(zip(chunk, translated))
+
+        for text in texts:
+            if text not in results:
+                results[text] = translator.translate(text)
+        return [results[text] for text in texts]
+
+
+class TranslationService:
+    """Translate texts through a backend, with an in-memory LRU and a persistent cache."""
+
+    def __init__(self, backend, target='id', cache_path=None, memory_size=2048):
+        self.backend = backend
+        self.target = target
+        self.memory_size = memory_size
+        self.memory = OrderedDict()
+        self.lock = threading.Lock()
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="translate")
+
+        self.conn = None
+        if cache_path:
+            os.makedirs(os.path.dirname(cache_path) or ".", exist_ok=True)
+            self.conn = sqlite3.connect(cache_path, check_same_thread=False)
+            with self.conn:
+                self.conn.execute(
+                    "CREATE TABLE IF NOT EXISTS translations (key TEXT PRIMARY KEY, text TEXT NOT NULL)"
+                )
+
+    def _key(self, text, target):
+        """Return the cache key for a text and target language."""
+        return hashlib.sha1(f"{target}\0{text}".encode("utf-8")).hexdigest()
+
+    def _lookup(self, key):
+        """Return a cached translation from memory or disk, or None."""
+        with self.lock:
+            if key in self.memory:
+                self.memory.move_to_end(key)
+                return self.memory[key]
+            if self.conn is None:
+                return None
+            row = self.conn.execute("SELECT text FROM translations WHERE key = ?", (key,)).fetchone()
+        if row is not None:
+            self._remember({key: row[0]}, persist=False)
+            return row[0]
+        return None
+
+    def _remember(self, translations, persist=True):
+        """Add translations to the memory cache and, optionally, the disk cache."""
+        with self.lock:
+            for key, text in translations.items():
+                self.memory[key] = text
+                self.memory.move_to_end(key)
+            while len(self.memory) > self.memory_size:
+                self.memory.popitem(last=False)
+            if persist and self.conn is not None:
+                with self.conn:
+                    self.conn.executemany(
+                        "INSERT OR REPLACE INTO translations (key, text) VALUES (?, ?)",
+                        translations.items(),
+                    )
+
+    def translate_batch(self, texts, target=None):
+        """Translate texts, sending only cache misses to the backend in a single batch."""
+        target = target or self.target
+        keys = [self._key(text, target) for text in texts]
+        results = {key: self._lookup(key) for key in keys}
+
+        missing = list(dict.fromkeys(text for text, key in zip(texts, keys) if results[key] is None))
+        if missing:
+            translated = self.backend.translate_batch(missing, target)
+            fresh = {self._key(text, target): result for text, result in zip(missing, translated) if result}
+            self._remember(fresh)
+            results.update(fresh)
+
+        return [results.get(key) or text for text, key in zip(texts, keys)]
+
+    def translate(self, text, target=None):
+        """Translate a single text."""
+        return self.translate_batch([text], target)[0]
+
+    def prefetch(self, texts, target=None):
+        """Translate texts in the background so later lookups are served from the cache."""
+        texts = [text for text in texts if text]
+        if not texts:
+            return None
+
+        def run():
+            try:
+                self.translate_batch(texts, target)
+            except Exception as e:
+                print(f"Translation prefetch failed: {e}")
+
+        return self.executor.submit(run)
+
+    def close(self):
+        """Stop background prefetching and close the disk cache."""
+        self.executor.shutdown(wait=False, cancel_futures=True)
+        if self.conn is not None:
+            with self.lock:
+                self.conn.close()